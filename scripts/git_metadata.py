@@ -8,17 +8,22 @@ This module provides graceful fallback to filesystem modification times when
 git is unavailable or files are not tracked.
 """
 
+import os
 import re
 import subprocess
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional
+
+# Marks the start of each commit header in the bulk git log stream
+_COMMIT_MARKER = '\x01'
 
 
 def extract_git_metadata(
     file_path: Path,
     root_path: Path,
-    cache: Optional[Dict] = None
+    cache: Optional[Dict] = None,
+    index: Optional[Dict[str, Dict]] = None
 ) -> Dict:
     """
     Extract git metadata for a file with optional caching.
@@ -27,6 +32,9 @@ def extract_git_metadata(
         file_path: Path to the file (absolute or relative)
         root_path: Project root path for git commands
         cache: Optional cache dict to store results and avoid duplicate queries
+        index: Optional result of build_git_metadata_index(); when given,
+            files are looked up there instead of running git per file, and
+            files missing from it fall back to mtime
 
     Returns:
         Dict with keys:
@@ -65,7 +73,12 @@ def extract_git_metadata(
         return cache[rel_path]
 
     # Try to extract git metadata
-    metadata = _extract_from_git(file_path, root_path)
+    if index is not None:
+        metadata = index.get(rel_path)
+        if metadata is None:
+            metadata = _fallback_to_mtime(file_path)
+    else:
+        metadata = _extract_from_git(file_path, root_path)
 
     # Store in cache if provided
     if cache is not None:
@@ -74,6 +87,120 @@ def extract_git_metadata(
     return metadata
 
 
+def build_git_metadata_index(
+    root_path: Path,
+    paths: Optional[Iterable[str]] = None
+) -> Optional[Dict[str, Dict]]:
+    """
+    Build git metadata for many files from a single git log pass.
+
+    Walks history newest-first with --numstat and keeps the first (latest)
+    commit seen for each path, so the whole project costs one subprocess
+    instead of two or three per file. When ``paths`` is given, the walk stops
+    as soon as every tracked path among them has been resolved.
+
+    Args:
+        root_path: Project root path for git commands
+        paths: Optional project-relative paths of interest; None keeps all
+
+    Returns:
+        Dict mapping project-relative path to the same metadata dict that
+        extract_git_metadata() returns, or None if git is unavailable
+    """
+    if isinstance(root_path, str):
+        root_path = Path(root_path)
+
+    wanted = None
+    if paths is not None:
+        try:
+            tracked = subprocess.run(
+                ['git', 'ls-files', '-z'],
+                cwd=str(root_path),
+                capture_output=True,
+                timeout=10
+            )
+        except (subprocess.TimeoutExpired, OSError):
+            return None
+        if tracked.returncode != 0:
+            return None
+        # Untracked files never show up in history; don't wait for them
+        wanted = set(paths) & set(
+            _to_native(name) for name in
+            tracked.stdout.decode('utf-8', 'surrogateescape').split('\0') if name
+        )
+        if not wanted:
+            return {}
+
+    try:
+        proc = subprocess.Popen(
+            # --relative reports paths relative to root_path (and drops the
+            # rest) when the project is a subdirectory of the repository
+            ['git', 'log', '-z', '--numstat', '--no-renames', '--relative',
+             f'--format={_COMMIT_MARKER}%H%x00%ae%x00%aI%x00%s'],
+            cwd=str(root_path),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+    except OSError:
+        return None
+
+    index = {}
+    header = []   # [hash, email, date, subject] of the commit being read
+    commit = None
+    buffer = b''
+    try:
+        while wanted is None or wanted:
+            chunk = proc.stdout.read(65536)
+            if not chunk:
+                break
+            buffer += chunk
+            *tokens, buffer = buffer.split(b'\0')
+            for raw in tokens:
+                token = raw.decode('utf-8', 'surrogateescape').lstrip('\n')
+                if token.startswith(_COMMIT_MARKER):
+                    header = [token[1:]]
+                    commit = None
+                    continue
+                if len(header) < 4:
+                    header.append(token)
+                    continue
+                parts = token.split('\t', 2)
+                if len(parts) != 3:
+                    continue
+                path = _to_native(parts[2])
+                if path in index or (wanted is not None and path not in wanted):
+                    continue
+                if commit is None:
+                    commit = {
+                        'commit': header[0],
+                        'author': header[1],
+                        'date': header[2],
+                        'message': header[3],
+                        'pr': _extract_pr_number(header[3]),
+                        'recency_days': _calculate_recency_days(header[2])
+                    }
+                added = int(parts[0]) if parts[0].isdigit() else 0
+                deleted = int(parts[1]) if parts[1].isdigit() else 0
+                index[path] = {**commit, 'lines_changed': added + deleted}
+                if wanted is not None:
+                    wanted.discard(path)
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+        proc.stdout.close()
+        proc.wait()
+
+    if proc.returncode > 0 and not index:
+        # git log failed outright (e.g. not a repository, no commits yet)
+        return None
+    return index
+
+
+def _to_native(git_path: str) -> str:
+    """Convert a git (always '/'-separated) path to the OS separator."""
+    return git_path if os.sep == '/' else git_path.replace('/', os.sep)
+
+
 def _extract_from_git(file_path: Path, root_path: Path) -> Dict:
     """
     Internal function to extract git metadata using git commands.
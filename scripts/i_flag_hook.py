@@ -116,11 +116,15 @@ def calculate_files_hash(project_root):
         if result.returncode == 0:
             files = result.stdout.strip().split('\n') if result.stdout.strip() else []
         else:
-            # Fallback to manual file discovery
+            # Fallback to manual file discovery, pruning hidden directories
+            # in place instead of testing every part of every path
             files = []
-            for file_path in project_root.rglob('*'):
-                if file_path.is_file() and not any(part.startswith('.') for part in file_path.parts):
-                    files.append(str(file_path.relative_to(project_root)))
+            for dirpath, dirnames, filenames in os.walk(project_root):
+                dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+                rel_dir = os.path.relpath(dirpath, project_root)
+                for name in filenames:
+                    if not name.startswith('.'):
+                        files.append(name if rel_dir == '.' else os.path.join(rel_dir, name))
         
         # Hash file paths and modification times
         hasher = hashlib.sha256()
@@ -24,16 +24,57 @@ from typing import Dict, List, Optional, Set, Tuple
 import index_utils
 
 
+def _diff_since_commit(
+    last_commit: str, project_root: Path, verbose: bool = False
+) -> Optional[Set[str]]:
+    """
+    List files changed between ``last_commit`` and HEAD.
+
+    Returns None when the commit cannot be diffed (e.g. rewritten history or a
+    shallow clone), so the caller can fall back to the timestamp scan.
+    """
+    diff_cmd = [
+        'git', 'diff', '--name-only', '--diff-filter=ACMRT',
+        last_commit, 'HEAD'
+    ]
+    try:
+        result = subprocess.run(
+            diff_cmd,
+            cwd=project_root,
+            capture_output=True,
+            text=True,
+            timeout=10
+        )
+    except OSError:
+        return None
+
+    if result.returncode != 0:
+        if verbose:
+            print(f"Commit {last_commit[:12]} not diffable, scanning by timestamp")
+        return None
+
+    if verbose:
+        print(f"Detecting changes since commit {last_commit[:12]}...")
+
+    return set(line for line in result.stdout.splitlines() if line.strip())
+
+
 def detect_changed_files(
-    timestamp: str, project_root: Path, verbose: bool = False
+    timestamp: str, project_root: Path, verbose: bool = False,
+    last_commit: Optional[str] = None
 ) -> List[str]:
     """
     Detect files changed since the given timestamp using git diff.
 
+    When the index recorded the commit it was built from, committed changes
+    come from a single ``git diff`` against that commit; otherwise (or if the
+    commit is no longer reachable) git log is scanned by timestamp.
+
     Args:
         timestamp: ISO format timestamp from last index generation (e.g., "2025-11-03T12:00:00")
         project_root: Root directory of the project
         verbose: Enable verbose logging
+        last_commit: Commit hash recorded in the index at generation time
 
     Returns:
         List of project-relative file paths that have changed
@@ -42,37 +83,41 @@ def detect_changed_files(
         subprocess.CalledProcessError: If git command fails (handled by caller for fallback)
     """
     try:
-        # Convert ISO timestamp to git format (YYYY-MM-DD HH:MM:SS)
-        dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-        git_timestamp = dt.strftime('%Y-%m-%d %H:%M:%S')
+        committed_files = None
+        if last_commit:
+            committed_files = _diff_since_commit(last_commit, project_root, verbose)
 
-        if verbose:
-            print(f"Detecting changes since {git_timestamp}...")
-
-        # Use git log to find commits since timestamp, then extract changed files
-        # This is the primary method - tracks committed changes
-        log_cmd = [
-            'git', 'log',
-            f'--since={git_timestamp}',
-            '--name-only',
-            '--pretty=format:',
-            '--diff-filter=ACMRT'
-        ]
+        if committed_files is None:
+            # Convert ISO timestamp to git format (YYYY-MM-DD HH:MM:SS)
+            dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+            git_timestamp = dt.strftime('%Y-%m-%d %H:%M:%S')
 
-        log_result = subprocess.run(
-            log_cmd,
-            cwd=project_root,
-            capture_output=True,
-            text=True,
-            timeout=10,
-            check=True
-        )
-
-        committed_files = set(
-            line.strip()
-            for line in log_result.stdout.strip().split('\n')
-            if line.strip()
-        )
+            if verbose:
+                print(f"Detecting changes since {git_timestamp}...")
+
+            # Use git log to find commits since timestamp, then extract changed files
+            log_cmd = [
+                'git', 'log',
+                f'--since={git_timestamp}',
+                '--name-only',
+                '--pretty=format:',
+                '--diff-filter=ACMRT'
+            ]
+
+            log_result = subprocess.run(
+                log_cmd,
+                cwd=project_root,
+                capture_output=True,
+                text=True,
+                timeout=10,
+                check=True
+            )
+
+            committed_files = set(
+                line.strip()
+                for line in log_result.stdout.strip().split('\n')
+                if line.strip()
+            )
 
         # Also check for uncommitted changes in working directory
         # This ensures we catch files that have been modified but not yet committed
@@ -114,9 +159,9 @@ def detect_changed_files(
 
         return tracked_files
 
-    except subprocess.TimeoutExpired:
+    except subprocess.TimeoutExpired as e:
         raise subprocess.CalledProcessError(
-            1, cmd, stderr="Git command timed out after 10 seconds"
+            1, e.cmd, stderr="Git command timed out after 10 seconds"
         )
     except (subprocess.CalledProcessError, OSError, ValueError) as e:
         # Re-raise as CalledProcessError for consistent error handling
@@ -345,10 +390,18 @@ def regenerate_affected_modules(
         get_language_name,
         build_call_graph
     )
-    from git_metadata import extract_git_metadata
+    from git_metadata import extract_git_metadata, build_git_metadata_index
 
     module_hashes = {}
     git_cache = {}  # Cache for git metadata extraction
+    # One git log pass covers every file in the affected modules
+    git_index = build_git_metadata_index(project_root, [
+        file_path
+        for module_name in affected_modules
+        for file_path in core_index['modules'].get(module_name, {}).get('files', [])
+    ])
+
+    modified_at = datetime.now().isoformat()  # One timestamp for the whole run
 
     if verbose:
         print(f"Regenerating {len(affected_modules)} affected modules...")
@@ -364,7 +417,7 @@ def regenerate_affected_modules(
         detail_module = {
             'module_id': module_name,
             'version': '2.1-enhanced',
-            'modified': datetime.now().isoformat(),
+            'modified': modified_at,
             'f': {},  # Files with full details
             'g': [],  # Local call graph (within-module)
             'doc_standard': {},
@@ -389,7 +442,7 @@ def regenerate_affected_modules(
 
             # Read file content
             try:
-                content = full_path.read_text()
+                content = index_utils.read_source_file(full_path)
             except (UnicodeDecodeError, IOError):
                 if verbose:
                     print(f"  Warning: Could not read file: {file_path}")
@@ -418,7 +471,7 @@ def regenerate_affected_modules(
             }
 
             # Add git metadata for changed files
-            git_meta = extract_git_metadata(full_path, project_root, git_cache)
+            git_meta = extract_git_metadata(full_path, project_root, git_cache, git_index)
             if git_meta:
                 file_detail['git'] = git_meta
 
@@ -447,8 +500,9 @@ def regenerate_affected_modules(
 
         # Save detail module to file
         module_path = module_dir / f"{module_name}.json"
-        with open(module_path, 'w') as f:
-            json.dump(detail_module, f, indent=2)
+        temp_path = module_dir / f"{module_name}.json.tmp"
+        index_utils.write_json_compact(temp_path, detail_module)
+        temp_path.replace(module_path)  # Atomic rename
 
         # Compute hash
         module_hash = compute_module_hash(module_path)
@@ -498,8 +552,7 @@ def incremental_update(
     if not index_path.exists():
         raise FileNotFoundError(f"Existing index not found: {index_path}")
 
-    with open(index_path, 'r') as f:
-        core_index = json.load(f)
+    core_index = index_utils.load_json(index_path)
 
     # Extract generation timestamp
     timestamp = core_index.get('at')
@@ -511,7 +564,10 @@ def incremental_update(
 
     # 2. Detect changed files
     try:
-        changed_files = detect_changed_files(timestamp, project_root, verbose)
+        changed_files = detect_changed_files(
+            timestamp, project_root, verbose,
+            last_commit=core_index.get('last_commit')
+        )
     except subprocess.CalledProcessError as e:
         if verbose:
             print(f"❌ Git command failed: {e}")
@@ -550,6 +606,9 @@ def incremental_update(
 
     # 5. Update core index metadata
     core_index['at'] = datetime.now().isoformat()
+    head = index_utils.get_git_head(project_root)
+    if head:
+        core_index['last_commit'] = head
 
     # Update module hashes in core index
     if 'module_hashes' not in core_index:
@@ -563,9 +622,8 @@ def incremental_update(
     if verbose:
         print("📊 Updating core index statistics...")
 
-    # Save updated core index
-    with open(index_path, 'w') as f:
-        json.dump(core_index, f, indent=2)
+    # Save updated core index (minified, like a full generation)
+    index_utils.write_json_compact(index_path, core_index)
 
     # 6. Validate hash consistency
     if not validate_index_integrity(core_index, module_dir, verbose):
@@ -4,18 +4,33 @@ Shared utilities for project indexing.
 Contains common functionality used by both project_index.py and hook scripts.
 """
 
+import json
+import mmap
+import os
 import re
 import fnmatch
-from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from functools import lru_cache
+from pathlib import Path, PurePath
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Optional faster JSON encoder; the stdlib json module is used when missing
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# JSON files at least this large are parsed from a memory map; below it the
+# mapping setup costs more than the copy a plain read makes
+MMAP_MIN_BYTES = 1024 * 1024  # 1MB
 
 # What to ignore (sensible defaults)
-IGNORE_DIRS = {
+IGNORE_DIRS = frozenset({
     '.git', 'node_modules', '__pycache__', '.venv', 'venv', 'env',
     'build', 'dist', '.next', 'target', '.pytest_cache', 'coverage',
     '.idea', '.vscode', '__pycache__', '.DS_Store', 'eggs', '.eggs',
     '.claude'  # Exclude Claude configuration directory
-}
+})
 
 # Languages we can fully parse (extract functions/classes)
 PARSEABLE_LANGUAGES = {
@@ -45,8 +60,83 @@ CODE_EXTENSIONS = {
 # Markdown files to analyze
 MARKDOWN_EXTENSIONS = {'.md', '.markdown', '.rst'}
 
+# Every suffix should_index_file accepts, for a single membership test
+INDEXABLE_SUFFIXES = frozenset(CODE_EXTENSIONS | MARKDOWN_EXTENSIONS)
+
+
+def dumps_compact(data: Any) -> bytes:
+    """Serialize data as minified UTF-8 JSON bytes.
+
+    Uses orjson when installed, otherwise json.dumps with compact
+    separators. Data orjson cannot encode (e.g. non-string keys) falls back
+    to the stdlib encoder.
+    """
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(data)
+        except TypeError:
+            pass
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+def write_json_compact(path: Path, data: Any) -> None:
+    """Write data to path as minified JSON without holding a second text copy.
+
+    With orjson the encoded bytes are written directly; otherwise json.dump
+    streams chunks into the file as it encodes. The stdlib path keeps
+    ASCII escapes so strings carrying undecodable filename bytes still
+    serialize.
+    """
+    if HAS_ORJSON:
+        try:
+            encoded = orjson.dumps(data)
+        except TypeError:
+            pass
+        else:
+            with open(path, 'wb') as f:
+                f.write(encoded)
+            return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'))
+
+
+def load_json(path: Path) -> Any:
+    """Read and parse a JSON file.
+
+    Uses orjson when installed, parsing files of at least MMAP_MIN_BYTES
+    straight from a read-only memory map. Documents orjson rejects but the
+    stdlib accepts (lone surrogate escapes, NaN, integers beyond 64 bits)
+    are re-parsed with json.loads, which also raises the usual
+    json.JSONDecodeError for genuinely invalid input.
+    """
+    with open(path, 'rb') as f:
+        if HAS_ORJSON and os.fstat(f.fileno()).st_size >= MMAP_MIN_BYTES:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                        memoryview(mapped) as view:
+                    return orjson.loads(view)
+            except (OSError, ValueError):
+                pass  # Read it normally below, where errors are reported
+        raw = f.read()
+    if HAS_ORJSON:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw)
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read a positive integer from the environment, falling back to default."""
+    try:
+        value = int(os.getenv(name, ''))
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
 # Maximum file size to parse (skip large files like minified bundles)
-MAX_FILE_SIZE = 500 * 1024  # 500KB
+MAX_FILE_SIZE = _env_int('INDEX_MAX_FILE_BYTES', 500 * 1024)  # 500KB
 
 # Common directory purposes
 DIRECTORY_PURPOSES = {
@@ -75,13 +165,53 @@ DIRECTORY_PURPOSES = {
 }
 
 
+# Extractor patterns are compiled once here; the extractors run them for every
+# line of every file, where even re's internal cache lookup adds up.
+_CALL_RE = re.compile(r'\b(\w+)\s*\(')
+_PY_METHOD_CALL_RE = re.compile(r'(?:self|cls|\w+)\.(\w+)\s*\(')
+_JS_METHOD_CALL_RE = re.compile(r'(?:this|\w+)\.(\w+)\s*\(')
+
+_PY_FUNC_START_RE = re.compile(r'^([ \t]*)(async\s+)?def\s+(\w+)\s*\(')
+_PY_CLASS_RE = re.compile(r'^([ \t]*)class\s+(\w+)(?:\s*\((.*?)\))?:')
+_PY_FUNC_RE = re.compile(r'^([ \t]*)(async\s+)?def\s+(\w+)\s*\((.*?)\)(?:\s*->\s*([^:]+))?:')
+_PY_SIG_END_RE = re.compile(r'\).*:')
+_PY_PROPERTY_RE = re.compile(r'^([ \t]*)(\w+)\s*:\s*([^=\n]+)')
+# Module-level constants (UPPERCASE_NAME = value)
+_PY_MODULE_CONST_RE = re.compile(r'^([A-Z_][A-Z0-9_]*)\s*=\s*(.+)$')
+# Module-level variables with type annotations
+_PY_MODULE_VAR_RE = re.compile(r'^(\w+)\s*:\s*([^=]+)\s*=')
+# Class-level constants
+_PY_CLASS_CONST_RE = re.compile(r'^([ \t]+)([A-Z_][A-Z0-9_]*)\s*=\s*(.+)$')
+# Enum value (NAME = value or just NAME)
+_PY_ENUM_VALUE_RE = re.compile(r'^([ \t]+)([A-Z_][A-Z0-9_]*)\s*(?:=\s*(.+))?$')
+_PY_IMPORT_RE = re.compile(r'^(?:from\s+([^\s]+)\s+)?import\s+(.+)$')
+_PY_TYPE_ALIAS_RE = re.compile(r'^(\w+)\s*=\s*(?:Union|Optional|List|Dict|Tuple|Set|Type|Callable|Literal|TypeVar|NewType|TypedDict|Protocol)\[.+\]$')
+_PY_DECORATOR_RE = re.compile(r'^([ \t]*)@(\w+)(?:\(.*\))?$')
+# Docstring on the line after a function/class
+_PY_DOCSTRING_RE = re.compile(r'^([ \t]*)(?:\'\'\'|""")(.+?)(?:\'\'\'|""")')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Style 1: function_name() { ... }
+_SH_FUNC_RE = re.compile(r'^(\w+)\s*\(\)\s*\{?')
+# Style 2: function function_name { ... }
+_SH_FUNCTION_KEYWORD_RE = re.compile(r'^function\s+(\w+)\s*\{?')
+_SH_EXPORT_RE = re.compile(r'^export\s+([A-Z_][A-Z0-9_]*)(=(.*))?')
+_SH_VAR_RE = re.compile(r'^([A-Z_][A-Z0-9_]*)=(.+)$')
+# Source patterns - handle quotes and command substitution
+_SH_SOURCE_RES = (
+    re.compile(r'^(?:source|\.)\s+([\'"])([^\'"]+)\1'),  # Quoted paths
+    re.compile(r'^(?:source|\.)\s+(\$\([^)]+\)[^\s]*)'),  # Command substitution like $(dirname "$0")/file
+    re.compile(r'^(?:source|\.)\s+([^\s]+)'),  # Unquoted paths
+)
+_SH_PARAM_RE = re.compile(r'\$(\d+)')
+
+
 def extract_function_calls_python(body: str, all_functions: Set[str]) -> List[str]:
     """Extract function calls from Python code body."""
     calls = set()
     
-    # Pattern for function calls: word followed by (
+    # Function calls are a word followed by (
     # Excludes: control flow keywords, built-ins we don't care about
-    call_pattern = r'\b(\w+)\s*\('
     exclude_keywords = {
         'if', 'elif', 'while', 'for', 'with', 'except', 'def', 'class',
         'return', 'yield', 'raise', 'assert', 'print', 'len', 'str', 
@@ -90,14 +220,13 @@ def extract_function_calls_python(body: str, all_functions: Set[str]) -> List[st
         'map', 'filter', 'sorted', 'reversed', 'open', 'input', 'eval'
     }
     
-    for match in re.finditer(call_pattern, body):
+    for match in _CALL_RE.finditer(body):
         func_name = match.group(1)
         if func_name in all_functions and func_name not in exclude_keywords:
             calls.add(func_name)
     
     # Also catch method calls like self.method() or obj.method()
-    method_pattern = r'(?:self|cls|\w+)\.(\w+)\s*\('
-    for match in re.finditer(method_pattern, body):
+    for match in _PY_METHOD_CALL_RE.finditer(body):
         method_name = match.group(1)
         if method_name in all_functions:
             calls.add(method_name)
@@ -109,8 +238,6 @@ def extract_function_calls_javascript(body: str, all_functions: Set[str]) -> Lis
     """Extract function calls from JavaScript/TypeScript code body."""
     calls = set()
     
-    # Pattern for function calls
-    call_pattern = r'\b(\w+)\s*\('
     exclude_keywords = {
         'if', 'while', 'for', 'switch', 'catch', 'function', 'class',
         'return', 'throw', 'new', 'typeof', 'instanceof', 'void',
@@ -118,14 +245,13 @@ def extract_function_calls_javascript(body: str, all_functions: Set[str]) -> Lis
         'Promise', 'Math', 'Date', 'JSON', 'parseInt', 'parseFloat'
     }
     
-    for match in re.finditer(call_pattern, body):
+    for match in _CALL_RE.finditer(body):
         func_name = match.group(1)
         if func_name in all_functions and func_name not in exclude_keywords:
             calls.add(func_name)
     
     # Method calls: obj.method() or this.method()
-    method_pattern = r'(?:this|\w+)\.(\w+)\s*\('
-    for match in re.finditer(method_pattern, body):
+    for match in _JS_METHOD_CALL_RE.finditer(body):
         method_name = match.group(1)
         if method_name in all_functions:
             calls.add(method_name)
@@ -133,11 +259,10 @@ def extract_function_calls_javascript(body: str, all_functions: Set[str]) -> Lis
     return sorted(list(calls))
 
 
-def build_call_graph(functions: Dict, classes: Dict) -> Tuple[Dict, Dict]:
-    """Build bidirectional call graph from extracted functions and methods."""
+def build_calls_map(functions: Dict, classes: Dict) -> Dict[str, List[str]]:
+    """Map each function and Class.method name to the names it calls."""
     calls_map = {}
-    called_by_map = {}
-    
+
     # Build calls_map from functions
     for func_name, func_info in functions.items():
         if isinstance(func_info, dict) and 'calls' in func_info:
@@ -150,16 +275,22 @@ def build_call_graph(functions: Dict, classes: Dict) -> Tuple[Dict, Dict]:
                 if isinstance(method_info, dict) and 'calls' in method_info:
                     full_method_name = f"{class_name}.{method_name}"
                     calls_map[full_method_name] = method_info['calls']
-    
-    # Build the reverse index (called_by_map)
+
+    return calls_map
+
+
+def build_call_graph(functions: Dict, classes: Dict) -> Tuple[Dict, Dict]:
+    """Build bidirectional call graph from extracted functions and methods."""
+    calls_map = build_calls_map(functions, classes)
+    called_by_map = {}
+
+    # Build the reverse index (called_by_map); dict keys keep first-seen
+    # order and drop duplicate callers without a list scan per edge
     for func_name, called_funcs in calls_map.items():
         for called_func in called_funcs:
-            if called_func not in called_by_map:
-                called_by_map[called_func] = []
-            if func_name not in called_by_map[called_func]:
-                called_by_map[called_func].append(func_name)
+            called_by_map.setdefault(called_func, {})[func_name] = None
     
-    return calls_map, called_by_map
+    return calls_map, {called: list(callers) for called, callers in called_by_map.items()}
 
 
 def extract_python_signatures(content: str) -> Dict[str, Dict]:
@@ -186,28 +317,9 @@ def extract_python_signatures(content: str) -> Dict[str, Dict]:
     # First pass: collect all function and method names for call detection
     all_function_names = set()
     for line in lines:
-        func_match = re.match(r'^(?:[ \t]*)(async\s+)?def\s+(\w+)\s*\(', line)
+        func_match = _PY_FUNC_START_RE.match(line)
         if func_match:
-            all_function_names.add(func_match.group(2))
-    
-    # Patterns
-    class_pattern = r'^([ \t]*)class\s+(\w+)(?:\s*\((.*?)\))?:'
-    func_pattern = r'^([ \t]*)(async\s+)?def\s+(\w+)\s*\((.*?)\)(?:\s*->\s*([^:]+))?:'
-    property_pattern = r'^([ \t]*)(\w+)\s*:\s*([^=\n]+)'
-    # Module-level constants (UPPERCASE_NAME = value)
-    module_const_pattern = r'^([A-Z_][A-Z0-9_]*)\s*=\s*(.+)$'
-    # Module-level variables with type annotations
-    module_var_pattern = r'^(\w+)\s*:\s*([^=]+)\s*='
-    # Class-level constants
-    class_const_pattern = r'^([ \t]+)([A-Z_][A-Z0-9_]*)\s*=\s*(.+)$'
-    # Import patterns
-    import_pattern = r'^(?:from\s+([^\s]+)\s+)?import\s+(.+)$'
-    # Type alias pattern
-    type_alias_pattern = r'^(\w+)\s*=\s*(?:Union|Optional|List|Dict|Tuple|Set|Type|Callable|Literal|TypeVar|NewType|TypedDict|Protocol)\[.+\]$'
-    # Decorator pattern
-    decorator_pattern = r'^([ \t]*)@(\w+)(?:\(.*\))?$'
-    # Docstring pattern (matches next line after function/class)
-    docstring_pattern = r'^([ \t]*)(?:\'\'\'|""")(.+?)(?:\'\'\'|""")'
+            all_function_names.add(func_match.group(3))
     
     # Dunder methods to skip (unless in critical files)
     skip_dunder = {'__repr__', '__str__', '__hash__', '__eq__', '__ne__', 
@@ -215,7 +327,7 @@ def extract_python_signatures(content: str) -> Dict[str, Dict]:
     
     # First pass: Extract imports
     for line in lines:
-        import_match = re.match(import_pattern, line.strip())
+        import_match = _PY_IMPORT_RE.match(line.strip())
         if import_match:
             module, items = import_match.groups()
             if module:
@@ -240,7 +352,7 @@ def extract_python_signatures(content: str) -> Dict[str, Dict]:
             continue
         
         # Check for decorators
-        decorator_match = re.match(decorator_pattern, line)
+        decorator_match = _PY_DECORATOR_RE.match(line)
         if decorator_match:
             _, decorator_name = decorator_match.groups()
             pending_decorators.append(decorator_name)
@@ -250,14 +362,14 @@ def extract_python_signatures(content: str) -> Dict[str, Dict]:
         # Check for module-level constants (before checking classes)
         if not current_class:  # Only at module level
             # Check for type aliases first
-            type_alias_match = re.match(type_alias_pattern, line)
+            type_alias_match = _PY_TYPE_ALIAS_RE.match(line)
             if type_alias_match:
                 alias_name = type_alias_match.group(1)
                 result['type_aliases'][alias_name] = line.split('=', 1)[1].strip()
                 i += 1
                 continue
             
-            const_match = re.match(module_const_pattern, line)
+            const_match = _PY_MODULE_CONST_RE.match(line)
             if const_match:
                 const_name, const_value = const_match.groups()
                 # Clean up the value (remove comments, strip quotes for readability)
@@ -276,7 +388,7 @@ def extract_python_signatures(content: str) -> Dict[str, Dict]:
                 continue
             
             # Check for module-level typed variables
-            var_match = re.match(module_var_pattern, line)
+            var_match = _PY_MODULE_VAR_RE.match(line)
             if var_match:
                 var_name, var_type = var_match.groups()
                 if var_name not in result['variables'] and not var_name.startswith('_'):
@@ -285,7 +397,7 @@ def extract_python_signatures(content: str) -> Dict[str, Dict]:
                 continue
         
         # Check for class definition
-        class_match = re.match(class_pattern, line)
+        class_match = _PY_CLASS_RE.match(line)
         if class_match:
             indent, name, bases = class_match.groups()
             indent_level = len(indent)
@@ -322,7 +434,7 @@ def extract_python_signatures(content: str) -> Dict[str, Dict]:
                 # Extract docstring
                 if i + 1 < len(lines):
                     next_line = lines[i + 1].strip()
-                    doc_match = re.match(docstring_pattern, lines[i + 1])
+                    doc_match = _PY_DOCSTRING_RE.match(lines[i + 1])
                     if doc_match:
                         _, doc_content = doc_match.groups()
                         class_info['doc'] = doc_content.strip()
@@ -348,9 +460,7 @@ def extract_python_signatures(content: str) -> Dict[str, Dict]:
         if current_class:
             # For enums, capture all uppercase attributes as values
             if result['classes'][current_class].get('type') == 'enum':
-                # Enum value pattern (NAME = value or just NAME)
-                enum_val_pattern = r'^([ \t]+)([A-Z_][A-Z0-9_]*)\s*(?:=\s*(.+))?$'
-                enum_match = re.match(enum_val_pattern, line)
+                enum_match = _PY_ENUM_VALUE_RE.match(line)
                 if enum_match:
                     indent, enum_name, enum_value = enum_match.groups()
                     if len(indent) > current_class_indent:
@@ -360,7 +470,7 @@ def extract_python_signatures(content: str) -> Dict[str, Dict]:
                         i += 1
                         continue
             
-            class_const_match = re.match(class_const_pattern, line)
+            class_const_match = _PY_CLASS_CONST_RE.match(line)
             if class_const_match:
                 indent, const_name, const_value = class_const_match.groups()
                 if len(indent) > current_class_indent:
@@ -381,8 +491,7 @@ def extract_python_signatures(content: str) -> Dict[str, Dict]:
         
         # Check for function/method definition
         # First check if this line starts a function definition
-        func_start_pattern = r'^([ \t]*)(async\s+)?def\s+(\w+)\s*\('
-        func_start_match = re.match(func_start_pattern, line)
+        func_start_match = _PY_FUNC_START_RE.match(line)
         
         if func_start_match:
             indent, is_async, name = func_start_match.groups()
@@ -393,7 +502,7 @@ def extract_python_signatures(content: str) -> Dict[str, Dict]:
             j = i
             
             # Keep collecting lines until we find the colon that ends the signature
-            while j < len(lines) and not re.search(r'\).*:', lines[j]):
+            while j < len(lines) and not _PY_SIG_END_RE.search(lines[j]):
                 j += 1
                 if j < len(lines):
                     full_sig += ' ' + lines[j].strip()
@@ -404,7 +513,7 @@ def extract_python_signatures(content: str) -> Dict[str, Dict]:
                 continue
                 
             # Now parse the complete signature
-            complete_match = re.match(func_pattern, full_sig)
+            complete_match = _PY_FUNC_RE.match(full_sig)
             if complete_match:
                 indent, is_async, name, params, return_type = complete_match.groups()
                 i = j  # Skip to the last line we processed
@@ -414,7 +523,7 @@ def extract_python_signatures(content: str) -> Dict[str, Dict]:
                 continue
             
             # Clean params
-            params = re.sub(r'\s+', ' ', params).strip()
+            params = _WHITESPACE_RE.sub(' ', params).strip()
             
             # Skip certain dunder methods (except __init__)
             if name in skip_dunder and name != '__init__':
@@ -444,7 +553,7 @@ def extract_python_signatures(content: str) -> Dict[str, Dict]:
             
             # Extract docstring
             if i + 1 < len(lines):
-                doc_match = re.match(docstring_pattern, lines[i + 1])
+                doc_match = _PY_DOCSTRING_RE.match(lines[i + 1])
                 if doc_match:
                     _, doc_content = doc_match.groups()
                     func_info['doc'] = doc_content.strip()
@@ -497,7 +606,7 @@ def extract_python_signatures(content: str) -> Dict[str, Dict]:
         
         # Check for class properties
         if current_class:
-            prop_match = re.match(property_pattern, line)
+            prop_match = _PY_PROPERTY_RE.match(line)
             if prop_match:
                 indent, prop_name, prop_type = prop_match.groups()
                 if len(indent) > current_class_indent and not prop_name.startswith('_'):
@@ -764,7 +873,7 @@ def extract_javascript_signatures(content: str) -> Dict[str, any]:
                 }
                 
                 # Build full signature
-                params = re.sub(r'\s+', ' ', params).strip()
+                params = _WHITESPACE_RE.sub(' ', params).strip()
                 signature = f"({params})"
                 if return_type:
                     signature += f": {return_type.strip()}"
@@ -846,7 +955,7 @@ def extract_javascript_signatures(content: str) -> Dict[str, any]:
                 }
                 
                 # Build full signature
-                params = re.sub(r'\s+', ' ', params).strip()
+                params = _WHITESPACE_RE.sub(' ', params).strip()
                 signature = f"({params})"
                 if return_type:
                     signature += f": {return_type.strip()}"
@@ -911,20 +1020,17 @@ def extract_function_calls_shell(body: str, all_functions: Set[str]) -> List[str
     """Extract function calls from shell script body."""
     calls = set()
     
+    if not all_functions:
+        return []
+    
     # In shell, functions are called just by name (no parentheses)
-    # We need to be careful to avoid false positives
-    for func_name in all_functions:
-        # Look for function name at start of line or after common shell operators
-        patterns = [
-            rf'^\s*{func_name}\b',  # Start of line
-            rf'[;&|]\s*{func_name}\b',  # After operators
-            rf'\$\({func_name}\b',  # Command substitution
-            rf'`{func_name}\b',  # Backtick substitution
-        ]
-        for pattern in patterns:
-            if re.search(pattern, body, re.MULTILINE):
-                calls.add(func_name)
-                break
+    # We need to be careful to avoid false positives: a name only counts at the
+    # start of a line, after ; & |, or inside $( ) / backtick substitution.
+    # All names share one alternation so the body is scanned once.
+    names = '|'.join(re.escape(name) for name in sorted(all_functions, key=len, reverse=True))
+    pattern = re.compile(rf'(?:^\s*|[;&|]\s*|\$\(|`)({names})\b', re.MULTILINE)
+    for match in pattern.finditer(body):
+        calls.add(match.group(1))
     
     return sorted(list(calls))
 
@@ -945,33 +1051,14 @@ def extract_shell_signatures(content: str) -> Dict[str, any]:
     all_function_names = set()
     for line in lines:
         # Style 1: function_name() {
-        match1 = re.match(r'^(\w+)\s*\(\)\s*\{?', line)
+        match1 = _SH_FUNC_RE.match(line)
         if match1:
             all_function_names.add(match1.group(1))
         # Style 2: function function_name {
-        match2 = re.match(r'^function\s+(\w+)\s*\{?', line)
+        match2 = _SH_FUNCTION_KEYWORD_RE.match(line)
         if match2:
             all_function_names.add(match2.group(1))
     
-    # Function patterns
-    # Style 1: function_name() { ... }
-    func_pattern1 = r'^(\w+)\s*\(\)\s*\{?'
-    # Style 2: function function_name { ... }
-    func_pattern2 = r'^function\s+(\w+)\s*\{?'
-    
-    # Variable patterns
-    # Export pattern: export VAR=value
-    export_pattern = r'^export\s+([A-Z_][A-Z0-9_]*)(=(.*))?'
-    # Regular variable: VAR=value (uppercase)
-    var_pattern = r'^([A-Z_][A-Z0-9_]*)=(.+)$'
-    
-    # Source patterns - handle quotes and command substitution
-    source_patterns = [
-        r'^(?:source|\.)\s+([\'"])([^\'"]+)\1',  # Quoted paths
-        r'^(?:source|\.)\s+(\$\([^)]+\)[^\s]*)',  # Command substitution like $(dirname "$0")/file
-        r'^(?:source|\.)\s+([^\s]+)',  # Unquoted paths
-    ]
-    
     # Track if we're in a function
     in_function = False
     current_function = None
@@ -985,7 +1072,7 @@ def extract_shell_signatures(content: str) -> Dict[str, any]:
             continue
             
         # Check for function definition (style 1)
-        match = re.match(func_pattern1, stripped)
+        match = _SH_FUNC_RE.match(stripped)
         if match:
             func_name = match.group(1)
             # Extract documentation comment if present
@@ -1013,7 +1100,7 @@ def extract_shell_signatures(content: str) -> Dict[str, any]:
                 
                 # Only look for parameters inside the function body
                 if in_func_body:
-                    param_matches = re.findall(r'\$(\d+)', lines[j])
+                    param_matches = _SH_PARAM_RE.findall(lines[j])
                     for p in param_matches:
                         param_num = int(p)
                         if param_num > 0 and param_num not in params:
@@ -1061,7 +1148,7 @@ def extract_shell_signatures(content: str) -> Dict[str, any]:
             continue
             
         # Check for function definition (style 2)
-        match = re.match(func_pattern2, stripped)
+        match = _SH_FUNCTION_KEYWORD_RE.match(stripped)
         if match:
             func_name = match.group(1)
             # Extract documentation comment if present
@@ -1089,7 +1176,7 @@ def extract_shell_signatures(content: str) -> Dict[str, any]:
                 
                 # Only look for parameters inside the function body
                 if in_func_body:
-                    param_matches = re.findall(r'\$(\d+)', lines[j])
+                    param_matches = _SH_PARAM_RE.findall(lines[j])
                     for p in param_matches:
                         param_num = int(p)
                         if param_num > 0 and param_num not in params:
@@ -1137,7 +1224,7 @@ def extract_shell_signatures(content: str) -> Dict[str, any]:
             continue
         
         # Check for exports
-        match = re.match(export_pattern, stripped)
+        match = _SH_EXPORT_RE.match(stripped)
         if match:
             var_name = match.group(1)
             var_value = match.group(3) if match.group(3) else None
@@ -1153,7 +1240,7 @@ def extract_shell_signatures(content: str) -> Dict[str, any]:
             continue
         
         # Check for regular variables (uppercase)
-        match = re.match(var_pattern, stripped)
+        match = _SH_VAR_RE.match(stripped)
         if match:
             var_name = match.group(1)
             # Only track if not already in exports
@@ -1162,8 +1249,8 @@ def extract_shell_signatures(content: str) -> Dict[str, any]:
             continue
         
         # Check for source/dot includes
-        for source_pattern in source_patterns:
-            match = re.match(source_pattern, stripped)
+        for source_re in _SH_SOURCE_RES:
+            match = source_re.match(stripped)
             if match:
                 # Extract the file path based on which pattern matched
                 if len(match.groups()) == 2:  # Quoted pattern
@@ -1488,12 +1575,14 @@ def extract_options_api_methods(script_content: str, all_functions: Set[str]) ->
 def extract_markdown_structure(file_path: Path) -> Dict[str, List[str]]:
     """Extract headers and architectural hints from markdown files."""
     try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
+        # Only the first 5000 characters are scanned; a UTF-8 character is at
+        # most 4 bytes, so there is no need to read (or decode) beyond that
+        content = read_source_file(file_path, limit=4 * 5000)[:5000]
     except (OSError, IOError):
         return {'sections': [], 'architecture_hints': []}
     
     # Extract headers (up to level 3)
-    headers = re.findall(r'^#{1,3}\s+(.+)$', content[:5000], re.MULTILINE)  # Only scan first 5KB
+    headers = re.findall(r'^#{1,3}\s+(.+)$', content, re.MULTILINE)
     
     # Look for architectural hints
     arch_patterns = [
@@ -1505,7 +1594,7 @@ def extract_markdown_structure(file_path: Path) -> Dict[str, List[str]]:
     
     hints = set()
     for pattern in arch_patterns:
-        matches = re.findall(pattern, content[:5000], re.IGNORECASE)
+        matches = re.findall(pattern, content, re.IGNORECASE)
         for match in matches:
             if '/' in match and not match.startswith('http'):
                 hints.add(match)
@@ -1518,8 +1607,12 @@ def extract_markdown_structure(file_path: Path) -> Dict[str, List[str]]:
 
 def infer_file_purpose(file_path: Path) -> Optional[str]:
     """Infer the purpose of a file from its name and location."""
-    name = file_path.stem.lower()
-    
+    return _infer_purpose_from_name(file_path.stem.lower())
+
+
+@lru_cache(maxsize=4096)
+def _infer_purpose_from_name(name: str) -> Optional[str]:
+    """Map a lowercased file stem to a purpose (cached: stems like index/main repeat)."""
     # Common file purposes
     if name in ['index', 'main', 'app']:
         return 'Application entry point'
@@ -1539,7 +1632,7 @@ def infer_file_purpose(file_path: Path) -> Optional[str]:
     return None
 
 
-def infer_directory_purpose(path: Path, files_within: List[str]) -> Optional[str]:
+def infer_directory_purpose(path: PurePath, files_within: List[str]) -> Optional[str]:
     """Infer directory purpose from naming patterns and contents."""
     dir_name = path.name.lower()
     
@@ -1587,11 +1680,20 @@ def extract_lightweight_signature(func_data: Dict, func_name: str) -> str:
         return f"{func_name}:0"
 
 
+# Cache of extension -> language name, filled on first sight of each suffix
+_language_name_cache = {}
+
+
 def get_language_name(extension: str) -> str:
     """Get readable language name from extension."""
-    if extension in PARSEABLE_LANGUAGES:
-        return PARSEABLE_LANGUAGES[extension]
-    return extension[1:] if extension else 'unknown'
+    name = _language_name_cache.get(extension)
+    if name is None:
+        if extension in PARSEABLE_LANGUAGES:
+            name = PARSEABLE_LANGUAGES[extension]
+        else:
+            name = extension[1:] if extension else 'unknown'
+        _language_name_cache[extension] = name
+    return name
 
 
 # Global cache for gitignore patterns
@@ -1695,13 +1797,12 @@ def should_index_file(path: Path, root_path: Path = None) -> bool:
     - Exceed MAX_FILE_SIZE (likely generated/minified files)
     """
     # Must be a code or markdown file
-    if not (path.suffix in CODE_EXTENSIONS or path.suffix in MARKDOWN_EXTENSIONS):
+    if path.suffix not in INDEXABLE_SUFFIXES:
         return False
 
     # Skip if in hardcoded ignored directory (for safety)
-    for part in path.parts:
-        if part in IGNORE_DIRS:
-            return False
+    if not IGNORE_DIRS.isdisjoint(path.parts):
+        return False
 
     # If root_path provided, check gitignore patterns
     if root_path:
@@ -1711,7 +1812,7 @@ def should_index_file(path: Path, root_path: Path = None) -> bool:
 
     # Skip large files (likely generated/minified bundles)
     try:
-        if path.exists() and path.stat().st_size > MAX_FILE_SIZE:
+        if path.stat().st_size > MAX_FILE_SIZE:
             return False
     except OSError:
         pass  # File may not be accessible, proceed anyway
@@ -1719,26 +1820,64 @@ def should_index_file(path: Path, root_path: Path = None) -> bool:
     return True
 
 
+def read_source_bytes(path: Path, limit: Optional[int] = None) -> bytes:
+    """Read at most limit bytes (default MAX_FILE_SIZE) of a file.
+
+    Reads through a raw file descriptor so a file that grew past the size
+    check in should_index_file never gets loaded whole.
+    """
+    remaining = MAX_FILE_SIZE if limit is None else limit
+    chunks = []
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        while remaining > 0:
+            chunk = os.read(fd, min(remaining, 64 * 1024))
+            if not chunk:
+                break
+            chunks.append(chunk)
+            remaining -= len(chunk)
+    finally:
+        os.close(fd)
+    return b''.join(chunks)
+
+
+def decode_source(raw: bytes) -> str:
+    """Decode source bytes as UTF-8, dropping undecodable bytes.
+
+    Newlines are translated as Path.read_text would, so CRLF and CR files
+    match the $-anchored extractor patterns.
+    """
+    text = raw.decode('utf-8', errors='ignore')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def read_source_file(path: Path, limit: Optional[int] = None) -> str:
+    """Read at most limit bytes of a file as UTF-8 text, dropping undecodable bytes."""
+    return decode_source(read_source_bytes(path, limit))
+
+
 def get_git_files(root_path: Path) -> Optional[List[Path]]:
     """Get list of files tracked by git (respects .gitignore).
     Returns None if not a git repository or git command fails."""
     try:
         import subprocess
         
-        # Run git ls-files to get tracked and untracked files that aren't ignored
+        # Run git ls-files to get tracked and untracked files that aren't ignored.
+        # -z emits NUL-separated, unquoted paths so the output splits in one pass.
         result = subprocess.run(
-            ['git', 'ls-files', '--cached', '--others', '--exclude-standard'],
+            ['git', 'ls-files', '-z', '--cached', '--others', '--exclude-standard'],
             cwd=str(root_path),
             capture_output=True,
-            text=True,
             timeout=10
         )
         
         if result.returncode == 0:
             files = []
-            for line in result.stdout.strip().split('\n'):
-                if line:
-                    file_path = root_path / line
+            for name in result.stdout.decode('utf-8', 'surrogateescape').split('\0'):
+                if name:
+                    file_path = root_path / name
                     # Only include actual files (not directories)
                     if file_path.is_file():
                         files.append(file_path)
@@ -1747,4 +1886,24 @@ def get_git_files(root_path: Path) -> Optional[List[Path]]:
             return None
     except (subprocess.TimeoutExpired, FileNotFoundError, Exception):
         # Git not available or command failed
+        return None
+
+
+def get_git_head(root_path: Path) -> Optional[str]:
+    """Get the commit hash HEAD points at.
+    Returns None if not a git repository, HEAD is unborn, or git fails."""
+    try:
+        import subprocess
+
+        result = subprocess.run(
+            ['git', 'rev-parse', '--verify', '-q', 'HEAD'],
+            cwd=str(root_path),
+            capture_output=True,
+            text=True,
+            timeout=10
+        )
+        if result.returncode == 0:
+            return result.stdout.strip() or None
+        return None
+    except (subprocess.TimeoutExpired, FileNotFoundError, Exception):
         return None
\ No newline at end of file
@@ -13,6 +13,12 @@ import json
 import logging
 import warnings
 
+try:
+    from index_utils import load_json
+except ImportError:
+    # Imported as scripts.loader from the repository root
+    from scripts.index_utils import load_json
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -90,8 +96,7 @@ def load_detail_module(module_name: str, index_dir: Optional[Path] = None) -> Di
 
     # Load and parse JSON
     try:
-        with open(module_path, 'r', encoding='utf-8') as f:
-            module_data = json.load(f)
+        module_data = load_json(module_path)
     except json.JSONDecodeError as e:
         raise json.JSONDecodeError(
             f"Invalid JSON in detail module '{module_name}': {e.msg}",
@@ -400,8 +405,7 @@ def load_doc_tier(
 
     for module_file in index_dir.glob("*.json"):
         try:
-            with open(module_file, 'r', encoding='utf-8') as f:
-                module_data = json.load(f)
+            module_data = load_json(module_file)
 
             # Extract tier docs from this module
             tier_docs = module_data.get(tier_key, {})
@@ -16,37 +16,83 @@ Output: PROJECT_INDEX.json
 
 __version__ = "0.2.0-beta"
 
+import hashlib
+import heapq
 import json
+import logging
+import math
 import os
 import re
 import shutil
 import subprocess
 import sys
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
-from pathlib import Path
-from typing import Dict, List, Optional, Tuple, NamedTuple
+from pathlib import Path, PurePath, PurePosixPath
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, NamedTuple
 from urllib.request import urlopen, Request
 from urllib.error import URLError, HTTPError
 import socket
 
 # Import shared utilities
 from index_utils import (
-    IGNORE_DIRS, PARSEABLE_LANGUAGES, CODE_EXTENSIONS, MARKDOWN_EXTENSIONS,
+    IGNORE_DIRS, PARSEABLE_LANGUAGES, CODE_EXTENSIONS, MARKDOWN_EXTENSIONS, INDEXABLE_SUFFIXES,
     DIRECTORY_PURPOSES, extract_python_signatures, extract_javascript_signatures,
     extract_shell_signatures, extract_vue_signatures, extract_markdown_structure,
     infer_file_purpose, infer_directory_purpose, get_language_name,
-    should_index_file, get_git_files
+    should_index_file, get_git_files, get_git_head, read_source_bytes, decode_source,
+    dumps_compact, write_json_compact, load_json
 )
 from doc_classifier import classify_documentation
-from git_metadata import extract_git_metadata
+from git_metadata import extract_git_metadata, build_git_metadata_index
 from signature_cache import (
-    load_cache, save_cache, get_cached_signature, set_cached_signature
+    CACHE_DIR, load_cache, save_cache, prune_cache, lookup_cached_signature,
+    set_cached_signature, _empty_cache
 )
 
+# Configure logging
+logger = logging.getLogger(__name__)
+
 # Limits to keep it fast and simple
 MAX_FILES = 10000
 MAX_INDEX_SIZE = 1024 * 1024  # 1MB
 MAX_TREE_DEPTH = 5
+PARALLEL_PARSE_MIN_FILES = 200  # Below this, worker startup outweighs the parsing win
+PARALLEL_DETAIL_MIN_MODULES = 4  # Fewer detail modules are built in-process
+IO_THREADS = 8  # Directory walks and detail module reads are IO-bound, so threads overlap them
+DETAIL_MANIFEST_FILE = "detail-manifest.json"  # In CACHE_DIR: module_id -> [sha256, size, mtime_ns]
+
+# Files listed in the directory tree alongside directories
+TREE_IMPORTANT_FILES = frozenset({
+    'README.md', 'package.json', 'requirements.txt', 'Cargo.toml', 'go.mod',
+    'pom.xml', 'build.gradle', 'setup.py', 'pyproject.toml', 'Makefile'
+})
+
+# Byte strings a file must contain for its extractor to find any function or
+# class; checked on the raw bytes so files without them are never decoded
+_JS_MARKERS = (b'function', b'=>', b'class')
+SIGNATURE_MARKERS = {
+    '.py': (b'def', b'class'),
+    '.js': _JS_MARKERS, '.ts': _JS_MARKERS, '.jsx': _JS_MARKERS, '.tsx': _JS_MARKERS,
+    '.sh': (b'()', b'function'), '.bash': (b'()', b'function'),
+}
+
+# Signature extractor for each parseable suffix
+SIGNATURE_EXTRACTORS = {
+    '.py': extract_python_signatures,
+    '.js': extract_javascript_signatures, '.ts': extract_javascript_signatures,
+    '.jsx': extract_javascript_signatures, '.tsx': extract_javascript_signatures,
+    '.sh': extract_shell_signatures, '.bash': extract_shell_signatures,
+    '.vue': extract_vue_signatures,
+}
+
+# Dense format abbreviations, applied in a single regex pass per string
+PATH_ABBREVIATIONS = {'scripts/': 's/', 'src/': 'sr/', 'tests/': 't/'}
+_PATH_ABBREV_RE = re.compile('|'.join(re.escape(p) for p in PATH_ABBREVIATIONS))
+SIGNATURE_ABBREVIATIONS = {' -> ': '>', ': ': ':'}
+_SIGNATURE_ABBREV_RE = re.compile('|'.join(re.escape(p) for p in SIGNATURE_ABBREVIATIONS))
+DENSE_LANGUAGE_CODES = {'python': 'p', 'javascript': 'j', 'typescript': 't', 'shell': 's', 'json': 'j'}
 
 
 def read_version_file() -> str:
@@ -291,6 +337,11 @@ def check_for_updates(no_update_check: bool = False) -> Optional[UpdateInfo]:
         socket.setdefaulttimeout(None)
 
 
+# Matches a leading "version" key so the format can be read without a full parse
+_INDEX_VERSION_RE = re.compile(rb'\s*\{\s*"version"\s*:\s*"([^"\\]*)"')
+_INDEX_VERSION_PROBE_BYTES = 512
+
+
 def detect_index_format(index_path: Path = None) -> str:
     """
     Detect whether index is legacy or split format.
@@ -313,14 +364,18 @@ def detect_index_format(index_path: Path = None) -> str:
     if not index_dir.exists():
         return "legacy"
 
-    # Secondary check: version field
+    # Secondary check: version field. Indexes are written with "version" as
+    # the first key, so probing the head of the file avoids parsing it all.
     try:
-        with open(index_path) as f:
-            data = json.load(f)
-            version = data.get("version", "1.0")
-            # Split format: v2.0-split, v2.1-enhanced, v2.2-submodules, or any future v2.x-* versions
-            if version.startswith("2.") and ("-split" in version or "-enhanced" in version or "-submodules" in version):
-                return "split"
+        with open(index_path, 'rb') as f:
+            match = _INDEX_VERSION_RE.match(f.read(_INDEX_VERSION_PROBE_BYTES))
+        if match:
+            version = match.group(1).decode('utf-8')
+        else:
+            version = load_json(index_path).get("version", "1.0")
+        # Split format: v2.0-split, v2.1-enhanced, v2.2-submodules, or any future v2.x-* versions
+        if version.startswith("2.") and ("-split" in version or "-enhanced" in version or "-submodules" in version):
+            return "split"
     except (FileNotFoundError, json.JSONDecodeError, Exception):
         # If index file doesn't exist or is corrupted, but directory exists,
         # assume legacy until proven otherwise
@@ -329,6 +384,27 @@ def detect_index_format(index_path: Path = None) -> str:
     return "legacy"
 
 
+# Configuration validation tables: (key, validity check, warning[, default]).
+# Exact type checks keep JSON true/false from passing as the integers 1/0.
+_CONFIG_VALIDATORS = (
+    ('mode', lambda v: v in ('auto', 'split', 'single'),
+     "Invalid mode '{value}' in config file, ignoring"),
+    ('threshold', lambda v: type(v) in (int, float) and v > 0,
+     "Invalid threshold '{value}' in config file, ignoring"),
+)
+_SUBMODULE_CONFIG_VALIDATORS = (
+    ('enabled', lambda v: type(v) is bool, True,
+     "Invalid submodule_config.enabled (must be boolean), using default: true"),
+    ('threshold', lambda v: type(v) is int and v > 0, 100,
+     "Invalid submodule_config.threshold (must be positive integer), using default: 100"),
+    ('strategy', lambda v: v in ('auto', 'force', 'disabled'), 'auto',
+     "Invalid submodule_config.strategy, using default: 'auto'"),
+    ('max_depth', lambda v: type(v) is int and 1 <= v <= 3, 3,
+     "Invalid submodule_config.max_depth (must be 1-3), using default: 3"),
+)
+_SUBMODULE_CONFIG_DEFAULTS = {key: default for key, _, default, _ in _SUBMODULE_CONFIG_VALIDATORS}
+
+
 def load_configuration(config_path: Optional[Path] = None, project_root: Optional[Path] = None) -> Dict[str, any]:
     """
     Load configuration from .project-index.json file.
@@ -433,50 +509,23 @@ def load_configuration(config_path: Optional[Path] = None, project_root: Optiona
             return {}
 
     try:
-        with open(config_path) as f:
-            config = json.load(f)
-
-        # Validate mode if present
-        if 'mode' in config:
-            valid_modes = ['auto', 'split', 'single']
-            if config['mode'] not in valid_modes:
-                print(f"⚠️  Warning: Invalid mode '{config['mode']}' in config file, ignoring")
-                config.pop('mode')
-
-        # Validate threshold if present
-        if 'threshold' in config:
-            if not isinstance(config['threshold'], (int, float)) or config['threshold'] <= 0:
-                print(f"⚠️  Warning: Invalid threshold '{config['threshold']}' in config file, ignoring")
-                config.pop('threshold')
+        config = load_json(config_path)
+
+        # Validate top-level keys: invalid values are dropped
+        for key, is_valid, message in _CONFIG_VALIDATORS:
+            if key in config and not is_valid(config[key]):
+                print(f"⚠️  Warning: {message.format(value=config[key])}")
+                config.pop(key)
 
         # Validate submodule_config if present
         if 'submodule_config' in config:
             submod_config = config['submodule_config']
 
-            # Validate enabled flag
-            if 'enabled' in submod_config:
-                if not isinstance(submod_config['enabled'], bool):
-                    print(f"⚠️  Warning: Invalid submodule_config.enabled (must be boolean), using default: true")
-                    submod_config['enabled'] = True
-
-            # Validate threshold
-            if 'threshold' in submod_config:
-                if not isinstance(submod_config['threshold'], int) or submod_config['threshold'] <= 0:
-                    print(f"⚠️  Warning: Invalid submodule_config.threshold (must be positive integer), using default: 100")
-                    submod_config['threshold'] = 100
-
-            # Validate strategy
-            if 'strategy' in submod_config:
-                valid_strategies = ['auto', 'force', 'disabled']
-                if submod_config['strategy'] not in valid_strategies:
-                    print(f"⚠️  Warning: Invalid submodule_config.strategy, using default: 'auto'")
-                    submod_config['strategy'] = 'auto'
-
-            # Validate max_depth
-            if 'max_depth' in submod_config:
-                if not isinstance(submod_config['max_depth'], int) or not (1 <= submod_config['max_depth'] <= 3):
-                    print(f"⚠️  Warning: Invalid submodule_config.max_depth (must be 1-3), using default: 3")
-                    submod_config['max_depth'] = 3
+            # Invalid sub-keys are reset to their defaults
+            for key, is_valid, default, message in _SUBMODULE_CONFIG_VALIDATORS:
+                if key in submod_config and not is_valid(submod_config[key]):
+                    print(f"⚠️  Warning: {message}")
+                    submod_config[key] = default
 
             # Validate framework_presets if present
             if 'framework_presets' in submod_config:
@@ -577,81 +626,252 @@ def load_configuration(config_path: Optional[Path] = None, project_root: Optiona
         return {}
 
 
-def generate_tree_structure(root_path: Path, max_depth: int = MAX_TREE_DEPTH) -> List[str]:
-    """Generate a compact ASCII tree representation of the directory structure."""
+def _scandir_recursive(path, skip_hidden: bool = False) -> Iterator[os.DirEntry]:
+    """Yield every entry below path using os.scandir.
+
+    Directories in IGNORE_DIRS (and dot-directories when skip_hidden is set) are
+    pruned before descending. DirEntry caches the file type reported by readdir,
+    so is_dir()/is_file() with follow_symlinks=False cost no extra stat call.
+    """
+    stack = [os.fspath(path)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name in IGNORE_DIRS or (skip_hidden and entry.name.startswith('.')):
+                    continue
+                stack.append(entry.path)
+            yield entry
+
+
+def _scandir_count(path, counts: Optional[Dict[str, int]] = None) -> int:
+    """Count the files below path, pruning IGNORE_DIRS like _scandir_recursive.
+
+    Counts entries straight off each scandir iterator instead of yielding
+    them, for callers that only need the total. Every directory's total is
+    recorded in counts, so callers sharing one dict walk overlapping
+    subtrees only once.
+    """
+    if counts is None:
+        counts = {}
+    root = os.fspath(path)
+    # Post-order walk on an explicit stack, so deep trees cannot exhaust the
+    # recursion limit: a directory is scanned on its first visit and totalled
+    # on its second, once every subdirectory below it has been counted
+    pending = {}  # directory -> (files directly inside, subdirectories)
+    stack = [root]
+    while stack:
+        key = stack[-1]
+        if key in counts:
+            stack.pop()
+            continue
+        if key in pending:
+            stack.pop()
+            count, subdirs = pending.pop(key)
+            counts[key] = count + sum(counts[subdir] for subdir in subdirs)
+            continue
+        count = 0
+        subdirs = []
+        try:
+            with os.scandir(key) as it:
+                for entry in it:
+                    if entry.is_file(follow_symlinks=False):
+                        count += 1
+                    elif entry.is_dir(follow_symlinks=False) and entry.name not in IGNORE_DIRS:
+                        subdirs.append(entry.path)
+        except OSError:
+            pass
+        pending[key] = (count, subdirs)
+        stack.extend(subdirs)
+    return counts[root]
+
+
+def _in_git_work_tree(path: Path) -> bool:
+    """Whether path is inside a git work tree, checked without spawning git.
+
+    A .git entry (the directory, or the file a worktree or submodule uses)
+    in path or any parent answers directly; only when none is found, e.g.
+    with GIT_DIR set, does `git rev-parse --git-dir` decide.
+    """
+    resolved = path.resolve()
+    for directory in (resolved, *resolved.parents):
+        if (directory / '.git').exists():
+            return True
+    try:
+        subprocess.run(
+            ['git', 'rev-parse', '--git-dir'],
+            cwd=path,
+            capture_output=True,
+            timeout=5,
+            check=True
+        )
+        return True
+    except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
+        return False
+
+
+def _path_prefix_len(root: Path) -> int:
+    """Length of the prefix str(root / rel) puts before rel ('.' adds none).
+
+    Lets callers slice relative path strings off str(file_path) instead of
+    calling Path.relative_to for every file.
+    """
+    root_str = str(root)
+    return 0 if root_str == '.' else len(os.path.join(root_str, ''))
+
+
+def _collect_directories(file_paths: Iterable[Path], prefix_len: int,
+                         directory_files: Dict[str, list]) -> None:
+    """Add every ancestor directory of file_paths to directory_files.
+
+    Directories are keyed by relative path string. git lists files in sorted
+    order, so the walk up the ancestors stops at the first directory already
+    recorded, and consecutive files in the same directory cost one lookup.
+    """
+    last_dir = None
+    for file_path in file_paths:
+        rel = str(file_path)[prefix_len:]
+        sep = rel.rfind(os.sep)
+        if sep <= 0 or rel[:sep] == last_dir:
+            continue
+        last_dir = rel[:sep]
+        while sep > 0:
+            rel_dir = rel[:sep]
+            if rel_dir in directory_files:
+                break
+            directory_files[rel_dir] = []
+            sep = rel.rfind(os.sep, 0, sep)
+
+
+def generate_tree_structure(
+    root_path: Path,
+    max_depth: int = MAX_TREE_DEPTH,
+    file_paths: Optional[Iterable[Path]] = None
+) -> List[str]:
+    """Generate a compact ASCII tree representation of the directory structure.
+
+    Per-directory code file counts come from file_paths when the caller has
+    already listed the project's files; otherwise the tree walks it once.
+    """
     tree_lines = []
 
-    def should_include_dir(path: Path) -> bool:
+    def should_include_dir(entry: os.DirEntry) -> bool:
         """Check if directory should be included in tree."""
         return (
-            path.name not in IGNORE_DIRS and
-            not path.name.startswith('.') and
-            path.is_dir()
+            entry.name not in IGNORE_DIRS and
+            not entry.name.startswith('.') and
+            entry.is_dir()
         )
 
-    def add_tree_level(path: Path, prefix: str = "", depth: int = 0):
-        """Recursively build tree structure."""
-        if depth > max_depth:
-            if any(should_include_dir(p) for p in path.iterdir() if p.is_dir()):
-                tree_lines.append(prefix + "└── ...")
-            return
+    def count_code_files_by_dir() -> Dict[str, int]:
+        """Count code files below every directory, keyed by relative path.
+
+        Direct counts are collected per parent directory, then each count is
+        propagated up to root, so no subtree is walked more than once.
+        """
+        if file_paths is None:
+            rel_paths = (
+                entry.path[root_prefix_len:] for entry in _scandir_recursive(root)
+                if entry.is_file(follow_symlinks=False)
+            )
+        else:
+            prefix_len = _path_prefix_len(Path(root_path))
+            rel_paths = (str(file_path)[prefix_len:] for file_path in file_paths)
+
+        direct_counts = {}
+        for rel_path in rel_paths:
+            if os.path.splitext(rel_path)[1] in CODE_EXTENSIONS:
+                parent = os.path.dirname(rel_path)
+                direct_counts[parent] = direct_counts.get(parent, 0) + 1
+
+        totals = {}
+        for dir_path, count in direct_counts.items():
+            # Match the walker, which never descends into ignored directories
+            if file_paths is not None and not IGNORE_DIRS.isdisjoint(dir_path.split(os.sep)):
+                continue
+            while dir_path:
+                totals[dir_path] = totals.get(dir_path, 0) + count
+                dir_path = os.path.dirname(dir_path)
+        return totals
 
+    def add_tree_level(path: str, prefix: str = "", depth: int = 0):
+        """Recursively build tree structure."""
         try:
-            items = sorted(path.iterdir(), key=lambda x: (x.is_file(), x.name.lower()))
-        except PermissionError:
+            with os.scandir(path) as it:
+                if depth > max_depth:
+                    # Only whether a subdirectory exists matters; stop at the first
+                    if any(should_include_dir(entry) for entry in it):
+                        tree_lines.append(prefix + "└── ...")
+                    return
+                entries = list(it)
+        except (PermissionError, FileNotFoundError):
             return
 
+        entries.sort(key=lambda entry: (not entry.is_dir(), entry.name.lower()))
+
         # Filter items
-        dirs = [item for item in items if should_include_dir(item)]
+        dirs = [entry for entry in entries if should_include_dir(entry)]
 
         # Important files to show in tree
         important_files = [
-            item for item in items
-            if item.is_file() and (
-                item.name in ['README.md', 'package.json', 'requirements.txt',
-                             'Cargo.toml', 'go.mod', 'pom.xml', 'build.gradle',
-                             'setup.py', 'pyproject.toml', 'Makefile']
-            )
+            entry for entry in entries
+            if entry.name in TREE_IMPORTANT_FILES and entry.is_file()
         ]
 
         all_items = dirs + important_files
 
-        for i, item in enumerate(all_items):
+        for i, entry in enumerate(all_items):
             is_last = i == len(all_items) - 1
             current_prefix = "└── " if is_last else "├── "
 
-            name = item.name
-            if item.is_dir():
+            is_dir = entry.is_dir()
+            name = entry.name
+            if is_dir:
                 name += "/"
                 # Add file count for directories
-                try:
-                    file_count = sum(1 for f in item.rglob('*') if f.is_file() and f.suffix in CODE_EXTENSIONS)
-                    if file_count > 0:
-                        name += f" ({file_count} files)"
-                except (OSError, PermissionError):
-                    pass
+                file_count = code_file_counts.get(entry.path[root_prefix_len:], 0)
+                if file_count > 0:
+                    name += f" ({file_count} files)"
 
             tree_lines.append(prefix + current_prefix + name)
 
-            if item.is_dir():
+            if is_dir:
                 next_prefix = prefix + ("    " if is_last else "│   ")
-                add_tree_level(item, next_prefix, depth + 1)
+                add_tree_level(entry.path, next_prefix, depth + 1)
+
+    root = os.path.normpath(os.fspath(root_path))
+    root_prefix_len = len(os.path.join(root, ''))
+    code_file_counts = count_code_files_by_dir()
 
     # Start with root
     tree_lines.append(".")
-    add_tree_level(root_path, "")
+    add_tree_level(root, "")
     return tree_lines
 
 
 # These functions are now imported from index_utils
 
 
-def generate_split_index(root_dir: str, config: Optional[Dict] = None) -> Tuple[Dict, int]:
+def generate_split_index(
+    root_dir: str,
+    config: Optional[Dict] = None,
+    write: bool = True,
+    git_files: Optional[List[Path]] = None
+) -> Tuple[Dict, int]:
     """Generate lightweight core index in split format (v2.2-submodules).
 
     Args:
         root_dir: Project root directory
         config: Optional configuration dict with doc_tiers and other settings
+        write: If False, build everything in memory without touching disk
+            (detail modules are only serialized to measure their size)
+        git_files: File list from get_git_files(root_dir) if the caller
+            already has one; listed again when omitted
 
     Returns:
         Tuple of (core_index_dict, skipped_file_count)
@@ -663,7 +883,7 @@ def generate_split_index(root_dir: str, config: Optional[Dict] = None) -> Tuple[
 
     # Load signature cache for performance (skip if --no-cache flag)
     use_cache = '--no-cache' not in sys.argv
-    sig_cache = load_cache(root) if use_cache else {"version": "1.0", "signatures": {}}
+    sig_cache = load_cache(root) if use_cache else _empty_cache()
     cache_hits = 0
     cache_misses = 0
 
@@ -699,71 +919,104 @@ def generate_split_index(root_dir: str, config: Optional[Dict] = None) -> Tuple[
         core_index['d_standard'] = {}
         core_index['d_archive'] = {}
 
-    # Generate directory tree (reuse existing function)
-    print("📊 Building directory tree...")
-    core_index['tree'] = generate_tree_structure(root)
-
     # Get list of files to process
     print("🔍 Indexing files...")
-    git_files = get_git_files(root)
+    if git_files is None:
+        git_files = get_git_files(root)
 
     skipped_count = 0
-    directory_files = {}
+    directory_files = {}  # Relative directory path -> file names directly inside it
+    prefix_len = _path_prefix_len(root)
 
     if git_files is not None:
         print(f"   Using git ls-files (found {len(git_files)} files)")
         files_to_process = git_files
+        # git already applied .gitignore; only the cheap suffix/size checks remain
+        gitignore_root = None
 
-        # Count directories
-        seen_dirs = set()
-        for file_path in git_files:
-            for parent in file_path.parents:
-                if parent != root and parent not in seen_dirs:
-                    seen_dirs.add(parent)
-                    if parent not in directory_files:
-                        directory_files[parent] = []
-        core_index['stats']['total_directories'] = len(seen_dirs)
+        # Count directories (keyed by relative path string; ancestors stop at root)
+        _collect_directories(git_files, prefix_len, directory_files)
+        core_index['stats']['total_directories'] = len(directory_files)
     else:
+        # Ignored directories are pruned by the walker, never entered
         print("   Using manual file discovery (git not available)")
         files_to_process = []
-        for file_path in root.rglob('*'):
-            if file_path.is_dir():
-                if not any(part in IGNORE_DIRS for part in file_path.parts):
-                    core_index['stats']['total_directories'] += 1
-                    directory_files[file_path] = []
+        gitignore_root = root
+        root_prefix_len = len(os.path.join(os.fspath(root), ''))
+        for entry in _scandir_recursive(root):
+            if entry.is_dir(follow_symlinks=False):
+                core_index['stats']['total_directories'] += 1
+                directory_files[entry.path[root_prefix_len:]] = []
                 continue
 
-            if file_path.is_file():
-                files_to_process.append(file_path)
+            if entry.is_file(follow_symlinks=False):
+                files_to_process.append(Path(entry.path))
+
+    # Directory tree counts reuse the file list instead of walking again
+    print("📊 Building directory tree...")
+    core_index['tree'] = generate_tree_structure(root, file_paths=files_to_process)
+
+    indexable_files = []
+    for file_path in files_to_process:
+        if should_index_file(file_path, gitignore_root):
+            indexable_files.append(file_path)
+        else:
+            skipped_count += 1
+
+    # Files that will be parsed: served from the signature cache where valid,
+    # the remaining misses are parsed up front in worker processes
+    cached_signatures = {}
+    content_hashes = {}  # Hashes from each lookup, reused when caching misses
+    cache_misses_to_parse = []
+    for file_path in [path for path in indexable_files if path.suffix in PARSEABLE_LANGUAGES][:MAX_FILES]:
+        cached = None
+        if use_cache:
+            cached, content_hashes[file_path] = lookup_cached_signature(file_path, sig_cache)
+        if cached:
+            cached_signatures[file_path] = cached
+        else:
+            cache_misses_to_parse.append(file_path)
+    prefetched = parse_files_parallel(cache_misses_to_parse)
+
+    # Resolve git metadata for every parseable file in one git log pass
+    # rather than several git subprocesses per file
+    git_index = None
+    if git_files is not None:
+        git_index = build_git_metadata_index(root, [
+            str(file_path)[prefix_len:] for file_path in git_files
+            if file_path.suffix in PARSEABLE_LANGUAGES
+        ])
 
     # Track all parsed files for module organization
     parsed_files = []
     file_functions_map = {}  # Map file_path -> extracted data for module refs
     markdown_files_by_tier = {'standard': [], 'archive': []}  # Track non-critical docs for detail modules
 
+    # Per-language counters, stored in stats once the loop is done
+    fully_parsed = Counter()
+    listed_only = Counter()
+    stats = core_index['stats']
+
     # Process files
     file_count = 0
-    for file_path in files_to_process:
+    for file_path in indexable_files:
         if file_count >= MAX_FILES:
             print(f"⚠️  Stopping at {MAX_FILES} files")
             break
 
-        if not should_index_file(file_path, root):
-            skipped_count += 1
-            continue
+        rel_str = str(file_path)[prefix_len:]
+        suffix = file_path.suffix
 
         # Track files in directories
-        parent_dir = file_path.parent
-        if parent_dir in directory_files:
-            directory_files[parent_dir].append(file_path.name)
-
-        rel_path = file_path.relative_to(root)
+        rel_dir = os.path.dirname(rel_str)
+        if rel_dir in directory_files:
+            directory_files[rel_dir].append(file_path.name)
 
         # Handle markdown files with tiered classification
-        if file_path.suffix in MARKDOWN_EXTENSIONS:
+        if suffix in MARKDOWN_EXTENSIONS:
             # Classify documentation tier
             tier = classify_documentation(file_path, config)
-            core_index['stats']['doc_tiers'][tier] += 1
+            stats['doc_tiers'][tier] += 1
 
             # Extract doc structure once for reuse
             doc_structure = extract_markdown_structure(file_path)
@@ -775,92 +1028,85 @@ def generate_split_index(root_dir: str, config: Optional[Dict] = None) -> Tuple[
 
                 # Store in appropriate tier section based on configuration
                 if tier == 'critical':
-                    core_index['d_critical'][str(rel_path)] = doc_entry
-                    core_index['stats']['markdown_files'] += 1
+                    core_index['d_critical'][rel_str] = doc_entry
+                    stats['markdown_files'] += 1
                 elif include_all_tiers:
                     # Small project mode: include all tiers in core index
                     if tier == 'standard':
-                        core_index['d_standard'][str(rel_path)] = doc_entry
+                        core_index['d_standard'][rel_str] = doc_entry
                     elif tier == 'archive':
-                        core_index['d_archive'][str(rel_path)] = doc_entry
-                    core_index['stats']['markdown_files'] += 1
+                        core_index['d_archive'][rel_str] = doc_entry
+                    stats['markdown_files'] += 1
                 else:
                     # Default mode: track standard/archive docs for detail modules
                     if tier in ['standard', 'archive']:
                         markdown_files_by_tier[tier].append({
-                            'path': str(rel_path),
+                            'path': rel_str,
                             'file_path': file_path,
                             'sections': doc_structure['sections'][:10],
                             'tier': tier
                         })
             continue
 
-        # Handle code files
-        language = get_language_name(file_path.suffix)
+        # Handle code files; one lookup yields the language of parseable files
+        language = PARSEABLE_LANGUAGES.get(suffix)
 
         # Only parse supported languages
-        if file_path.suffix not in PARSEABLE_LANGUAGES:
-            core_index['stats']['listed_only'][language] = \
-                core_index['stats']['listed_only'].get(language, 0) + 1
+        if language is None:
+            listed_only[get_language_name(suffix)] += 1
             continue
 
         try:
             # Check signature cache first (Story: Persistent Signature Cache)
-            cached = get_cached_signature(file_path, sig_cache) if use_cache else None
+            cached = cached_signatures.get(file_path)
 
             if cached:
                 extracted = cached
                 cache_hits += 1
             else:
-                content = file_path.read_text(encoding='utf-8', errors='ignore')
-
-                # Extract signatures based on language
-                if file_path.suffix == '.py':
-                    extracted = extract_python_signatures(content)
-                elif file_path.suffix in {'.js', '.ts', '.jsx', '.tsx'}:
-                    extracted = extract_javascript_signatures(content)
-                elif file_path.suffix in {'.sh', '.bash'}:
-                    extracted = extract_shell_signatures(content)
-                elif file_path.suffix == '.vue':
-                    extracted = extract_vue_signatures(content)
-                else:
-                    extracted = {'functions': {}, 'classes': {}}
-
-                # Cache the extracted signature
-                if use_cache and (extracted.get('functions') or extracted.get('classes')):
-                    set_cached_signature(file_path, extracted, sig_cache)
+                extracted = prefetched.get(file_path)
+                if extracted is None:
+                    extracted = extract_file_signatures(file_path)
+
+                # Cache the extracted signature; files without any are cached
+                # as empty so they are not re-parsed on the next run either
+                if use_cache:
+                    content_hash = content_hashes.get(file_path)
+                    if extracted.get('functions') or extracted.get('classes'):
+                        set_cached_signature(file_path, extracted, sig_cache, content_hash)
+                    else:
+                        set_cached_signature(file_path, {'functions': {}, 'classes': {}}, sig_cache,
+                                             content_hash)
                 cache_misses += 1
 
             # Skip if no functions/classes found
             if not extracted.get('functions') and not extracted.get('classes'):
                 continue
+            intern_signature_names(extracted)
 
             # Extract git metadata for detail modules
-            git_meta = extract_git_metadata(file_path, root, git_cache)
+            git_meta = extract_git_metadata(file_path, root, git_cache, git_index)
             if git_meta.get('commit'):
-                core_index['stats']['git_files_tracked'] += 1
+                stats['git_files_tracked'] += 1
             else:
                 # No commit means fallback to mtime was used
                 if git_meta.get('date'):  # Has mtime fallback data
-                    core_index['stats']['git_files_fallback'] += 1
+                    stats['git_files_fallback'] += 1
 
             # Track for module organization
             parsed_files.append(file_path)
             # Store extracted data along with git metadata for detail modules
-            file_functions_map[str(rel_path)] = {
+            file_functions_map[rel_str] = {
                 **extracted,
                 'git': git_meta if git_meta.get('commit') or git_meta.get('date') else None
             }
 
             # Update stats
-            lang_key = PARSEABLE_LANGUAGES[file_path.suffix]
-            core_index['stats']['fully_parsed'][lang_key] = \
-                core_index['stats']['fully_parsed'].get(lang_key, 0) + 1
+            fully_parsed[language] += 1
 
         except Exception as e:
             # Parse error - skip this file
-            core_index['stats']['listed_only'][language] = \
-                core_index['stats']['listed_only'].get(language, 0) + 1
+            listed_only[language] += 1
 
         file_count += 1
 
@@ -869,6 +1115,8 @@ def generate_split_index(root_dir: str, config: Optional[Dict] = None) -> Tuple[
             print(f"  Indexed {file_count} files...")
 
     core_index['stats']['total_files'] = file_count
+    core_index['stats']['fully_parsed'] = dict(fully_parsed)
+    core_index['stats']['listed_only'] = dict(listed_only)
 
     # Organize files into modules
     print("📦 Organizing modules...")
@@ -880,23 +1128,20 @@ def generate_split_index(root_dir: str, config: Optional[Dict] = None) -> Tuple[
 
     # Story 4.4: Apply strategy behavior
     if submod_config['enabled'] and strategy != 'disabled':
-        import logging
-        logger = logging.getLogger(__name__)
-
         # Detect framework and apply preset (Story 4.4, AC #2, #3)
         framework_type = detect_framework_patterns(root)
         preset = apply_framework_preset(framework_type, (config or {}).get('submodule_config'))
         # User config overrides preset (prioritize user's max_depth setting)
         max_depth = submod_config.get('max_depth', preset.get('max_depth', 3))
 
-        logger.info(f"Framework detected: {framework_type}, Strategy: {strategy}, Max depth: {max_depth}")
+        logger.info("Framework detected: %s, Strategy: %s, Max depth: %s", framework_type, strategy, max_depth)
 
         # Determine which modules to split based on strategy
         modules_to_split = []
 
         if strategy == 'force':
             # Force: Split ALL modules regardless of size (AC #4)
-            logger.info(f"Force strategy: splitting all {len(modules)} modules")
+            logger.info("Force strategy: splitting all %d modules", len(modules))
             modules_to_split = [{'module_id': mid, 'file_count': len(files)} for mid, files in modules.items()]
             print(f"   Force strategy: splitting all {len(modules_to_split)} module(s)")
 
@@ -921,12 +1166,11 @@ def generate_split_index(root_dir: str, config: Optional[Dict] = None) -> Tuple[
                 module_id = mod_info['module_id']
                 file_list = modules[module_id]
 
-                logger.info(f"Splitting {module_id} ({len(file_list)} files) with max_depth={max_depth}")
+                logger.info("Splitting %s (%d files) with max_depth=%s", module_id, len(file_list), max_depth)
 
                 sub_modules = split_module_recursive(
                     module_id,
                     file_list,
-                    root,
                     max_depth,
                     current_depth=0,
                     config=config
@@ -952,8 +1196,6 @@ def generate_split_index(root_dir: str, config: Optional[Dict] = None) -> Tuple[
 
     elif strategy == 'disabled':
         # Disabled: Use monolithic modules (legacy behavior, AC #5)
-        import logging
-        logger = logging.getLogger(__name__)
         logger.info("Sub-module splitting disabled - using monolithic module organization")
         print("   Sub-module splitting disabled (using monolithic modules)")
 
@@ -1003,13 +1245,11 @@ def generate_split_index(root_dir: str, config: Optional[Dict] = None) -> Tuple[
 
     # Infer directory purposes
     print("🏗️  Analyzing directory purposes...")
-    for dir_path, files in directory_files.items():
+    for rel_dir, files in directory_files.items():
         if files:
-            purpose = infer_directory_purpose(dir_path, files)
+            purpose = infer_directory_purpose(PurePath(rel_dir), files)
             if purpose:
-                rel_dir = str(dir_path.relative_to(root))
-                if rel_dir != '.':
-                    core_index['dir_purposes'][rel_dir] = purpose
+                core_index['dir_purposes'][rel_dir] = purpose
 
     # Log tier classification summary
     tier_counts = core_index['stats']['doc_tiers']
@@ -1026,20 +1266,30 @@ def generate_split_index(root_dir: str, config: Optional[Dict] = None) -> Tuple[
     # Generate detail modules (Story 1.3)
     # Check for --skip-details flag via environment variable
     skip_details = os.getenv('INDEX_SKIP_DETAILS', '').lower() == 'true'
-    detail_files = generate_detail_modules(
+    detail_files, detail_bytes = generate_detail_modules(
         file_functions_map,
         modules,
         root,
         skip_details,
-        markdown_files_by_tier=markdown_files_by_tier
+        markdown_files_by_tier=markdown_files_by_tier,
+        write=write
     )
 
+    # Record the commit this index reflects so incremental updates can diff
+    # against it instead of scanning history by timestamp
+    head = get_git_head(root) if git_files is not None else None
+    if head:
+        core_index['last_commit'] = head
+
     # Add detail file list to core index stats for reference
     if detail_files:
         core_index['stats']['detail_modules'] = len(detail_files)
+        core_index['stats']['detail_bytes'] = detail_bytes
 
     # Save signature cache
-    if use_cache:
+    if use_cache and write:
+        # content_hashes holds every file looked up in this run
+        prune_cache(sig_cache, content_hashes)
         save_cache(root, sig_cache)
         if cache_hits + cache_misses > 0:
             hit_rate = cache_hits / (cache_hits + cache_misses) * 100
@@ -1048,210 +1298,514 @@ def generate_split_index(root_dir: str, config: Optional[Dict] = None) -> Tuple[
     return core_index, skipped_count
 
 
+def _group_docs_by_module(
+    markdown_files_by_tier: Optional[Dict[str, List[Dict]]]
+) -> Dict[str, Dict[str, Dict]]:
+    """Group standard and archive tier docs by the module they belong to.
+
+    Docs are organized by their top-level directory, like code files, with
+    docs directly in the project root belonging to the 'root' module.
+
+    Returns:
+        Dict mapping module_id -> {'doc_standard': {...}, 'doc_archive': {...}}
+    """
+    docs_by_module = {}
+    if not markdown_files_by_tier:
+        return docs_by_module
+
+    for tier in ['standard', 'archive']:
+        tier_key = f'doc_{tier}'
+        for doc_info in markdown_files_by_tier.get(tier, []):
+            # Match doc to module by the top-level directory of its relative path
+            rel_path = doc_info['path']
+            sep = rel_path.find(os.sep)
+            doc_module = rel_path[:sep] if sep > 0 else 'root'
+
+            module_docs = docs_by_module.setdefault(
+                doc_module, {'doc_standard': {}, 'doc_archive': {}}
+            )
+            module_docs[tier_key][doc_info['path']] = {
+                'sections': doc_info['sections'],
+                'tier': tier
+            }
+
+    return docs_by_module
+
+
+def _iter_mtimes(root_path: Path, file_list: List[str]) -> Iterator[float]:
+    """Yield the modification time of each file that can be stat'ed.
+
+    Where supported, files are stat'ed relative to an open descriptor of
+    their directory (fstatat), so the kernel resolves each directory path
+    once rather than once per file.
+    """
+    root_str = os.fspath(root_path)
+    if os.stat not in os.supports_dir_fd:
+        for file_path in file_list:
+            try:
+                yield os.stat(os.path.join(root_str, file_path)).st_mtime
+            except OSError:
+                continue
+        return
+
+    names_by_dir = defaultdict(list)
+    for file_path in file_list:
+        dir_path, name = os.path.split(file_path)
+        names_by_dir[dir_path].append(name)
+
+    for dir_path, names in names_by_dir.items():
+        try:
+            dir_fd = os.open(os.path.join(root_str, dir_path) or '.', os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            for name in names:
+                try:
+                    yield os.stat(name, dir_fd=dir_fd).st_mtime
+                except OSError:
+                    continue
+        finally:
+            os.close(dir_fd)
+
+
+def _build_detail_module(
+    module_id: str,
+    file_list: List[str],
+    files_data: Dict[str, Dict],
+    module_docs: Optional[Dict[str, Dict]],
+    root_path: Path,
+    modified_at: str
+) -> Tuple[bytes, int]:
+    """Build and serialize one detail module.
+
+    Takes only this module's inputs so it can run in a worker process.
+
+    Args:
+        module_id: Module identifier
+        file_list: File paths in the module
+        files_data: Extracted data for (at least) the module's parsed files
+        module_docs: This module's {'doc_standard': ..., 'doc_archive': ...}, if any
+        root_path: Project root directory
+        modified_at: Timestamp used when no file modification time is found
+
+    Returns:
+        Tuple of (compact JSON bytes, number of files with details)
+    """
+    from index_utils import build_calls_map
+
+    # Build detail module structure
+    detail_module = {
+        'module_id': module_id,
+        'version': '2.2-submodules',
+        'modified': modified_at,
+        'files': {},
+        'call_graph_local': [],
+        'doc_standard': {},
+        'doc_archive': {}
+    }
+
+    # Missing list fields default to () rather than [] so no empty list is
+    # allocated per lookup; both serialize to the same JSON array.
+
+    # Track all functions in this module for call graph
+    module_functions = {}  # For build_calls_map
+    module_classes = {}    # For build_calls_map
+
+    # Process each file in the module
+    for file_path in file_list:
+        if file_path not in files_data:
+            continue
+
+        extracted = files_data[file_path]
+
+        # Determine language (indexed files always carry a suffix)
+        language = get_language_name(os.path.splitext(file_path)[1])
+
+        # Build file detail entry
+        file_detail = {
+            'language': language,
+            'functions': [],
+            'classes': [],
+            'imports': extracted.get('imports', ())
+        }
+
+        # Add git metadata if available
+        if extracted.get('git'):
+            file_detail['git'] = extracted['git']
+
+        # Add functions with full signatures
+        if extracted.get('functions'):
+            for func_name, func_data in extracted['functions'].items():
+                if isinstance(func_data, dict):
+                    func_detail = {
+                        'name': func_name,
+                        'line': func_data.get('line', 0),
+                        'signature': func_data.get('signature', ''),
+                        'calls': func_data.get('calls', ()),
+                        'doc': func_data.get('doc', '')
+                    }
+                    file_detail['functions'].append(func_detail)
+
+                    # Track for call graph
+                    module_functions[func_name] = func_data
+
+        # Add classes with full method details
+        if extracted.get('classes'):
+            for class_name, class_data in extracted['classes'].items():
+                if isinstance(class_data, dict):
+                    class_detail = {
+                        'name': class_name,
+                        'line': class_data.get('line', 0),
+                        'bases': class_data.get('bases', ()),
+                        'methods': [],
+                        'doc': class_data.get('doc', '')
+                    }
+
+                    # Add methods
+                    if class_data.get('methods'):
+                        for method_name, method_data in class_data['methods'].items():
+                            if isinstance(method_data, dict):
+                                method_detail = {
+                                    'name': method_name,
+                                    'line': method_data.get('line', 0),
+                                    'signature': method_data.get('signature', ''),
+                                    'calls': method_data.get('calls', ()),
+                                    'doc': method_data.get('doc', '')
+                                }
+                                class_detail['methods'].append(method_detail)
+
+                    file_detail['classes'].append(class_detail)
+
+                    # Track for call graph
+                    module_classes[class_name] = class_data
+
+        # Add file to detail module
+        detail_module['files'][file_path] = file_detail
+
+    # Add standard and archive tier documentation to this module
+    if module_docs:
+        detail_module['doc_standard'] = module_docs['doc_standard']
+        detail_module['doc_archive'] = module_docs['doc_archive']
+
+    # Build local call graph (within-module edges only)
+    if module_functions or module_classes:
+        # Only outgoing calls are needed; the reverse (called_by) map is skipped
+        call_graph = build_calls_map(module_functions, module_classes)
+
+        # Convert to edge list format and filter for local calls only
+        all_module_funcs = set(module_functions.keys())
+        for class_data in module_classes.values():
+            if isinstance(class_data, dict) and class_data.get('methods'):
+                all_module_funcs.update(class_data['methods'].keys())
+
+        # Extract edges where both caller and callee are in this module
+        for caller, callees in call_graph.items():
+            if caller in all_module_funcs:
+                for callee in callees:
+                    if callee in all_module_funcs:
+                        detail_module['call_graph_local'].append([caller, callee])
+
+    # Find most recent modification time in module (one stat per file;
+    # missing files are skipped)
+    most_recent = max(_iter_mtimes(root_path, file_list), default=None)
+    if most_recent:
+        detail_module['modified'] = datetime.fromtimestamp(most_recent).isoformat()
+
+    # Compact JSON, no whitespace
+    return dumps_compact(detail_module), len(detail_module['files'])
+
+
+def _detail_module_worker(args: Tuple) -> Tuple[bytes, int]:
+    """Worker entry point: unpack one module's arguments for _build_detail_module."""
+    return _build_detail_module(*args)
+
+
+def build_detail_modules_parallel(tasks: List[Tuple]) -> Optional[List[Tuple[bytes, int]]]:
+    """Build detail modules across worker processes.
+
+    Each task holds one module's _build_detail_module arguments, so workers
+    only receive that module's share of the extracted data. Returns None
+    when there are too few modules or files to benefit, or a process pool
+    cannot be started, in which case callers build sequentially.
+    """
+    if len(tasks) < PARALLEL_DETAIL_MIN_MODULES:
+        return None
+    if sum(len(task[1]) for task in tasks) < PARALLEL_PARSE_MIN_FILES:
+        return None
+
+    workers = os.cpu_count() or 1
+    if workers < 2:
+        return None
+
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+            return list(executor.map(_detail_module_worker, tasks))
+    except (OSError, RuntimeError) as e:
+        print(f"   ⚠️  Parallel detail generation unavailable ({e}), building sequentially")
+        return None
+
+
 def generate_detail_modules(
     files_data: Dict[str, Dict],
     modules: Dict[str, List[str]],
     root_path: Path,
     skip_details: bool = False,
-    markdown_files_by_tier: Optional[Dict[str, List[Dict]]] = None
-) -> List[str]:
+    markdown_files_by_tier: Optional[Dict[str, List[Dict]]] = None,
+    write: bool = True
+) -> Tuple[List[str], int]:
     """Generate detailed module files in PROJECT_INDEX.d/ directory.
 
+    Modules are built in worker processes when there are enough of them
+    (see build_detail_modules_parallel); files are always written here.
+
     Args:
         files_data: Dict mapping file paths -> full extracted function/class data
         modules: Dict mapping module_id -> list of file paths (from organize_into_modules)
         root_path: Project root directory
         skip_details: If True, skip detail generation (core-only mode)
         markdown_files_by_tier: Dict with 'standard' and 'archive' keys containing doc file info
+        write: If False, serialize modules only to measure their size (dry-run mode);
+            PROJECT_INDEX.d/ is never created
 
     Returns:
-        List of created detail module file paths
+        Tuple of (detail module file paths, total serialized size in bytes)
     """
     if skip_details:
         print("⏩ Skipping detail module generation (--skip-details mode)")
-        return []
-
-    from index_utils import build_call_graph, get_language_name
+        return [], 0
 
     print("📦 Generating detail modules...")
 
     # Create PROJECT_INDEX.d/ directory
     detail_dir = root_path / "PROJECT_INDEX.d"
-    detail_dir.mkdir(exist_ok=True)
+    if write:
+        detail_dir.mkdir(exist_ok=True)
 
     created_files = []
+    total_bytes = 0
+    modified_at = datetime.now().isoformat()  # One timestamp for the whole run
+
+    # Modules whose bytes match the previous run are not rewritten. The file's
+    # size and mtime are recorded too, so a module rewritten since (e.g. by an
+    # incremental update) no longer matches its manifest entry.
+    manifest_path = root_path / CACHE_DIR / DETAIL_MANIFEST_FILE
+    previous_manifest = {}
+    if write:
+        try:
+            previous_manifest = load_json(manifest_path)
+        except (OSError, ValueError):
+            pass
+        if not isinstance(previous_manifest, dict):
+            previous_manifest = {}
+    manifest = {}
+    unchanged_count = 0
+
+    # Each module gets only its own files' data and docs
+    docs_by_module = _group_docs_by_module(markdown_files_by_tier)
+    tasks = [
+        (
+            module_id,
+            file_list,
+            {file_path: files_data[file_path] for file_path in file_list if file_path in files_data},
+            docs_by_module.get(module_id),
+            root_path,
+            modified_at
+        )
+        for module_id, file_list in modules.items()
+    ]
+    results = build_detail_modules_parallel(tasks)
+    if results is None:
+        results = map(_detail_module_worker, tasks)
+
+    for (module_id, file_list, *_), (detail_json, detailed_count) in zip(tasks, results):
+        # Write detail module file
+        detail_file_path = detail_dir / f"{module_id}.json"
+        total_bytes += len(detail_json)
+        if write:
+            digest = hashlib.sha256(detail_json).hexdigest()
+            try:
+                st = detail_file_path.stat()
+                on_disk = [digest, st.st_size, st.st_mtime_ns]
+            except OSError:
+                on_disk = None
+            if on_disk is not None and previous_manifest.get(module_id) == on_disk:
+                manifest[module_id] = on_disk
+                unchanged_count += 1
+            else:
+                # Single binary write to a temp file, then atomic rename so
+                # an interrupted run never leaves a truncated module behind
+                temp_path = detail_dir / f"{module_id}.json.tmp"
+                with open(temp_path, 'wb') as f:
+                    f.write(detail_json)
+                os.replace(temp_path, detail_file_path)
+                st = detail_file_path.stat()
+                manifest[module_id] = [digest, st.st_size, st.st_mtime_ns]
 
-    # Generate detail module for each module
-    for module_id, file_list in modules.items():
-        # Build detail module structure
-        detail_module = {
-            'module_id': module_id,
-            'version': '2.2-submodules',
-            'modified': datetime.now().isoformat(),
-            'files': {},
-            'call_graph_local': [],
-            'doc_standard': {},
-            'doc_archive': {}
-        }
+        created_files.append(str(detail_file_path.relative_to(root_path)))
+        print(f"   ✓ {module_id}.json ({len(file_list)} files, {detailed_count} with details)")
 
-        # Track all functions in this module for call graph
-        module_functions = {}  # For build_call_graph
-        module_classes = {}    # For build_call_graph
+    if write:
+        try:
+            manifest_path.parent.mkdir(exist_ok=True)
+            write_json_compact(manifest_path, manifest)
+        except OSError as e:
+            print(f"   ⚠️  Could not save detail manifest: {e}")
 
-        # Process each file in the module
-        for file_path in file_list:
-            if file_path not in files_data:
-                continue
+    if unchanged_count:
+        print(f"📦 Generated {len(created_files)} detail modules ({unchanged_count} unchanged, not rewritten)")
+    else:
+        print(f"📦 Generated {len(created_files)} detail modules")
+    return created_files, total_bytes
 
-            extracted = files_data[file_path]
 
-            # Determine language
-            path_obj = root_path / file_path
-            language = get_language_name(path_obj.suffix)
+def extract_file_signatures(file_path: Path) -> Dict:
+    """Read a source file and run the signature extractor for its language."""
+    suffix = file_path.suffix
+    extractor = SIGNATURE_EXTRACTORS.get(suffix)
+    if extractor is None:
+        return {'functions': {}, 'classes': {}}
 
-            # Build file detail entry
-            file_detail = {
-                'language': language,
-                'functions': [],
-                'classes': [],
-                'imports': extracted.get('imports', [])
-            }
+    raw = read_source_bytes(file_path)
 
-            # Add git metadata if available
-            if extracted.get('git'):
-                file_detail['git'] = extracted['git']
-
-            # Add functions with full signatures
-            if extracted.get('functions'):
-                for func_name, func_data in extracted['functions'].items():
-                    if isinstance(func_data, dict):
-                        func_detail = {
-                            'name': func_name,
-                            'line': func_data.get('line', 0),
-                            'signature': func_data.get('signature', ''),
-                            'calls': func_data.get('calls', []),
-                            'doc': func_data.get('doc', '')
-                        }
-                        file_detail['functions'].append(func_detail)
-
-                        # Track for call graph
-                        module_functions[func_name] = func_data
-
-            # Add classes with full method details
-            if extracted.get('classes'):
-                for class_name, class_data in extracted['classes'].items():
-                    if isinstance(class_data, dict):
-                        class_detail = {
-                            'name': class_name,
-                            'line': class_data.get('line', 0),
-                            'bases': class_data.get('bases', []),
-                            'methods': [],
-                            'doc': class_data.get('doc', '')
-                        }
-
-                        # Add methods
-                        if class_data.get('methods'):
-                            for method_name, method_data in class_data['methods'].items():
-                                if isinstance(method_data, dict):
-                                    method_detail = {
-                                        'name': method_name,
-                                        'line': method_data.get('line', 0),
-                                        'signature': method_data.get('signature', ''),
-                                        'calls': method_data.get('calls', []),
-                                        'doc': method_data.get('doc', '')
-                                    }
-                                    class_detail['methods'].append(method_detail)
-
-                        file_detail['classes'].append(class_detail)
-
-                        # Track for call graph
-                        module_classes[class_name] = class_data
-
-            # Add file to detail module
-            detail_module['files'][file_path] = file_detail
-
-        # Add standard and archive tier documentation to this module
-        if markdown_files_by_tier:
-            for tier in ['standard', 'archive']:
-                tier_key = f'doc_{tier}'
-                for doc_info in markdown_files_by_tier.get(tier, []):
-                    doc_path = doc_info['path']
-                    doc_file_path = doc_info['file_path']
-
-                    # Determine which module this doc belongs to
-                    # Docs should be organized by their directory (similar to code files)
-                    doc_parent = doc_file_path.parent
-                    doc_module = None
-
-                    # Match doc to module based on directory structure
-                    if doc_parent == root_path:
-                        doc_module = 'root'
-                    else:
-                        # Find the top-level directory
-                        try:
-                            rel_parent = doc_parent.relative_to(root_path)
-                            parts = rel_parent.parts
-                            if parts:
-                                doc_module = parts[0]
-                        except ValueError:
-                            continue
-
-                    # Add doc to appropriate module
-                    if doc_module == module_id:
-                        detail_module[tier_key][doc_path] = {
-                            'sections': doc_info['sections'],
-                            'tier': tier
-                        }
-
-        # Build local call graph (within-module edges only)
-        if module_functions or module_classes:
-            call_graph, _ = build_call_graph(module_functions, module_classes)
-
-            # Convert to edge list format and filter for local calls only
-            all_module_funcs = set(module_functions.keys())
-            for class_data in module_classes.values():
-                if isinstance(class_data, dict) and class_data.get('methods'):
-                    all_module_funcs.update(class_data['methods'].keys())
-
-            # Extract edges where both caller and callee are in this module
-            for caller, callees in call_graph.items():
-                if caller in all_module_funcs:
-                    for callee in callees:
-                        if callee in all_module_funcs:
-                            detail_module['call_graph_local'].append([caller, callee])
-
-        # Find most recent modification time in module
-        most_recent = None
-        for file_path in file_list:
-            try:
-                path_obj = root_path / file_path
-                if path_obj.exists():
-                    mtime = path_obj.stat().st_mtime
-                    if most_recent is None or mtime > most_recent:
-                        most_recent = mtime
-            except Exception:
-                continue
+    # Content without any definition keyword cannot yield functions or classes
+    markers = SIGNATURE_MARKERS.get(suffix)
+    if markers and not any(marker in raw for marker in markers):
+        return {'functions': {}, 'classes': {}}
 
-        if most_recent:
-            detail_module['modified'] = datetime.fromtimestamp(most_recent).isoformat()
+    return extractor(decode_source(raw))
 
-        # Write detail module file (compact JSON, no whitespace)
-        detail_file_path = detail_dir / f"{module_id}.json"
-        with open(detail_file_path, 'w', encoding='utf-8') as f:
-            json.dump(detail_module, f, separators=(',', ':'))
 
-        created_files.append(str(detail_file_path.relative_to(root_path)))
-        print(f"   ✓ {module_id}.json ({len(file_list)} files, {len(detail_module['files'])} with details)")
+def intern_signature_names(extracted: Dict) -> Dict:
+    """Intern function, class, method and called names in extracted, in place.
+
+    The same identifiers recur across files, call lists and the call graph;
+    interning keeps one copy of each. Strings parsed by a worker, loaded from
+    the signature cache, or matched by a regex are otherwise separate objects.
+    """
+    intern = sys.intern
+
+    def intern_members(members: Dict) -> Dict:
+        for data in members.values():
+            if isinstance(data, dict) and data.get('calls'):
+                data['calls'] = [intern(name) for name in data['calls']]
+        return {intern(name): data for name, data in members.items()}
+
+    if extracted.get('functions'):
+        extracted['functions'] = intern_members(extracted['functions'])
+    if extracted.get('classes'):
+        for class_data in extracted['classes'].values():
+            if isinstance(class_data, dict) and class_data.get('methods'):
+                class_data['methods'] = intern_members(class_data['methods'])
+        extracted['classes'] = {intern(name): data for name, data in extracted['classes'].items()}
+    return extracted
+
+
+# Tiny inputs that walk every extractor's main regex paths once
+_EXTRACTOR_WARMUP = (
+    (extract_python_signatures,
+     'import os\nX = 1\n@dec\nclass A(B):\n'
+     '    def f(self, x: int) -> int:\n        return g(x)\n'),
+    (extract_javascript_signatures,
+     "import a from 'b';\nclass A extends B { m(x) { return f(x); } }\n"
+     "function f(x) { return x; }\n"),
+    (extract_shell_signatures, 'export A=1\nf() {\n  echo "$1"\n}\n'),
+    (extract_vue_signatures,
+     '<script>\nexport default { methods: { f() { return 1; } } }\n</script>\n'),
+)
+
+
+def _parse_worker_init() -> None:
+    """Process pool initializer: compile each extractor's regexes once per worker."""
+    for extractor, sample in _EXTRACTOR_WARMUP:
+        try:
+            extractor(sample)
+        except Exception:
+            pass
+
+
+def _parse_file_worker(path: str) -> Optional[Dict]:
+    """Worker entry point: parse one file, returning None if it fails."""
+    try:
+        return extract_file_signatures(Path(path))
+    except Exception:
+        return None
+
+
+def parse_files_parallel(file_paths: List[Path]) -> Dict[Path, Optional[Dict]]:
+    """Extract signatures for many files across worker processes.
+
+    Files are read inside the workers so the main process only receives
+    the extracted results. Each worker warms up the extractors once on
+    start, so regex compilation is not paid by the first tasks. Returns
+    an empty dict when the file list is too small to benefit or a process
+    pool cannot be started, in which case callers parse sequentially.
+    """
+    if len(file_paths) < PARALLEL_PARSE_MIN_FILES:
+        return {}
+
+    workers = os.cpu_count() or 1
+    if workers < 2:
+        return {}
+
+    chunksize = max(1, len(file_paths) // (workers * 8))
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_parse_worker_init) as executor:
+            results = executor.map(
+                _parse_file_worker,
+                [str(path) for path in file_paths],
+                chunksize=chunksize
+            )
+            return dict(zip(file_paths, results))
+    except (OSError, RuntimeError) as e:
+        print(f"   ⚠️  Parallel parsing unavailable ({e}), parsing sequentially")
+        return {}
+
+
+def _posix_parts(path: str) -> List[str]:
+    """Split a relative posix path into its components, dropping '' and '.'."""
+    return [part for part in path.split('/') if part and part != '.']
+
+
+def _resolve_relative_import(file_dir_parts: List[str], imp: str) -> str:
+    """Resolve a relative import against the importing file's directory.
+
+    Plain string equivalent of joining PurePosixPath objects, without
+    building a Path per import. Returns '.' for the project root.
+    """
+    if imp.startswith('./'):
+        # Same directory
+        base, rel = file_dir_parts, imp[2:]
+    elif imp.startswith('../'):
+        # Parent directory
+        segments = imp.split('/')
+        up_levels = segments.count('..')
+        base = file_dir_parts[:max(len(file_dir_parts) - up_levels, 0)]
+        rel = '/'.join(segment for segment in segments if segment != '..')
+    else:
+        # Module import like from . import X
+        base, rel = file_dir_parts, ''
 
-    print(f"📦 Generated {len(created_files)} detail modules")
-    return created_files
+    if rel.startswith('/'):
+        return str(PurePosixPath(rel))  # An absolute remainder replaces the base
+    return '/'.join(base + _posix_parts(rel)) or '.'
 
 
-def build_index(root_dir: str, config: Optional[Dict] = None) -> Tuple[Dict, int]:
-    """Build the enhanced index with architectural awareness (legacy single-file format)."""
+def build_index(
+    root_dir: str,
+    config: Optional[Dict] = None,
+    git_files: Optional[List[Path]] = None
+) -> Tuple[Dict, int, Dict]:
+    """Build the enhanced index with architectural awareness (legacy single-file format).
+
+    git_files may carry the caller's get_git_files(root_dir) result so the
+    repository is not listed twice. Besides the index and skipped file
+    count, returns keyword arguments for convert_to_enhanced_dense_format
+    (call_edges, parsed_keys) so it need not rebuild them.
+    """
     root = Path(root_dir)
+    started_at = datetime.now()
     index = {
-        'indexed_at': datetime.now().isoformat(),
+        'indexed_at': started_at.isoformat(),
         'root': str(root),
         'project_structure': {
             'type': 'tree',
@@ -1274,83 +1828,103 @@ def build_index(root_dir: str, config: Optional[Dict] = None) -> Tuple[Dict, int
         'dependency_graph': {}
     }
 
-    # Generate directory tree
-    print("📊 Building directory tree...")
-    index['project_structure']['tree'] = generate_tree_structure(root)
-
     file_count = 0
     dir_count = 0
     skipped_count = 0
-    directory_files = {}  # Track files per directory
+    directory_files = {}  # Relative directory path -> file names directly inside it
+    prefix_len = _path_prefix_len(root)
 
     # Try to use git ls-files for better performance and accuracy
     print("🔍 Indexing files...")
-    git_files = get_git_files(root)
+    if git_files is None:
+        git_files = get_git_files(root)
 
     if git_files is not None:
         # Use git-based file discovery
         print(f"   Using git ls-files (found {len(git_files)} files)")
         files_to_process = git_files
+        # git already applied .gitignore; only the cheap suffix/size checks remain
+        gitignore_root = None
 
-        # Count directories from git files
-        seen_dirs = set()
-        for file_path in git_files:
-            for parent in file_path.parents:
-                if parent != root and parent not in seen_dirs:
-                    seen_dirs.add(parent)
-                    if parent not in directory_files:
-                        directory_files[parent] = []
-        dir_count = len(seen_dirs)
+        # Count directories from git files (keyed by relative path string)
+        _collect_directories(git_files, prefix_len, directory_files)
+        dir_count = len(directory_files)
     else:
-        # Fallback to manual file discovery
+        # Fallback to manual file discovery (ignored directories are never entered)
         print("   Using manual file discovery (git not available)")
         files_to_process = []
-        for file_path in root.rglob('*'):
-            if file_path.is_dir():
+        gitignore_root = root
+        root_prefix = os.path.join(os.fspath(root), '')
+        for entry in _scandir_recursive(root):
+            if entry.is_dir(follow_symlinks=False):
                 # Track directories
-                if not any(part in IGNORE_DIRS for part in file_path.parts):
-                    dir_count += 1
-                    directory_files[file_path] = []
+                dir_count += 1
+                directory_files[entry.path[len(root_prefix):]] = []
                 continue
 
-            if file_path.is_file():
-                files_to_process.append(file_path)
+            if entry.is_file(follow_symlinks=False):
+                files_to_process.append(Path(entry.path))
 
-    # Process files
+    # Directory tree counts reuse the file list instead of walking again
+    print("📊 Building directory tree...")
+    index['project_structure']['tree'] = generate_tree_structure(root, file_paths=files_to_process)
+
+    indexable_files = []
     for file_path in files_to_process:
+        if should_index_file(file_path, gitignore_root):
+            indexable_files.append(file_path)
+        else:
+            skipped_count += 1
+
+    parsed_keys = []  # Files with signatures, in index order, for the dense converter
+    fully_parsed = Counter()  # Per-language counters, stored in stats after the loop
+    listed_only = Counter()
+
+    # Parse source files up front in worker processes (large projects only)
+    prefetched = parse_files_parallel(
+        [path for path in indexable_files if path.suffix in PARSEABLE_LANGUAGES][:MAX_FILES]
+    )
+
+    stats = index['stats']
+    files_out = index['files']
+
+    # Process files
+    for file_path in indexable_files:
         if file_count >= MAX_FILES:
             print(f"⚠️  Stopping at {MAX_FILES} files (project too large)")
             print(f"   Consider adding more patterns to .gitignore to reduce scope")
             print(f"   Or ask Claude to modify MAX_FILES in scripts/project_index.py")
             break
 
-        if not should_index_file(file_path, root):
-            skipped_count += 1
-            continue
+        # Get relative path and language
+        rel_str = str(file_path)[prefix_len:]
+        suffix = file_path.suffix
 
         # Track files in their directories
-        parent_dir = file_path.parent
-        if parent_dir in directory_files:
-            directory_files[parent_dir].append(file_path.name)
+        rel_dir = os.path.dirname(rel_str)
+        if rel_dir in directory_files:
+            directory_files[rel_dir].append(file_path.name)
 
-        # Get relative path and language
-        rel_path = file_path.relative_to(root)
+        # Index keys always use forward slashes, so lookups never re-normalize
+        if os.sep != '/':
+            rel_str = rel_str.replace(os.sep, '/')
 
         # Handle markdown files with tiered classification
-        if file_path.suffix in MARKDOWN_EXTENSIONS:
+        if suffix in MARKDOWN_EXTENSIONS:
             # Classify documentation tier
             tier = classify_documentation(file_path, config)
-            index['stats']['doc_tiers'][tier] += 1
+            stats['doc_tiers'][tier] += 1
 
             doc_structure = extract_markdown_structure(file_path)
             if doc_structure['sections'] or doc_structure['architecture_hints']:
                 doc_structure['tier'] = tier  # Add tier to structure
-                index['documentation_map'][str(rel_path)] = doc_structure
-                index['stats']['markdown_files'] += 1
+                index['documentation_map'][rel_str] = doc_structure
+                stats['markdown_files'] += 1
             continue
 
-        # Handle code files
-        language = get_language_name(file_path.suffix)
+        # Handle code files; one lookup yields the language of parseable files
+        parse_language = PARSEABLE_LANGUAGES.get(suffix)
+        language = parse_language or get_language_name(suffix)
 
         # Base info for all files
         file_info = {
@@ -1364,43 +1938,31 @@ def build_index(root_dir: str, config: Optional[Dict] = None) -> Tuple[Dict, int
             file_info['purpose'] = file_purpose
 
         # Try to parse if we support this language
-        if file_path.suffix in PARSEABLE_LANGUAGES:
+        if parse_language is not None:
             try:
-                content = file_path.read_text(encoding='utf-8', errors='ignore')
-
-                # Extract based on language
-                if file_path.suffix == '.py':
-                    extracted = extract_python_signatures(content)
-                elif file_path.suffix in {'.js', '.ts', '.jsx', '.tsx'}:
-                    extracted = extract_javascript_signatures(content)
-                elif file_path.suffix in {'.sh', '.bash'}:
-                    extracted = extract_shell_signatures(content)
-                elif file_path.suffix == '.vue':
-                    extracted = extract_vue_signatures(content)
-                else:
-                    extracted = {'functions': {}, 'classes': {}}
+                # Workers return None on failure; re-parse here so the error surfaces
+                extracted = prefetched.get(file_path)
+                if extracted is None:
+                    extracted = extract_file_signatures(file_path)
 
                 # Only add if we found something
-                if extracted['functions'] or extracted['classes']:
-                    file_info.update(extracted)
+                if extracted.get('functions') or extracted.get('classes'):
+                    file_info.update(intern_signature_names(extracted))
                     file_info['parsed'] = True
+                    parsed_keys.append(rel_str)
 
                 # Update stats
-                lang_key = PARSEABLE_LANGUAGES[file_path.suffix]
-                index['stats']['fully_parsed'][lang_key] = \
-                    index['stats']['fully_parsed'].get(lang_key, 0) + 1
+                fully_parsed[language] += 1
 
             except Exception as e:
                 # Parse error - just list the file
-                index['stats']['listed_only'][language] = \
-                    index['stats']['listed_only'].get(language, 0) + 1
+                listed_only[language] += 1
         else:
             # Language not supported for parsing
-            index['stats']['listed_only'][language] = \
-                index['stats']['listed_only'].get(language, 0) + 1
+            listed_only[language] += 1
 
         # Add to index
-        index['files'][str(rel_path)] = file_info
+        files_out[rel_str] = file_info
         file_count += 1
 
         # Progress indicator every 100 files
@@ -1409,15 +1971,15 @@ def build_index(root_dir: str, config: Optional[Dict] = None) -> Tuple[Dict, int
 
     # Infer directory purposes
     print("🏗️  Analyzing directory purposes...")
-    for dir_path, files in directory_files.items():
+    for rel_dir, files in directory_files.items():
         if files:  # Only process directories with files
-            purpose = infer_directory_purpose(dir_path, files)
+            purpose = infer_directory_purpose(PurePath(rel_dir), files)
             if purpose:
-                rel_dir = str(dir_path.relative_to(root))
-                if rel_dir != '.':
-                    index['directory_purposes'][rel_dir] = purpose
+                index['directory_purposes'][rel_dir] = purpose
 
     index['stats']['total_files'] = file_count
+    index['stats']['fully_parsed'] = dict(fully_parsed)
+    index['stats']['listed_only'] = dict(listed_only)
     index['stats']['total_directories'] = dir_count
 
     # Log tier classification summary
@@ -1430,38 +1992,33 @@ def build_index(root_dir: str, config: Optional[Dict] = None) -> Tuple[Dict, int
     print("🔗 Building dependency graph...")
     dependency_graph = {}
 
+    # Index file keys (already posix) by extensionless stem
+    # (first extension in resolution order wins)
+    posix_files = index['files']
+    import_extensions = ('.py', '.js', '.ts', '.jsx', '.tsx')
+    files_by_stem = {}
+    for ext in reversed(import_extensions):
+        for posix_key in posix_files:
+            if posix_key.endswith(ext):
+                files_by_stem[posix_key[:-len(ext)]] = posix_key
+
     for file_path, file_info in index['files'].items():
         if file_info.get('imports'):
             # Normalize imports to resolve relative paths
-            file_dir = Path(file_path).parent
+            file_dir_parts = _posix_parts(file_path)[:-1]
             dependencies = []
 
             for imp in file_info['imports']:
                 # Handle relative imports
                 if imp.startswith('.'):
-                    # Resolve relative import
-                    if imp.startswith('./'):
-                        # Same directory
-                        resolved = str(file_dir / imp[2:])
-                    elif imp.startswith('../'):
-                        # Parent directory
-                        parts = imp.split('/')
-                        up_levels = len([p for p in parts if p == '..'])
-                        target_dir = file_dir
-                        for _ in range(up_levels):
-                            target_dir = target_dir.parent
-                        remaining = '/'.join(p for p in parts if p != '..')
-                        resolved = str(target_dir / remaining) if remaining else str(target_dir)
-                    else:
-                        # Module import like from . import X
-                        resolved = str(file_dir)
-
-                    # Try to find actual file
-                    for ext in ['.py', '.js', '.ts', '.jsx', '.tsx', '']:
-                        potential_file = resolved + ext
-                        if potential_file in index['files'] or potential_file.replace('\\', '/') in index['files']:
-                            dependencies.append(potential_file.replace('\\', '/'))
-                            break
+                    resolved = _resolve_relative_import(file_dir_parts, imp)
+
+                    # Try to find actual file (stem match first, then exact path)
+                    target = files_by_stem.get(resolved)
+                    if target is None and resolved in posix_files:
+                        target = resolved
+                    if target is not None:
+                        dependencies.append(target)
                 else:
                     # External dependency or absolute import
                     dependencies.append(imp)
@@ -1475,8 +2032,11 @@ def build_index(root_dir: str, config: Optional[Dict] = None) -> Tuple[Dict, int
 
     # Build bidirectional call graph
     print("📞 Building call graph...")
-    call_graph = {}
-    called_by_graph = {}
+    called_by_graph = defaultdict(dict)  # callee -> callers (dict keys keep order, drop duplicates)
+    # (container, name, edge target, caller dicts shared with called_by_graph);
+    # the shared dicts fill in as later files are visited
+    callables = []
+    call_edges = {}  # (caller, callee) -> None: ordered, de-duplicated edges for the dense format
 
     # Process all files to build call relationships
     for file_path, file_info in index['files'].items():
@@ -1485,80 +2045,77 @@ def build_index(root_dir: str, config: Optional[Dict] = None) -> Tuple[Dict, int
 
         # Process functions in this file
         if 'functions' in file_info:
-            for func_name, func_data in file_info['functions'].items():
+            functions = file_info['functions']
+            for func_name, func_data in functions.items():
+                callables.append((functions, func_name, func_name, (called_by_graph[func_name],)))
                 if isinstance(func_data, dict) and 'calls' in func_data:
-                    # Track what this function calls
-                    full_func_name = f"{file_path}:{func_name}"
-                    call_graph[full_func_name] = func_data['calls']
-
                     # Build reverse index (called_by)
                     for called in func_data['calls']:
-                        if called not in called_by_graph:
-                            called_by_graph[called] = []
-                        called_by_graph[called].append(func_name)
+                        called_by_graph[called][func_name] = None
+                        call_edges[(func_name, called)] = None
 
         # Process methods in classes
         if 'classes' in file_info:
             for class_name, class_data in file_info['classes'].items():
                 if isinstance(class_data, dict) and 'methods' in class_data:
-                    for method_name, method_data in class_data['methods'].items():
+                    methods = class_data['methods']
+                    for method_name, method_data in methods.items():
+                        full_name = f"{class_name}.{method_name}"
+                        callables.append((methods, method_name, full_name,
+                                          (called_by_graph[method_name], called_by_graph[full_name])))
                         if isinstance(method_data, dict) and 'calls' in method_data:
-                            # Track what this method calls
-                            full_method_name = f"{file_path}:{class_name}.{method_name}"
-                            call_graph[full_method_name] = method_data['calls']
-
                             # Build reverse index
                             for called in method_data['calls']:
-                                if called not in called_by_graph:
-                                    called_by_graph[called] = []
-                                called_by_graph[called].append(f"{class_name}.{method_name}")
-
-    # Add called_by information back to functions
-    for file_path, file_info in index['files'].items():
-        if not isinstance(file_info, dict):
+                                called_by_graph[called][full_name] = None
+                                call_edges[(full_name, called)] = None
+
+    # Add called_by information to every function/method that has callers
+    for container, name, target, caller_dicts in callables:
+        if len(caller_dicts) == 1 or not caller_dicts[1]:
+            callers = caller_dicts[0]
+        elif not caller_dicts[0]:
+            callers = caller_dicts[1]
+        else:
+            callers = {**caller_dicts[0], **caller_dicts[1]}
+        if not callers:
             continue
 
-        if 'functions' in file_info:
-            for func_name, func_data in file_info['functions'].items():
-                if func_name in called_by_graph:
-                    if isinstance(func_data, dict):
-                        func_data['called_by'] = called_by_graph[func_name]
-                    else:
-                        # Convert string signature to dict
-                        index['files'][file_path]['functions'][func_name] = {
-                            'signature': func_data,
-                            'called_by': called_by_graph[func_name]
-                        }
+        # Methods also get an edge under their Class.method name
+        for caller in callers:
+            call_edges[(caller, target)] = None
 
-        if 'classes' in file_info:
-            for class_name, class_data in file_info['classes'].items():
-                if isinstance(class_data, dict) and 'methods' in class_data:
-                    for method_name, method_data in class_data['methods'].items():
-                        full_name = f"{class_name}.{method_name}"
-                        if method_name in called_by_graph or full_name in called_by_graph:
-                            callers = called_by_graph.get(method_name, []) + called_by_graph.get(full_name, [])
-                            if callers:
-                                if isinstance(method_data, dict):
-                                    method_data['called_by'] = list(set(callers))
-                                else:
-                                    # Convert string signature to dict
-                                    class_data['methods'][method_name] = {
-                                        'signature': method_data,
-                                        'called_by': list(set(callers))
-                                    }
+        data = container[name]
+        if isinstance(data, dict):
+            data['called_by'] = list(callers)
+        else:
+            # Convert string signature to dict
+            container[name] = {
+                'signature': data,
+                'called_by': list(callers)
+            }
 
     # Add staleness check
-    week_old = datetime.now().timestamp() - 7 * 24 * 60 * 60
+    week_old = started_at.timestamp() - 7 * 24 * 60 * 60
     index['staleness_check'] = week_old
 
-    return index, skipped_count
+    # Hand edges and parsed files to convert_to_enhanced_dense_format so it need not rebuild them
+    dense_inputs = {'call_edges': list(call_edges), 'parsed_keys': parsed_keys}
+    return index, skipped_count, dense_inputs
 
 
 # infer_file_purpose is now imported from index_utils
 
 
-def convert_to_enhanced_dense_format(index: Dict) -> Dict:
-    """Convert to enhanced dense format that preserves all AI-relevant information."""
+def convert_to_enhanced_dense_format(
+    index: Dict,
+    call_edges: Optional[List[Tuple[str, str]]] = None,
+    parsed_keys: Optional[List[str]] = None
+) -> Dict:
+    """Convert to enhanced dense format that preserves all AI-relevant information.
+
+    call_edges and parsed_keys may carry what build_index already collected;
+    without them both are derived from the index.
+    """
     dense = {
         'at': index.get('indexed_at', ''),
         'root': index.get('root', '.'),
@@ -1579,32 +2136,55 @@ def convert_to_enhanced_dense_format(index: Dict) -> Dict:
             return doc[:max_len-3] + '...'
         return doc
 
+    # Only parsed files contribute to 'f' and 'g'; build_index lists them up front
+    files = index.get('files', {})
+    if parsed_keys is None:
+        parsed_keys = [path for path, info in files.items() if info.get('parsed', False)]
+
+    # Call graph edges (keep bidirectional info); build_index precomputes them,
+    # otherwise they are collected in the same pass as the file entries
+    collect_edges = call_edges is None
+    # (caller, callee) -> None when collecting: ordered, de-duplicated
+    edges = {} if collect_edges else call_edges
+
+    # Many functions share a signature ('()', '(self)', ...); abbreviate each once
+    abbreviated_sigs = {}
+
+    def abbreviate_sig(sig: str) -> str:
+        short = abbreviated_sigs.get(sig)
+        if short is None:
+            short = abbreviated_sigs[sig] = _SIGNATURE_ABBREV_RE.sub(
+                lambda m: SIGNATURE_ABBREVIATIONS[m.group(0)], sig)
+        return short
+
     # Build compressed files section
-    for path, info in index.get('files', {}).items():
-        if not info.get('parsed', False):
-            continue
+    for path in parsed_keys:
+        info = files[path]
 
         # Use abbreviated path
-        abbrev_path = path.replace('scripts/', 's/').replace('src/', 'sr/').replace('tests/', 't/')
+        abbrev_path = _PATH_ABBREV_RE.sub(lambda m: PATH_ABBREVIATIONS[m.group(0)], path)
 
         file_entry = []
 
         # Add language as single letter
         lang = info.get('language', 'unknown')
-        lang_map = {'python': 'p', 'javascript': 'j', 'typescript': 't', 'shell': 's', 'json': 'j'}
-        file_entry.append(lang_map.get(lang, 'u'))
+        file_entry.append(DENSE_LANGUAGE_CODES.get(lang, 'u'))
 
         # Compress functions with docstrings: name:line:signature:calls:docstring
         funcs = []
         for fname, fdata in info.get('functions', {}).items():
             if isinstance(fdata, dict):
                 line = fdata.get('line', 0)
-                sig = fdata.get('signature', '()')
                 # Compress signature
-                sig = sig.replace(' -> ', '>').replace(': ', ':')
-                calls = ','.join(fdata.get('calls', []))
+                sig = abbreviate_sig(fdata.get('signature', '()'))
+                calls = ','.join(fdata.get('calls', ()))
                 doc = truncate_doc(fdata.get('doc', ''))
                 funcs.append(f"{fname}:{line}:{sig}:{calls}:{doc}")
+                if collect_edges:
+                    for called in fdata.get('calls', ()):
+                        edges[(fname, called)] = None
+                    for caller in fdata.get('called_by', ()):
+                        edges[(caller, fname)] = None
             else:
                 funcs.append(f"{fname}:0:{fdata}::")
 
@@ -1620,11 +2200,16 @@ def convert_to_enhanced_dense_format(index: Dict) -> Dict:
                 for mname, mdata in cdata.get('methods', {}).items():
                     if isinstance(mdata, dict):
                         mline = mdata.get('line', 0)
-                        msig = mdata.get('signature', '()')
-                        msig = msig.replace(' -> ', '>').replace(': ', ':')
-                        mcalls = ','.join(mdata.get('calls', []))
+                        msig = abbreviate_sig(mdata.get('signature', '()'))
+                        mcalls = ','.join(mdata.get('calls', ()))
                         mdoc = truncate_doc(mdata.get('doc', ''))
                         methods.append(f"{mname}:{mline}:{msig}:{mcalls}:{mdoc}")
+                        if collect_edges:
+                            full_name = f"{cname}.{mname}"
+                            for called in mdata.get('calls', ()):
+                                edges[(full_name, called)] = None
+                            for caller in mdata.get('called_by', ()):
+                                edges[(caller, full_name)] = None
                     else:
                         methods.append(f"{mname}:0:{mdata}::")
 
@@ -1638,31 +2223,8 @@ def convert_to_enhanced_dense_format(index: Dict) -> Dict:
         if len(file_entry) > 1:
             dense['f'][abbrev_path] = file_entry
 
-    # Build call graph edges (keep bidirectional info)
-    edges = set()
-    for path, info in index.get('files', {}).items():
-        if info.get('parsed', False):
-            # Extract function calls
-            for fname, fdata in info.get('functions', {}).items():
-                if isinstance(fdata, dict):
-                    for called in fdata.get('calls', []):
-                        edges.add((fname, called))
-                    for caller in fdata.get('called_by', []):
-                        edges.add((caller, fname))
-
-            # Extract method calls
-            for cname, cdata in info.get('classes', {}).items():
-                if isinstance(cdata, dict):
-                    for mname, mdata in cdata.get('methods', {}).items():
-                        if isinstance(mdata, dict):
-                            full_name = f"{cname}.{mname}"
-                            for called in mdata.get('calls', []):
-                                edges.add((full_name, called))
-                            for caller in mdata.get('called_by', []):
-                                edges.add((caller, full_name))
-
     # Convert edges to list format
-    dense['g'] = [[e[0], e[1]] for e in edges]
+    dense['g'] = [[caller, callee] for caller, callee in edges]
 
     # Add compressed documentation map
     for doc_path, doc_info in index.get('documentation_map', {}).items():
@@ -1682,14 +2244,59 @@ def convert_to_enhanced_dense_format(index: Dict) -> Dict:
     return dense
 
 
+def _shorten_doc_field(entry: str, max_len: int) -> str:
+    """Shorten the fifth ':'-separated field of a dense function entry.
+
+    Entries look like "name:line:signature:calls:doc". The field after the
+    fourth colon is cut to max_len characters ("..." suffix when over 3),
+    or cleared when max_len is 0. Entries with fewer fields are returned
+    unchanged. Works by slicing, without splitting into a list.
+    """
+    start = -1
+    for _ in range(4):
+        start = entry.find(':', start + 1)
+        if start == -1:
+            return entry
+    start += 1
+    end = entry.find(':', start)
+    if end == -1:
+        end = len(entry)
+
+    field_len = end - start
+    if max_len == 0:
+        if field_len == 0:
+            return entry
+        return entry[:start] + entry[end:]
+    if field_len <= max_len:
+        return entry
+    return entry[:start] + entry[start:start + max_len - 3] + '...' + entry[end:]
+
+
 def compress_if_needed(dense_index: Dict, target_size: int = MAX_INDEX_SIZE) -> Dict:
-    """Compress dense index further if it exceeds size limit."""
-    index_json = json.dumps(dense_index, separators=(',', ':'))
-    current_size = len(index_json)
+    """Compress dense index further if it exceeds size limit.
+
+    The index is serialized once up front; each step then subtracts the
+    serialized size of what it removed instead of re-encoding everything.
+    """
+    original_size = len(dumps_compact(dense_index))
+    current_size = original_size
 
     if current_size <= target_size:
         return dense_index
 
+    def shorten_docs(max_len: int) -> int:
+        """Shorten function doc fields in place; return serialized bytes saved."""
+        saved = 0
+        for file_data in dense_index.get('f', {}).values():
+            if len(file_data) > 1 and isinstance(file_data[1], list):
+                funcs = file_data[1]
+                for i, func in enumerate(funcs):
+                    short = _shorten_doc_field(func, max_len)
+                    if short is not func:
+                        saved += len(dumps_compact(func)) - len(dumps_compact(short))
+                        funcs[i] = short
+        return saved
+
     print(f"⚠️  Index too large ({current_size} bytes), compressing to {target_size}...")
 
     # Add safeguards
@@ -1706,9 +2313,10 @@ def compress_if_needed(dense_index: Dict, target_size: int = MAX_INDEX_SIZE) ->
 
     print(f"  Step {iteration}: Reducing tree structure...")
     if len(dense_index.get('tree', [])) > 10:
+        old_tree_size = len(dumps_compact(dense_index['tree']))
         dense_index['tree'] = dense_index['tree'][:10]
         dense_index['tree'].append("... (truncated)")
-        current_size = len(json.dumps(dense_index, separators=(',', ':')))
+        current_size -= old_tree_size - len(dumps_compact(dense_index['tree']))
         if current_size <= target_size:
             print(f"  ✅ Compressed to {current_size} bytes")
             return dense_index
@@ -1720,18 +2328,7 @@ def compress_if_needed(dense_index: Dict, target_size: int = MAX_INDEX_SIZE) ->
         return dense_index
 
     print(f"  Step {iteration}: Truncating docstrings...")
-    for path, file_data in dense_index.get('f', {}).items():
-        if len(file_data) > 1 and isinstance(file_data[1], list):
-            # Truncate function docstrings
-            new_funcs = []
-            for func in file_data[1]:
-                parts = func.split(':')
-                if len(parts) >= 5 and len(parts[4]) > 40:
-                    parts[4] = parts[4][:37] + '...'
-                new_funcs.append(':'.join(parts))
-            file_data[1] = new_funcs
-
-    current_size = len(json.dumps(dense_index, separators=(',', ':')))
+    current_size -= shorten_docs(40)
     if current_size <= target_size:
         print(f"  ✅ Compressed to {current_size} bytes")
         return dense_index
@@ -1743,18 +2340,7 @@ def compress_if_needed(dense_index: Dict, target_size: int = MAX_INDEX_SIZE) ->
         return dense_index
 
     print(f"  Step {iteration}: Removing docstrings entirely...")
-    for path, file_data in dense_index.get('f', {}).items():
-        if len(file_data) > 1 and isinstance(file_data[1], list):
-            # Remove docstrings from functions
-            new_funcs = []
-            for func in file_data[1]:
-                parts = func.split(':')
-                if len(parts) >= 5:
-                    parts[4] = ''  # Remove docstring
-                new_funcs.append(':'.join(parts))
-            file_data[1] = new_funcs
-
-    current_size = len(json.dumps(dense_index, separators=(',', ':')))
+    current_size -= shorten_docs(0)
     if current_size <= target_size:
         print(f"  ✅ Compressed to {current_size} bytes")
         return dense_index
@@ -1767,9 +2353,8 @@ def compress_if_needed(dense_index: Dict, target_size: int = MAX_INDEX_SIZE) ->
 
     print(f"  Step {iteration}: Removing documentation map...")
     if 'd' in dense_index:
-        del dense_index['d']
-
-    current_size = len(json.dumps(dense_index, separators=(',', ':')))
+        # '"d":<value>' plus the separating comma
+        current_size -= len(dumps_compact({'d': dense_index.pop('d')})) - 1
     if current_size <= target_size:
         print(f"  ✅ Compressed to {current_size} bytes")
         return dense_index
@@ -1787,28 +2372,37 @@ def compress_if_needed(dense_index: Dict, target_size: int = MAX_INDEX_SIZE) ->
             files_to_keep = 10
 
         # Calculate importance based on function count
-        file_importance = {}
-        for path, file_data in dense_index['f'].items():
+        paths = list(dense_index['f'])
+        file_importance = []
+        for file_data in dense_index['f'].values():
             importance = 0
             if len(file_data) > 1 and isinstance(file_data[1], list):
                 importance = len(file_data[1])  # Number of functions
             if len(file_data) > 2:  # Has classes
                 importance += 5
-            file_importance[path] = importance
-
-        # Keep most important files
-        sorted_files = sorted(file_importance.items(), key=lambda x: x[1], reverse=True)
-        files_to_keep_set = set(path for path, _ in sorted_files[:files_to_keep])
+            file_importance.append(importance)
+
+        # Select whichever side is smaller: the files to drop or the files to
+        # keep. Among equally important files the earlier ones are kept.
+        drop_count = len(paths) - files_to_keep
+        if drop_count <= 0:
+            to_drop = []
+        elif drop_count < files_to_keep:
+            to_drop = heapq.nsmallest(drop_count, range(len(paths)),
+                                      key=lambda i: (file_importance[i], -i))
+        else:
+            kept = set(heapq.nlargest(files_to_keep, range(len(paths)),
+                                      key=file_importance.__getitem__))
+            to_drop = [i for i in range(len(paths)) if i not in kept]
 
-        # Remove less important files
-        for path in list(dense_index['f'].keys()):
-            if path not in files_to_keep_set:
-                del dense_index['f'][path]
+        # Remove less important files ('"path":<entry>' plus the separating comma each)
+        for i in to_drop:
+            path = paths[i]
+            current_size -= len(dumps_compact({path: dense_index['f'].pop(path)})) - 1
 
         print(f"  Emergency truncation: kept {len(dense_index['f'])} most important files")
 
-    final_size = len(json.dumps(dense_index, separators=(',', ':')))
-    print(f"  Compressed from {len(index_json)} to {final_size} bytes")
+    print(f"  Compressed from {original_size} to {current_size} bytes")
 
     return dense_index
 
@@ -1824,34 +2418,42 @@ def get_submodule_config(config: Optional[Dict]) -> Dict[str, any]:
         Dictionary with submodule configuration values and defaults applied.
         Keys: enabled (bool), threshold (int), strategy (str), max_depth (int)
     """
-    defaults = {
-        'enabled': True,
-        'threshold': 100,
-        'strategy': 'auto',
-        'max_depth': 3
-    }
-
     if not config or 'submodule_config' not in config:
-        return defaults
+        return dict(_SUBMODULE_CONFIG_DEFAULTS)
 
     submod_config = config['submodule_config']
 
     # Apply defaults for missing keys
-    return {
-        'enabled': submod_config.get('enabled', defaults['enabled']),
-        'threshold': submod_config.get('threshold', defaults['threshold']),
-        'strategy': submod_config.get('strategy', defaults['strategy']),
-        'max_depth': submod_config.get('max_depth', defaults['max_depth'])
-    }
+    return {key: submod_config.get(key, default) for key, default in _SUBMODULE_CONFIG_DEFAULTS.items()}
+
 
+# Logical directory groupings reported by analyze_directory_structure
+COMMON_DIRECTORY_GROUPS = {
+    'source': ('src', 'lib', 'app', 'source'),
+    'documentation': ('docs', 'documentation', 'doc'),
+    'tests': ('tests', 'test', '__tests__', 'spec'),
+    'components': ('components', 'widgets'),
+    'views': ('views', 'pages', 'screens'),
+    'api': ('api', 'routes', 'endpoints'),
+    'utilities': ('utils', 'utilities', 'helpers'),
+    'configuration': ('config', 'configuration', 'settings'),
+}
+_DIR_NAME_TO_GROUP = {name: group for group, names in COMMON_DIRECTORY_GROUPS.items() for name in names}
 
-def analyze_directory_structure(module_path: Path, root_path: Path) -> Dict[str, any]:
+# src/ subdirectories characteristic of a Vite project
+VITE_PATTERNS = frozenset({"components", "views", "api", "stores", "composables", "utils"})
+
+
+def analyze_directory_structure(module_path: Path, root_path: Path,
+                                dir_counts: Optional[Dict[str, int]] = None) -> Dict[str, any]:
     """
     Analyze second-level directory structure for a large module.
 
     Args:
         module_path: Path to the module directory
         root_path: Project root path
+        dir_counts: Optional per-directory file count cache shared across
+            calls within one run, so nested modules are not re-walked
 
     Returns:
         Dictionary with:
@@ -1859,8 +2461,6 @@ def analyze_directory_structure(module_path: Path, root_path: Path) -> Dict[str,
             - logical_groups: List of identified logical groupings
             - file_distribution: Dict mapping subdir -> file count
     """
-    import logging
-    logger = logging.getLogger(__name__)
 
     subdirs = []
     file_distribution = {}
@@ -1871,33 +2471,23 @@ def analyze_directory_structure(module_path: Path, root_path: Path) -> Dict[str,
             if item.is_dir() and item.name not in IGNORE_DIRS:
                 subdirs.append(item.name)
 
-                # Count files in this subdirectory (recursively)
-                file_count = sum(1 for f in item.rglob('*') if f.is_file())
-                file_distribution[item.name] = file_count
+                # Count files in this subdirectory (recursively, ignored dirs pruned)
+                file_distribution[item.name] = _scandir_count(item, dir_counts)
 
         # Identify logical groupings based on common patterns
-        logical_groups = []
-        common_patterns = {
-            'source': ['src', 'lib', 'app', 'source'],
-            'documentation': ['docs', 'documentation', 'doc'],
-            'tests': ['tests', 'test', '__tests__', 'spec'],
-            'components': ['components', 'widgets'],
-            'views': ['views', 'pages', 'screens'],
-            'api': ['api', 'routes', 'endpoints'],
-            'utilities': ['utils', 'utilities', 'helpers'],
-            'configuration': ['config', 'configuration', 'settings']
-        }
-
-        for group_name, patterns in common_patterns.items():
-            matching = [d for d in subdirs if d.lower() in patterns]
-            if matching:
-                logical_groups.append({
-                    'type': group_name,
-                    'directories': matching
-                })
+        grouped = defaultdict(list)
+        for d in subdirs:
+            group_name = _DIR_NAME_TO_GROUP.get(d.lower())
+            if group_name:
+                grouped[group_name].append(d)
+
+        logical_groups = [
+            {'type': group_name, 'directories': grouped[group_name]}
+            for group_name in COMMON_DIRECTORY_GROUPS if group_name in grouped
+        ]
 
-        logger.debug(f"Analyzed directory structure for {module_path.name}: "
-                    f"{len(subdirs)} subdirectories, {len(logical_groups)} logical groups")
+        logger.debug("Analyzed directory structure for %s: %d subdirectories, %d logical groups",
+                     module_path.name, len(subdirs), len(logical_groups))
 
         return {
             'subdirectories': subdirs,
@@ -1906,7 +2496,7 @@ def analyze_directory_structure(module_path: Path, root_path: Path) -> Dict[str,
         }
 
     except Exception as e:
-        logger.warning(f"Error analyzing directory structure for {module_path}: {e}")
+        logger.warning("Error analyzing directory structure for %s: %s", module_path, e)
         return {
             'subdirectories': [],
             'logical_groups': [],
@@ -1931,17 +2521,19 @@ def detect_large_modules(modules: Dict[str, List[str]], threshold: int, root_pat
             - file_count: int
             - analysis: dict with directory structure analysis (if available)
     """
-    import logging
-    logger = logging.getLogger(__name__)
-
     large_modules = []
     submod_config = get_submodule_config(config)
+    # Directory file counts shared by every analysis in this run; the root
+    # module's walk covers the subtrees of all other modules. Threads only
+    # ever store complete, identical totals, so sharing needs no lock
+    dir_counts = {}
 
     # Skip detection if disabled
     if not submod_config['enabled']:
         logger.debug("Sub-module detection disabled by configuration")
         return large_modules
 
+    candidates = []
     for module_id, file_list in modules.items():
         file_count = len(file_list)
 
@@ -1951,12 +2543,27 @@ def detect_large_modules(modules: Dict[str, List[str]], threshold: int, root_pat
         if file_count < threshold:
             continue
 
-        logger.info(f"Large module detected: {module_id} ({file_count} files)")
+        logger.info("Large module detected: %s (%d files)", module_id, file_count)
+        candidates.append((module_id, file_count))
 
-        # Analyze directory structure for large modules
+    # Analyze directory structure for large modules. The walks are IO-bound
+    # and release the GIL in scandir, so several modules run on threads
+    def analyze(candidate):
+        module_id = candidate[0]
         module_path = root_path / module_id if module_id != "root" else root_path
-        analysis = analyze_directory_structure(module_path, root_path)
+        return analyze_directory_structure(module_path, root_path, dir_counts)
+
+    if len(candidates) > 1:
+        # Largest modules first, so the longest walks start immediately
+        order = sorted(range(len(candidates)), key=lambda i: candidates[i][1], reverse=True)
+        analyses = [None] * len(candidates)
+        with ThreadPoolExecutor(max_workers=min(IO_THREADS, len(candidates))) as executor:
+            for i, analysis in zip(order, executor.map(analyze, [candidates[i] for i in order])):
+                analyses[i] = analysis
+    else:
+        analyses = [analyze(candidate) for candidate in candidates]
 
+    for (module_id, file_count), analysis in zip(candidates, analyses):
         large_modules.append({
             'module_id': module_id,
             'file_count': file_count,
@@ -1980,42 +2587,32 @@ def detect_framework_patterns(root_path: Path) -> str:
     Returns:
         Framework type: "vite", "react", "nextjs", or "generic"
     """
-    import logging
-    logger = logging.getLogger(__name__)
 
     try:
         src_path = root_path / "src"
 
-        if not src_path.exists() or not src_path.is_dir():
+        # One directory read lists every subdirectory of src/ instead of
+        # probing each pattern with exists()/is_dir()
+        try:
+            with os.scandir(src_path) as it:
+                present = {entry.name for entry in it if entry.is_dir()}
+        except (FileNotFoundError, NotADirectoryError):
             logger.debug("No src/ directory found - framework: generic")
             return "generic"
 
-        # Vite characteristic directories
-        vite_patterns = [
-            "components",
-            "views",
-            "api",
-            "stores",
-            "composables",
-            "utils"
-        ]
-
-        # Count how many Vite patterns are present
-        matches = 0
-        for pattern in vite_patterns:
-            if (src_path / pattern).exists() and (src_path / pattern).is_dir():
-                matches += 1
+        # Count how many Vite characteristic directories are present
+        matches = len(present.intersection(VITE_PATTERNS))
 
         # Consider it Vite if at least 3 characteristic directories are present
         if matches >= 3:
-            logger.debug(f"Vite framework detected ({matches}/{len(vite_patterns)} patterns matched)")
+            logger.debug("Vite framework detected (%d/%d patterns matched)", matches, len(VITE_PATTERNS))
             return "vite"
 
-        logger.debug(f"Generic framework ({matches}/{len(vite_patterns)} Vite patterns matched - need 3+)")
+        logger.debug("Generic framework (%d/%d Vite patterns matched - need 3+)", matches, len(VITE_PATTERNS))
         return "generic"
 
     except Exception as e:
-        logger.warning(f"Error detecting framework patterns: {e}")
+        logger.warning("Error detecting framework patterns: %s", e)
         return "generic"
 
 
@@ -2063,8 +2660,7 @@ def load_preset_template(preset_name: str) -> Dict[str, any]:
     # Try to load template
     try:
         if template_path.exists():
-            with open(template_path, 'r') as f:
-                config = json.load(f)
+            config = load_json(template_path)
 
             # Replace _generated: "auto" with current timestamp
             if config.get("_generated") == "auto":
@@ -2158,8 +2754,6 @@ def apply_framework_preset(framework_type: str, config: Optional[Dict] = None) -
         nextjs: app/, components/, lib/ (depth=2)
         generic: Split by direct subdirectories heuristic (depth=2)
     """
-    import logging
-    logger = logging.getLogger(__name__)
 
     # Define framework presets
     presets = {
@@ -2212,14 +2806,14 @@ def apply_framework_preset(framework_type: str, config: Optional[Dict] = None) -
     if config and 'framework_presets' in config:
         user_presets = config['framework_presets']
         if framework_type in user_presets:
-            logger.debug(f"Applying user-defined preset override for {framework_type}")
+            logger.debug("Applying user-defined preset override for %s", framework_type)
             # User can override split_paths and max_depth
             if 'split_paths' in user_presets[framework_type]:
                 preset['split_paths'] = user_presets[framework_type]['split_paths']
             if 'max_depth' in user_presets[framework_type]:
                 preset['max_depth'] = user_presets[framework_type]['max_depth']
 
-    logger.debug(f"Applied {framework_type} preset: {preset['description']}")
+    logger.debug("Applied %s preset: %s", framework_type, preset['description'])
     return preset
 
 
@@ -2256,7 +2850,6 @@ def generate_submodule_name(parent: str, child: str, grandchild: Optional[str] =
 def split_module_recursive(
     module_id: str,
     file_list: List[str],
-    root_path: Path,
     max_depth: int,
     current_depth: int = 0,
     config: Optional[Dict] = None
@@ -2275,7 +2868,6 @@ def split_module_recursive(
     Args:
         module_id: Module identifier (e.g., "assureptmdashboard" or "assureptmdashboard-src")
         file_list: List of file paths relative to project root
-        root_path: Project root path
         max_depth: Maximum recursion depth (typically 3)
         current_depth: Current recursion depth (0 = top level)
         config: Optional configuration dict
@@ -2292,124 +2884,131 @@ def split_module_recursive(
             ...
         }
     """
-    import logging
-    logger = logging.getLogger(__name__)
 
     # Get configuration
     submod_config = get_submodule_config(config)
     threshold = submod_config['threshold']
 
+    # Depth-first worklist instead of recursion. Children are pushed in
+    # reverse so sub-modules come out in the same order recursion produced;
+    # a depth of None marks a finished sub-module to emit as-is.
+    result = {}
+    stack = [(module_id, file_list, current_depth)]
+    while stack:
+        sub_module_id, files, depth = stack.pop()
+        children = None if depth is None else _split_module_once(
+            sub_module_id, files, max_depth, depth, threshold)
+        if children is None:
+            result[sub_module_id] = files
+        else:
+            stack.extend(reversed(children))
+
+    return result
+
+
+def _split_module_once(
+    module_id: str,
+    file_list: List[str],
+    max_depth: int,
+    current_depth: int,
+    threshold: int
+) -> Optional[List[Tuple[str, List[str], Optional[int]]]]:
+    """
+    Split one module a single directory level deep.
+
+    Returns:
+        None if the module should be kept as-is, otherwise the ordered
+        sub-modules as (sub_module_id, files, depth) tuples, where depth is
+        the level to split the sub-module at next, or None to keep it whole
+    """
     # Base case 1: depth limit reached
     if current_depth >= max_depth:
-        logger.debug(f"Depth limit reached for {module_id} at level {current_depth}")
-        return {module_id: file_list}
+        logger.debug("Depth limit reached for %s at level %d", module_id, current_depth)
+        return None
 
     # Base case 2: module too small to split
     if len(file_list) < threshold:
-        logger.debug(f"Module {module_id} below threshold ({len(file_list)} < {threshold})")
-        return {module_id: file_list}
+        logger.debug("Module %s below threshold (%d < %s)", module_id, len(file_list), threshold)
+        return None
 
     # Determine module base path
     # For root module, use root_path
     # For named modules like "scripts", use root_path/scripts
     # For sub-modules like "assureptmdashboard-src", parse the structure
     if module_id == "root":
-        module_path = root_path
+        module_prefix = ''
     else:
         # Extract path components from module_id
-        # Examples: "scripts" -> root_path/scripts
-        #          "assureptmdashboard-src" -> root_path/assureptmdashboard/src
-        parts = module_id.split('-')
-        module_path = root_path / '/'.join(parts)
+        # Examples: "scripts" -> "scripts/"
+        #          "assureptmdashboard-src" -> "assureptmdashboard/src/"
+        module_prefix = os.sep.join(module_id.split('-')) + os.sep
+    prefix_len = len(module_prefix)
 
     # Analyze directory structure
     try:
-        subdirs = []
-        subdir_files = {}
+        subdir_files = defaultdict(list)  # 'root' holds files at the module level
 
-        # Group files by immediate subdirectory
+        # Group files by immediate subdirectory; file paths are root-relative
+        # strings (as built by organize_into_modules), so plain prefix
+        # matching replaces building and relativizing a Path per file
         for file_path_str in file_list:
-            file_path = root_path / file_path_str
-
-            try:
-                # Get path relative to module_path
-                rel_to_module = file_path.relative_to(module_path)
-                parts = rel_to_module.parts
-
-                if len(parts) > 1:
-                    # File is in a subdirectory
-                    subdir = parts[0]
-                    if subdir not in subdirs:
-                        subdirs.append(subdir)
-                        subdir_files[subdir] = []
-                    subdir_files[subdir].append(file_path_str)
-                else:
-                    # File at module root level
-                    if 'root' not in subdir_files:
-                        subdir_files['root'] = []
-                    subdir_files['root'].append(file_path_str)
-
-            except ValueError:
-                # File not under module_path, skip
-                logger.debug(f"File {file_path_str} not under {module_path}, skipping")
+            if not file_path_str.startswith(module_prefix):
+                # File not under the module directory, skip
+                logger.debug("File %s not under %s, skipping", file_path_str, module_prefix)
                 continue
 
+            sep = file_path_str.find(os.sep, prefix_len)
+            # File is in a subdirectory, or at module root level
+            subdir = file_path_str[prefix_len:sep] if sep != -1 else 'root'
+            subdir_files[subdir].append(file_path_str)
+
         # Check if module has organized structure
         # "Organized" = has subdirectories with significant file counts
-        has_organized_structure = False
-        for subdir, files in subdir_files.items():
-            if subdir != 'root' and len(files) >= threshold * 0.2:  # At least 20% of threshold
-                has_organized_structure = True
-                break
+        min_bucket = math.ceil(threshold * 0.2)  # At least 20% of threshold
+        has_organized_structure = any(
+            len(files) >= min_bucket
+            for subdir, files in subdir_files.items() if subdir != 'root'
+        )
 
         # If flat structure, don't split
         if not has_organized_structure:
-            logger.debug(f"Module {module_id} has flat structure - no splitting")
-            return {module_id: file_list}
+            logger.debug("Module %s has flat structure - no splitting", module_id)
+            return None
 
         # Split into sub-modules
-        logger.info(f"Splitting {module_id} ({len(file_list)} files) into {len(subdirs)} sub-modules at depth {current_depth}")
+        subdir_count = sum(1 for subdir in subdir_files if subdir != 'root')
+        logger.info("Splitting %s (%d files) into %d sub-modules at depth %d",
+                    module_id, len(file_list), subdir_count, current_depth)
 
-        result = {}
+        children = []
 
         for subdir, files in subdir_files.items():
             if subdir == 'root':
                 # Intermediate-level files -> *-root sub-module
                 root_module_id = f"{module_id}-root"
-                result[root_module_id] = files
-                logger.debug(f"Created {root_module_id} with {len(files)} intermediate files")
+                children.append((root_module_id, files, None))
+                logger.debug("Created %s with %d intermediate files", root_module_id, len(files))
             else:
-                # Create sub-module name based on current depth
-                if current_depth == 0:
-                    # First split: parent-child
-                    sub_module_id = generate_submodule_name(module_id, subdir)
-                else:
-                    # Deeper splits: append to existing name
-                    sub_module_id = f"{module_id}-{subdir}"
+                # Sub-module name: parent-child at the first split, and the
+                # same append at deeper levels (generate_submodule_name's
+                # two-argument form, inlined)
+                sub_module_id = f"{module_id}-{subdir}"
 
-                # Recursively split if this subdirectory is large enough
+                # Split further if this subdirectory is large enough
                 if len(files) >= threshold:
-                    logger.debug(f"Recursively splitting {sub_module_id} ({len(files)} files)")
-                    sub_result = split_module_recursive(
-                        sub_module_id,
-                        files,
-                        root_path,
-                        max_depth,
-                        current_depth + 1,
-                        config
-                    )
-                    result.update(sub_result)
+                    logger.debug("Recursively splitting %s (%d files)", sub_module_id, len(files))
+                    children.append((sub_module_id, files, current_depth + 1))
                 else:
                     # Keep as single sub-module
-                    result[sub_module_id] = files
-                    logger.debug(f"Created {sub_module_id} with {len(files)} files")
+                    children.append((sub_module_id, files, None))
+                    logger.debug("Created %s with %d files", sub_module_id, len(files))
 
-        return result
+        return children
 
     except Exception as e:
-        logger.error(f"Error splitting module {module_id}: {e}")
+        logger.error("Error splitting module %s: %s", module_id, e)
         # Graceful degradation: return original module
-        return {module_id: file_list}
+        return None
 
 
 def build_file_to_module_map(modules: Dict[str, List[str]]) -> Dict[str, str]:
@@ -2436,20 +3035,23 @@ def build_file_to_module_map(modules: Dict[str, List[str]]) -> Dict[str, str]:
             "src/views/Home.vue": "assureptmdashboard-src-views"
         }
     """
-    file_to_module = {}
-
-    for module_id, file_list in modules.items():
-        for file_path in file_list:
-            # Each file should map to exactly one module
-            if file_path in file_to_module:
-                # This shouldn't happen in properly organized modules
-                # Log warning but continue (last module wins)
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.warning(f"File {file_path} appears in multiple modules: "
-                             f"{file_to_module[file_path]} and {module_id}")
+    file_to_module = {
+        file_path: module_id
+        for module_id, file_list in modules.items()
+        for file_path in file_list
+    }
 
-            file_to_module[file_path] = module_id
+    # Each file should map to exactly one module; a short map means one didn't
+    if len(file_to_module) != sum(map(len, modules.values())):
+        # This shouldn't happen in properly organized modules
+        # Log warnings but continue (last module wins)
+        seen = {}
+        for module_id, file_list in modules.items():
+            for file_path in file_list:
+                if file_path in seen:
+                    logger.warning("File %s appears in multiple modules: %s and %s",
+                                   file_path, seen[file_path], module_id)
+                seen[file_path] = module_id
 
     return file_to_module
 
@@ -2508,15 +3110,15 @@ def create_module_references(modules: Dict[str, List[str]], functions: Dict[str,
         # Count functions in this module
         func_count = 0
         for file_path in file_list:
-            if file_path in functions:
-                file_funcs = functions[file_path].get('functions', {})
-                func_count += len(file_funcs)
+            file_data = functions.get(file_path)
+            if file_data is None:
+                continue
+            func_count += len(file_data.get('functions', ()))
 
-                # Also count methods in classes
-                file_classes = functions[file_path].get('classes', {})
-                for class_data in file_classes.values():
-                    if isinstance(class_data, dict):
-                        func_count += len(class_data.get('methods', {}))
+            # Also count methods in classes
+            for class_data in file_data.get('classes', {}).values():
+                if isinstance(class_data, dict):
+                    func_count += len(class_data.get('methods', ()))
 
         module_refs[module_id] = {
             'file_count': len(file_list),
@@ -2529,51 +3131,60 @@ def create_module_references(modules: Dict[str, List[str]], functions: Dict[str,
 
 
 def print_summary(index: Dict, skipped_count: int):
-    """Print a helpful summary of what was indexed."""
+    """Print a helpful summary of what was indexed.
+
+    Lines are collected and written with a single print call.
+    """
     stats = index['stats']
 
     # Add warning if no files were found
     if stats['total_files'] == 0:
-        print("\n⚠️  WARNING: No files were indexed!")
-        print("   This might mean:")
-        print("   • You're in the wrong directory")
-        print("   • All files are being ignored (check .gitignore)")
-        print("   • The project has no supported file types")
-        print(f"\n   Current directory: {os.getcwd()}")
-        print("   Try running from your project root directory.")
+        print("\n".join([
+            "\n⚠️  WARNING: No files were indexed!",
+            "   This might mean:",
+            "   • You're in the wrong directory",
+            "   • All files are being ignored (check .gitignore)",
+            "   • The project has no supported file types",
+            f"\n   Current directory: {os.getcwd()}",
+            "   Try running from your project root directory.",
+        ]))
         return
 
-    print(f"\n📊 Project Analysis Complete:")
-    print(f"   📁 {stats['total_directories']} directories indexed")
-    print(f"   📄 {stats['total_files']} code files found")
-    print(f"   📝 {stats['markdown_files']} documentation files analyzed")
+    lines = [
+        f"\n📊 Project Analysis Complete:",
+        f"   📁 {stats['total_directories']} directories indexed",
+        f"   📄 {stats['total_files']} code files found",
+        f"   📝 {stats['markdown_files']} documentation files analyzed",
+    ]
 
     # Show fully parsed languages
     if stats['fully_parsed']:
-        print("\n✅ Languages with full parsing:")
-        for lang, count in sorted(stats['fully_parsed'].items()):
-            print(f"   • {count} {lang.capitalize()} files (with signatures)")
+        lines.append("\n✅ Languages with full parsing:")
+        lines.extend(f"   • {count} {lang.capitalize()} files (with signatures)"
+                     for lang, count in sorted(stats['fully_parsed'].items()))
 
     # Show listed-only languages
     if stats['listed_only']:
-        print("\n📋 Languages listed only:")
-        for lang, count in sorted(stats['listed_only'].items()):
-            print(f"   • {count} {lang.capitalize()} files")
+        lines.append("\n📋 Languages listed only:")
+        lines.extend(f"   • {count} {lang.capitalize()} files"
+                     for lang, count in sorted(stats['listed_only'].items()))
 
     # Show documentation insights
     if index.get('d'):
-        print(f"\n📚 Documentation insights:")
-        for doc_file, sections in list(index['d'].items())[:3]:
-            print(f"   • {doc_file}: {len(sections)} sections")
+        lines.append(f"\n📚 Documentation insights:")
+        lines.extend(f"   • {doc_file}: {len(sections)} sections"
+                     for doc_file, sections in list(index['d'].items())[:3])
 
     # Show directory purposes
     if index.get('dir_purposes'):
-        print(f"\n🏗️  Directory structure:")
-        for dir_path, purpose in list(index['dir_purposes'].items())[:5]:
-            print(f"   • {dir_path}/: {purpose}")
+        lines.append(f"\n🏗️  Directory structure:")
+        lines.extend(f"   • {dir_path}/: {purpose}"
+                     for dir_path, purpose in list(index['dir_purposes'].items())[:5])
 
     if skipped_count > 0:
-        print(f"\n   (Skipped {skipped_count} files in ignored directories)")
+        lines.append(f"\n   (Skipped {skipped_count} files in ignored directories)")
+
+    print("\n".join(lines))
 
 
 def create_backup(index_path: Path) -> Path:
@@ -2621,9 +3232,8 @@ def extract_legacy_data(index_path: Path) -> Dict:
         raise FileNotFoundError(f"Legacy index not found at {index_path}")
 
     try:
-        with open(index_path, 'r', encoding='utf-8') as f:
-            legacy_index = json.load(f)
-        return legacy_index
+        # Bulk read and parse (orjson when installed) rather than json.load
+        return load_json(index_path)
     except json.JSONDecodeError as e:
         raise json.JSONDecodeError(f"Corrupted legacy index: {e.msg}", e.doc, e.pos)
 
@@ -2642,17 +3252,23 @@ def validate_migration_integrity(legacy_index: Dict, core_index: Dict, detail_mo
     Returns:
         True if validation passed, False otherwise
     """
-    import hashlib
-
     print("   🔍 Validating migration integrity...")
 
-    # Count validation: files
-    legacy_files = set(legacy_index.get('f', {}).keys())
+    # Count validation: files. The legacy keys view compares directly against
+    # the split set, so only one side is materialized
+    legacy_files = legacy_index.get('f', {}).keys()
 
-    # Collect all files from detail modules
+    # Collect all files from detail modules, counting functions and classes
+    # in the same pass
     split_files = set()
+    split_func_count = 0
+    split_class_count = 0
     for module_data in detail_modules.values():
-        split_files.update(module_data.get('files', {}).keys())
+        module_files = module_data.get('files', {})
+        split_files.update(module_files)
+        for file_data in module_files.values():
+            split_func_count += len(file_data.get('functions', ()))
+            split_class_count += len(file_data.get('classes', ()))
 
     if legacy_files != split_files:
         missing_in_split = legacy_files - split_files
@@ -2671,20 +3287,13 @@ def validate_migration_integrity(legacy_index: Dict, core_index: Dict, detail_mo
     for file_data in legacy_index.get('f', {}).values():
         if isinstance(file_data, list) and len(file_data) > 1 and isinstance(file_data[1], list):
             for sig in file_data[1]:
-                if isinstance(sig, str):
-                    if ':(' in sig:  # Function signature
-                        legacy_func_count += 1
-                    elif sig.startswith('class '):  # Class signature
+                if type(sig) is str:
+                    # Function entries start with their name, which can never
+                    # be 'class ', so the prefix check decides classes first
+                    if sig[:6] == 'class ':  # Class signature
                         legacy_class_count += 1
-
-    split_func_count = 0
-    split_class_count = 0
-    for module_data in detail_modules.values():
-        for file_data in module_data.get('files', {}).values():
-            if 'functions' in file_data:
-                split_func_count += len(file_data['functions'])
-            if 'classes' in file_data:
-                split_class_count += len(file_data['classes'])
+                    elif ':(' in sig:  # Function signature
+                        legacy_func_count += 1
 
     if legacy_func_count != split_func_count:
         print(f"      ❌ Function count mismatch: legacy={legacy_func_count}, split={split_func_count}")
@@ -2773,7 +3382,6 @@ def migrate_to_split_format(root_dir: str = '.', dry_run: bool = False) -> bool:
     Returns:
         True if migration succeeded, False otherwise
     """
-    import shutil
     from datetime import datetime
 
     root_path = Path(root_dir).resolve()
@@ -2849,13 +3457,16 @@ def migrate_to_split_format(root_dir: str = '.', dry_run: bool = False) -> bool:
         # Use existing generate_split_index() function
         # Load config for tier classification
         config = load_configuration(Path(root_dir) / '.project-index.json')
-        core_index, total_size = generate_split_index(root_dir, config)
+        # Dry-run builds everything in memory so nothing needs cleaning up afterwards
+        core_index, _ = generate_split_index(root_dir, config, write=not dry_run)
 
-        core_size = len(json.dumps(core_index, separators=(',', ':')))
+        # Serialize once; the same bytes give the size and are written below
+        core_bytes = dumps_compact(core_index)
+        core_size = len(core_bytes)
         core_size_kb = core_size / 1024
 
         # Calculate detail modules size
-        detail_size = total_size - core_size
+        detail_size = core_index['stats'].get('detail_bytes', 0)
         detail_size_kb = detail_size / 1024
 
         module_count = len(core_index.get('modules', {}))
@@ -2873,7 +3484,7 @@ def migrate_to_split_format(root_dir: str = '.', dry_run: bool = False) -> bool:
         else:
             # Write core index to disk (atomic write)
             temp_index_path = index_path.parent / f"{index_path.name}.tmp"
-            temp_index_path.write_text(json.dumps(core_index, separators=(',', ':')))
+            temp_index_path.write_bytes(core_bytes)
             temp_index_path.replace(index_path)  # Atomic rename
 
             print(f"      ✓ Generated core index ({core_size_kb:.1f} KB)")
@@ -2895,24 +3506,26 @@ def migrate_to_split_format(root_dir: str = '.', dry_run: bool = False) -> bool:
         print(f"      📊 Validating {file_count} files across {module_count} modules...")
 
     try:
-        # Load all detail modules that were just created
+        # Load all detail modules that were just created (none exist in dry-run)
         detail_modules = {}
-        if detail_dir.exists():
+        if not dry_run and detail_dir.exists():
             module_files = list(detail_dir.glob('*.json'))
-            for i, module_file in enumerate(module_files):
-                if show_progress and i % 10 == 0:
-                    print(f"      📊 Loading module {i+1}/{len(module_files)}...")
-                module_id = module_file.stem
-                with open(module_file, 'r', encoding='utf-8') as f:
-                    detail_modules[module_id] = json.load(f)
+            # Reads overlap on threads; map keeps results in file order
+            with ThreadPoolExecutor(max_workers=max(1, min(IO_THREADS, len(module_files)))) as executor:
+                for i, (module_file, module_data) in enumerate(
+                        zip(module_files, executor.map(load_json, module_files))):
+                    if show_progress and i % 10 == 0:
+                        print(f"      📊 Loading module {i+1}/{len(module_files)}...")
+                    detail_modules[module_file.stem] = module_data
 
         if dry_run:
             print(f"      🔍 Would validate:")
             print(f"         • File count: {file_count} files")
             legacy_func_count = sum(
-                len([s for s in file_data[1] if isinstance(s, str) and ':(' in s])
+                1
                 for file_data in legacy_index.get('f', {}).values()
                 if isinstance(file_data, list) and len(file_data) > 1
+                for s in file_data[1] if type(s) is str and ':(' in s
             )
             print(f"         • Function count: {legacy_func_count} functions")
             print(f"         • Call graph edges")
@@ -2933,13 +3546,6 @@ def migrate_to_split_format(root_dir: str = '.', dry_run: bool = False) -> bool:
             rollback_migration(backup_path, index_path, detail_dir)
         return False
 
-    # Clean up detail modules created during dry-run
-    if dry_run and detail_dir.exists():
-        try:
-            shutil.rmtree(detail_dir)
-        except Exception:
-            pass  # Best effort cleanup
-
     # Step 6: Report success
     if dry_run:
         print("\n   ✅ Dry run completed successfully!")
@@ -3040,8 +3646,6 @@ def analyze_module_structure(root_path: Path, config: Optional[Dict] = None) ->
         - File counts per module
         - Suggested configuration based on patterns
     """
-    import logging
-    logger = logging.getLogger(__name__)
 
     print("\n" + "=" * 70)
     print("📊 MODULE STRUCTURE ANALYSIS (Read-Only)")
@@ -3058,9 +3662,15 @@ def analyze_module_structure(root_path: Path, config: Optional[Dict] = None) ->
     # Get files to index (same logic as build_index)
     all_files = []
 
-    for file_path in root_path.rglob('*'):
-        if file_path.is_file() and should_index_file(file_path, root_path):
-            all_files.append(file_path)
+    for entry in _scandir_recursive(root_path):
+        if entry.is_file(follow_symlinks=False):
+            # Suffix check on the entry name first, so only candidate files
+            # get a Path object and the full should_index_file check
+            if os.path.splitext(entry.name)[1] not in INDEXABLE_SUFFIXES:
+                continue
+            file_path = Path(entry.path)
+            if should_index_file(file_path, root_path):
+                all_files.append(file_path)
 
     # Organize into modules
     modules = organize_into_modules(all_files, root_path, depth=1)
@@ -3106,7 +3716,6 @@ def analyze_module_structure(root_path: Path, config: Optional[Dict] = None) ->
             sub_modules = split_module_recursive(
                 module_id,
                 file_list,
-                root_path,
                 max_depth,
                 current_depth=0,
                 config=config
@@ -3157,9 +3766,6 @@ def create_default_config(root_path: Path) -> None:
     if config_path.exists():
         return
 
-    import logging
-    logger = logging.getLogger(__name__)
-
     # Detect framework to set appropriate defaults
     framework_type = detect_framework_patterns(root_path)
     preset = apply_framework_preset(framework_type, None)
@@ -3180,12 +3786,12 @@ def create_default_config(root_path: Path) -> None:
         with open(config_path, 'w') as f:
             json.dump(default_config, f, indent=2)
 
-        logger.info(f"Created default configuration file: .project-index.json")
-        logger.info(f"Detected framework: {framework_type} (max_depth={preset.get('max_depth', 3)})")
+        logger.info("Created default configuration file: .project-index.json")
+        logger.info("Detected framework: %s (max_depth=%s)", framework_type, preset.get('max_depth', 3))
         print(f"✨ Created .project-index.json with {framework_type} preset")
 
     except Exception as e:
-        logger.warning(f"Could not create default config: {e}")
+        logger.warning("Could not create default config: %s", e)
 
 
 def main() -> None:
@@ -3286,7 +3892,6 @@ Configuration File:
     args = parser.parse_args()
 
     # Set up logging
-    import logging
     if args.verbose:
         logging.basicConfig(
             level=logging.DEBUG,
@@ -3383,6 +3988,7 @@ Configuration File:
 
     # Determine final split mode based on mode setting
     use_split_mode = False
+    git_files = None  # Listed once for auto-detection, then reused by the builder
 
     if mode == 'split':
         use_split_mode = True
@@ -3430,23 +4036,16 @@ Configuration File:
         print("   Incremental update mode (via --incremental flag)")
         use_incremental = True
     elif index_path.exists():
-        # Auto-detection: Use incremental if index exists and git available
-        try:
-            # Check if git is available
-            subprocess.run(
-                ['git', 'rev-parse', '--git-dir'],
-                cwd=Path('.'),
-                capture_output=True,
-                timeout=5,
-                check=True
-            )
+        # Auto-detection: Use incremental if index exists and git available.
+        # A successful git file listing already proves both.
+        if git_files is not None or _in_git_work_tree(Path('.')):
             # Check if split format (incremental only works with split format)
             if use_split_mode:
                 use_incremental = True
                 print("   Auto-detected incremental update mode (existing index + git + split format)")
             else:
                 print("   Full regeneration (single-file format doesn't support incremental)")
-        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
+        else:
             print("   Full regeneration (git not available for incremental)")
     else:
         print("   Full regeneration (no existing index)")
@@ -3468,8 +4067,7 @@ Configuration File:
                 print(f"   Updated {len(updated_modules)} modules")
 
                 # Load the updated index for summary
-                with open(index_path, 'r') as f:
-                    index = json.load(f)
+                index = load_json(index_path)
 
                 # Print summary and exit
                 print_summary(index, 0)
@@ -3489,11 +4087,11 @@ Configuration File:
     if use_split_mode:
         # New split index format
         print("   Using split index format (v2.2-submodules)")
-        index, skipped_count = generate_split_index('.', config)
+        index, skipped_count = generate_split_index('.', config, git_files=git_files)
 
-        # Check size
-        index_json = json.dumps(index, separators=(',', ':'))
-        current_size = len(index_json)
+        # Check size; the encoded bytes are kept for the write below
+        index_bytes = dumps_compact(index)
+        current_size = len(index_bytes)
         current_size_kb = current_size / 1024
 
         print(f"\n📊 Core index size: {current_size_kb:.1f} KB")
@@ -3506,16 +4104,17 @@ Configuration File:
         # Legacy single-file format
         print("   ℹ️  Using legacy single-file format (v1.0)")
         print("   📊 This format is fully supported and recommended for projects with <1000 files")
-        index, skipped_count = build_index('.', config)
+        index, skipped_count, dense_inputs = build_index('.', config, git_files=git_files)
 
         # Convert to enhanced dense format (always)
-        index = convert_to_enhanced_dense_format(index)
+        index = convert_to_enhanced_dense_format(index, **dense_inputs)
 
         # Compress further if needed
         index = compress_if_needed(index, target_size_bytes)
 
         # Add version field to legacy format
         index['version'] = '1.0'
+        index_bytes = None
 
     # Add metadata if requested via environment
     if target_size_k > 0:
@@ -3523,10 +4122,13 @@ Configuration File:
             index['_meta'] = {}
         # Note: Full metadata is added by the hook after generation
         index['_meta']['target_size_k'] = target_size_k
+        index_bytes = None  # Changed since it was last encoded
 
     # Save to PROJECT_INDEX.json (minified)
     output_path = Path('PROJECT_INDEX.json')
-    output_path.write_text(json.dumps(index, separators=(',', ':')))
+    if index_bytes is None:
+        index_bytes = dumps_compact(index)
+    output_path.write_bytes(index_bytes)
 
     # Print summary
     print_summary(index, skipped_count)
@@ -3535,7 +4137,7 @@ Configuration File:
 
     # More concise output when called by hook
     if target_size_k > 0:
-        actual_size = len(json.dumps(index, separators=(',', ':')))
+        actual_size = len(index_bytes)  # Exactly what was written
         actual_tokens = actual_size // 4 // 1000
         print(f"📊 Size: {actual_tokens}k tokens (target was {target_size_k}k)")
     else:
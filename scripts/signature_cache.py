@@ -6,20 +6,36 @@ Caches parsed function/class signatures keyed by (file_path, mtime, size) to avo
 re-parsing unchanged files. This significantly improves performance for subsequent
 index generations.
 
+Signatures are stored content-addressed (SHA-256 of the file bytes), so a file
+whose mtime changed without its content changing (fresh checkout, touch, branch
+switch) or that was renamed still hits the cache after one hash.
+
+The cache header records a fingerprint of the extractor code and read limit
+the signatures came from; a cache written by a different extractor is
+discarded on load.
+
 Cache location: .project-index-cache/signatures.json
 """
 
-import json
+import functools
 import hashlib
 import logging
 from pathlib import Path
-from typing import Dict, Optional, Any
+from typing import Dict, Iterable, Optional, Any, Tuple
+
+try:
+    import index_utils
+    from index_utils import load_json, write_json_compact
+except ImportError:
+    # Imported as scripts.signature_cache from the repository root
+    from scripts import index_utils
+    from scripts.index_utils import load_json, write_json_compact
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 # Cache format version - bump this when parser output format changes
-CACHE_VERSION = "1.0"
+CACHE_VERSION = "1.1"
 
 # Default cache directory relative to project root
 CACHE_DIR = ".project-index-cache"
@@ -48,6 +64,56 @@ def get_cache_key(file_path: Path) -> str:
     return hashlib.sha256(key_data.encode()).hexdigest()[:16]
 
 
+def get_content_hash(file_path: Path) -> str:
+    """
+    Hash a file's bytes for the content-addressed signature store.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        64-character hex SHA-256 digest
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _extractor_source_hash() -> str:
+    with open(index_utils.__file__, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def get_extractor_fingerprint() -> str:
+    """
+    Identify the extractors that produced cached signatures.
+
+    Combines a hash of the extractor module's source with MAX_FILE_SIZE,
+    which bounds how much of each file the extractors see, so parser
+    changes invalidate the cache without a manual CACHE_VERSION bump.
+
+    Returns:
+        16-character hex fingerprint
+    """
+    key_data = f"{_extractor_source_hash()}:{index_utils.MAX_FILE_SIZE}"
+    return hashlib.sha256(key_data.encode()).hexdigest()[:16]
+
+
+def _empty_cache() -> Dict[str, Any]:
+    return {
+        "version": CACHE_VERSION,
+        "extractor": get_extractor_fingerprint(),
+        "signatures": {},
+        "content": {}
+    }
+
+
 def get_cache_path(project_root: Path) -> Path:
     """
     Get the full path to the cache file.
@@ -75,46 +141,55 @@ def load_cache(project_root: Path) -> Dict[str, Any]:
         Cache dictionary with structure:
         {
             "version": str,
-            "signatures": {cache_key: signature_dict}
+            "extractor": str,
+            "signatures": {cache_key: content_hash},
+            "content": {content_hash: signature_dict}
         }
     """
     cache_path = get_cache_path(project_root)
 
     if not cache_path.exists():
         logger.debug("No cache file found, starting fresh")
-        return {"version": CACHE_VERSION, "signatures": {}}
+        return _empty_cache()
 
     try:
-        with open(cache_path, 'r', encoding='utf-8') as f:
-            cache = json.load(f)
+        cache = load_json(cache_path)
 
         # Validate cache version
         if cache.get("version") != CACHE_VERSION:
             logger.info(f"Cache version mismatch (expected {CACHE_VERSION}, "
                        f"got {cache.get('version')}), starting fresh")
-            return {"version": CACHE_VERSION, "signatures": {}}
+            return _empty_cache()
+
+        # Signatures from other extractor code or read limits may be stale
+        if cache.get("extractor") != get_extractor_fingerprint():
+            logger.info("Signature extractors changed, starting fresh")
+            return _empty_cache()
 
         # Validate structure
-        if not isinstance(cache.get("signatures"), dict):
+        if not isinstance(cache.get("signatures"), dict) or \
+                not isinstance(cache.get("content", {}), dict):
             logger.warning("Invalid cache structure, starting fresh")
-            return {"version": CACHE_VERSION, "signatures": {}}
+            return _empty_cache()
 
         logger.debug(f"Loaded cache with {len(cache.get('signatures', {}))} entries")
         return cache
 
-    except json.JSONDecodeError as e:
+    except ValueError as e:  # JSONDecodeError or undecodable bytes
         logger.warning(f"Cache file corrupted ({e}), starting fresh")
-        return {"version": CACHE_VERSION, "signatures": {}}
+        return _empty_cache()
     except OSError as e:
         logger.warning(f"Failed to read cache file ({e}), starting fresh")
-        return {"version": CACHE_VERSION, "signatures": {}}
+        return _empty_cache()
 
 
 def save_cache(project_root: Path, cache: Dict[str, Any]) -> bool:
     """
     Save signature cache to disk.
 
-    Creates the cache directory if it doesn't exist.
+    Creates the cache directory if it doesn't exist. The cache is stamped
+    with the current extractor fingerprint, since every entry it holds was
+    either loaded under that fingerprint or extracted in this run.
 
     Args:
         project_root: Project root directory
@@ -126,13 +201,14 @@ def save_cache(project_root: Path, cache: Dict[str, Any]) -> bool:
     cache_path = get_cache_path(project_root)
 
     try:
+        cache["extractor"] = get_extractor_fingerprint()
+
         # Create cache directory if needed
         cache_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Write cache atomically (write to temp, then rename)
         temp_path = cache_path.with_suffix('.json.tmp')
-        with open(temp_path, 'w', encoding='utf-8') as f:
-            json.dump(cache, f, separators=(',', ':'))  # Compact JSON
+        write_json_compact(temp_path, cache)
 
         # Atomic rename
         temp_path.replace(cache_path)
@@ -145,29 +221,60 @@ def save_cache(project_root: Path, cache: Dict[str, Any]) -> bool:
         return False
 
 
-def get_cached_signature(file_path: Path, cache: Dict[str, Any]) -> Optional[Dict]:
+def lookup_cached_signature(file_path: Path,
+                            cache: Dict[str, Any]) -> Tuple[Optional[Dict], Optional[str]]:
     """
-    Get cached signature for a file if still valid.
+    Look up a file's cached signature, also returning its content hash.
+
+    Looks up the (path, mtime, size) key first, which needs only a stat.
+    On a miss the file is hashed and the content store is checked, so
+    touched or renamed files are not re-parsed; the new key is remembered.
+    The hash computed on a miss is returned so that set_cached_signature
+    can store the freshly parsed signature without hashing the file again.
 
     Args:
         file_path: Path to the file
         cache: Loaded cache dictionary
 
     Returns:
-        Cached signature dictionary, or None if not cached or invalid
+        (signature, content_hash) tuple. signature is None if not cached or
+        invalid; content_hash is None if the file was never hashed
     """
     try:
         key = get_cache_key(file_path)
-        signature = cache.get("signatures", {}).get(key)
-        if signature:
-            logger.debug(f"Cache hit for {file_path.name}")
-        return signature
+        signatures = cache.setdefault("signatures", {})
+        content = cache.setdefault("content", {})
+
+        content_hash = signatures.get(key)
+        if content_hash not in content:
+            content_hash = get_content_hash(file_path)
+            if content_hash not in content:
+                return None, content_hash
+            signatures[key] = content_hash
+
+        logger.debug(f"Cache hit for {file_path.name}")
+        return content[content_hash], content_hash
     except OSError:
         # File doesn't exist or can't read stats
-        return None
+        return None, None
 
 
-def set_cached_signature(file_path: Path, signature: Dict, cache: Dict[str, Any]) -> None:
+def get_cached_signature(file_path: Path, cache: Dict[str, Any]) -> Optional[Dict]:
+    """
+    Get cached signature for a file if still valid.
+
+    Args:
+        file_path: Path to the file
+        cache: Loaded cache dictionary
+
+    Returns:
+        Cached signature dictionary, or None if not cached or invalid
+    """
+    return lookup_cached_signature(file_path, cache)[0]
+
+
+def set_cached_signature(file_path: Path, signature: Dict, cache: Dict[str, Any],
+                         content_hash: Optional[str] = None) -> None:
     """
     Store signature in cache.
 
@@ -175,15 +282,54 @@ def set_cached_signature(file_path: Path, signature: Dict, cache: Dict[str, Any]
         file_path: Path to the file
         signature: Parsed signature dictionary
         cache: Cache dictionary to update (modified in place)
+        content_hash: Content hash from lookup_cached_signature, if already
+            computed; the file is hashed when omitted
     """
     try:
         key = get_cache_key(file_path)
-        cache.setdefault("signatures", {})[key] = signature
+        if content_hash is None:
+            content_hash = get_content_hash(file_path)
+        cache.setdefault("signatures", {})[key] = content_hash
+        cache.setdefault("content", {})[content_hash] = signature
         logger.debug(f"Cached signature for {file_path.name}")
     except OSError as e:
         logger.warning(f"Failed to cache signature for {file_path}: {e}")
 
 
+def prune_cache(cache: Dict[str, Any], file_paths: Iterable[Path]) -> int:
+    """
+    Drop cache entries for anything but the current state of file_paths.
+
+    Keys for deleted files or superseded (mtime, size) stats go, along with
+    content entries no remaining key refers to, so the cache tracks the
+    project rather than growing with every run.
+
+    Args:
+        cache: Cache dictionary to prune (modified in place)
+        file_paths: Files indexed in the current run
+
+    Returns:
+        Number of keys removed
+    """
+    signatures = cache.get("signatures", {})
+    content = cache.get("content", {})
+    live = {}
+    for file_path in file_paths:
+        try:
+            key = get_cache_key(file_path)
+        except OSError:
+            continue
+        if key in signatures:
+            live[key] = signatures[key]
+
+    cache["signatures"] = live
+    cache["content"] = {
+        content_hash: content[content_hash]
+        for content_hash in set(live.values()) if content_hash in content
+    }
+    return len(signatures) - len(live)
+
+
 def clear_cache(project_root: Path) -> bool:
     """
     Clear the signature cache.
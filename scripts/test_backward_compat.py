@@ -7,11 +7,21 @@ Tests Story 1.6 Acceptance Criteria:
 - AC#3: All existing functionality works with legacy format
 """
 
+import io
 import json
+import shutil
 import tempfile
 import unittest
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 from pathlib import Path
-from project_index import detect_index_format
+from unittest.mock import patch
+from project_index import (
+    detect_index_format, generate_tree_structure, build_index,
+    convert_to_enhanced_dense_format, extract_file_signatures, parse_files_parallel, compress_if_needed,
+    generate_split_index, _posix_parts, _resolve_relative_import
+)
+from index_utils import extract_markdown_structure
 
 
 class TestDetectIndexFormat(unittest.TestCase):
@@ -100,6 +110,23 @@ class TestDetectIndexFormat(unittest.TestCase):
         format_type = detect_index_format(self.index_path)
         self.assertEqual(format_type, "legacy")
 
+    def test_split_format_version_not_first_key(self):
+        """Test split detection falls back to a full parse when version isn't first."""
+        index_dir = self.test_path / "PROJECT_INDEX.d"
+        index_dir.mkdir()
+
+        split_index = {
+            "at": "2025-11-01",
+            "root": ".",
+            "modules": {"scripts": {"version": "1.0"}},
+            "version": "2.0-split"
+        }
+        with open(self.index_path, 'w') as f:
+            json.dump(split_index, f)
+
+        format_type = detect_index_format(self.index_path)
+        self.assertEqual(format_type, "split")
+
     def test_legacy_format_empty_index_file(self):
         """Test legacy detection with empty/corrupted index file."""
         # Create empty index file
@@ -186,6 +213,296 @@ class TestDetectIndexFormat(unittest.TestCase):
                        f"Format detection took {elapsed_ms:.2f}ms, expected <100ms")
 
 
+class TestGenerateTreeStructure(unittest.TestCase):
+    """Test directory tree rendering used by both index formats."""
+
+    def setUp(self):
+        """Create a small project with nested and ignored directories."""
+        self.test_dir = tempfile.mkdtemp()
+        self.root = Path(self.test_dir)
+
+        (self.root / "src" / "utils").mkdir(parents=True)
+        (self.root / "src" / "main.py").write_text("print('hi')\n")
+        (self.root / "src" / "utils" / "helpers.py").write_text("def h():\n    pass\n")
+        (self.root / "src" / "utils" / "notes.txt").write_text("not code\n")
+        (self.root / "src" / "node_modules").mkdir()
+        (self.root / "src" / "node_modules" / "dep.js").write_text("module.exports = 1\n")
+        (self.root / "README.md").write_text("# Project\n")
+
+    def tearDown(self):
+        """Clean up temporary directory."""
+        shutil.rmtree(self.test_dir)
+
+    def test_directory_counts_include_nested_code_files(self):
+        """Directory counts cover the whole subtree but skip ignored directories."""
+        tree = generate_tree_structure(self.root)
+
+        self.assertEqual(tree[0], ".")
+        self.assertIn("├── src/ (2 files)", tree)
+        self.assertIn("│   └── utils/ (1 files)", tree)
+        self.assertIn("└── README.md", tree)
+        self.assertFalse(any("node_modules" in line for line in tree))
+
+    def test_counts_from_supplied_file_list_match_walk(self):
+        """A builder-supplied file list yields the same tree as walking."""
+        file_paths = [path for path in self.root.rglob('*') if path.is_file()]
+
+        self.assertEqual(
+            generate_tree_structure(self.root, file_paths=file_paths),
+            generate_tree_structure(self.root)
+        )
+
+
+class TestCrlfSources(unittest.TestCase):
+    """Test that CRLF sources extract the same as LF ones."""
+
+    def setUp(self):
+        """Create temporary directory."""
+        self.test_dir = tempfile.mkdtemp()
+        self.root = Path(self.test_dir)
+
+    def tearDown(self):
+        """Clean up temporary directory."""
+        shutil.rmtree(self.test_dir)
+
+    def _extract_both(self, name, source):
+        lf = self.root / f"lf{name}"
+        crlf = self.root / f"crlf{name}"
+        lf.write_bytes(source.encode())
+        crlf.write_bytes(source.replace('\n', '\r\n').encode())
+        return extract_file_signatures(lf), extract_file_signatures(crlf)
+
+    def test_python_decorators_and_enums(self):
+        lf, crlf = self._extract_both('.py', (
+            "from enum import Enum\n"
+            "class Color(Enum):\n    RED = 1\n    GREEN = 2\n\n"
+            "@property\ndef f(x):\n    return x\n"
+        ))
+        self.assertEqual(crlf['functions']['f']['decorators'], ['property'])
+        self.assertEqual(crlf['enums']['Color']['values'], ['RED', 'GREEN'])
+        self.assertEqual(crlf, lf)
+
+    def test_shell_variables(self):
+        lf, crlf = self._extract_both('.sh', "export FOO=1\nBAR=baz\nf() {\n  echo hi\n}\n")
+        self.assertEqual(crlf['variables'], ['BAR'])
+        self.assertEqual(crlf, lf)
+
+    def test_markdown_headers(self):
+        readme = self.root / "README.md"
+        readme.write_bytes(b"# Title\r\n\nText\r\n## Setup\r\n")
+        self.assertEqual(extract_markdown_structure(readme)['sections'], ['Title', 'Setup'])
+
+
+class TestParseFilesParallel(unittest.TestCase):
+    """Test worker-process parsing used by both index builders."""
+
+    def setUp(self):
+        """Create a handful of Python and JavaScript files."""
+        self.test_dir = tempfile.mkdtemp()
+        self.root = Path(self.test_dir)
+        self.files = []
+        for i in range(4):
+            py_file = self.root / f"mod{i}.py"
+            py_file.write_text(f"def func_{i}(x: int) -> int:\n    return x\n")
+            js_file = self.root / f"mod{i}.js"
+            js_file.write_text(f"function handler{i}(req) {{\n  return req;\n}}\n")
+            self.files.extend([py_file, js_file])
+
+    def tearDown(self):
+        """Clean up temporary directory."""
+        shutil.rmtree(self.test_dir)
+
+    def test_small_file_lists_parse_sequentially(self):
+        """Below the threshold no pool is started and callers parse inline."""
+        self.assertEqual(parse_files_parallel(self.files), {})
+
+    def test_parallel_results_match_sequential(self):
+        """Workers produce the same signatures as in-process extraction."""
+        with patch('project_index.PARALLEL_PARSE_MIN_FILES', 1), \
+                patch('project_index.os.cpu_count', return_value=2):
+            results = parse_files_parallel(self.files)
+
+        self.assertEqual(set(results), set(self.files))
+        for file_path in self.files:
+            self.assertEqual(results[file_path], extract_file_signatures(file_path))
+        self.assertIn('func_0', results[self.root / "mod0.py"]['functions'])
+
+    def test_split_index_sends_only_cache_misses_to_pool(self):
+        """Files with a valid cached signature are not re-parsed by workers."""
+        with patch('sys.argv', ['project_index.py']), redirect_stdout(io.StringIO()):
+            generate_split_index(str(self.root))  # populates the signature cache
+
+            changed = self.root / "mod1.py"
+            changed.write_text("def func_changed(y):\n    return y\n")
+            with patch('project_index.parse_files_parallel', return_value={}) as pool:
+                core_index, _ = generate_split_index(str(self.root), write=False)
+
+        pool.assert_called_once_with([changed])
+        self.assertEqual(core_index['stats']['fully_parsed'], {'python': 4, 'javascript': 4})
+
+
+class TestDetailModuleWrites(unittest.TestCase):
+    """Test that unchanged detail modules are not rewritten."""
+
+    def setUp(self):
+        """Create a project with two top-level modules."""
+        self.test_dir = tempfile.mkdtemp()
+        self.root = Path(self.test_dir)
+        for name in ("api", "core"):
+            (self.root / name).mkdir()
+            (self.root / name / "main.py").write_text(f"def {name}_main():\n    pass\n")
+        self.detail_dir = self.root / "PROJECT_INDEX.d"
+
+    def tearDown(self):
+        """Clean up temporary directory."""
+        shutil.rmtree(self.test_dir)
+
+    def _generate(self):
+        with patch('sys.argv', ['project_index.py']), redirect_stdout(io.StringIO()):
+            generate_split_index(str(self.root))
+
+    def test_unchanged_modules_are_not_rewritten(self):
+        """Only the module whose source changed is written on a re-run."""
+        self._generate()
+        api_mtime = (self.detail_dir / "api.json").stat().st_mtime_ns
+        core_before = (self.detail_dir / "core.json").read_bytes()
+
+        (self.root / "core" / "main.py").write_text("def core_changed():\n    pass\n")
+        self._generate()
+
+        self.assertEqual((self.detail_dir / "api.json").stat().st_mtime_ns, api_mtime)
+        self.assertNotEqual((self.detail_dir / "core.json").read_bytes(), core_before)
+
+    def test_externally_modified_module_is_rewritten(self):
+        """A detail file changed since the last run is regenerated."""
+        self._generate()
+        api_file = self.detail_dir / "api.json"
+        expected = api_file.read_bytes()
+
+        api_file.write_text('{"stale": true, "padding": "written elsewhere"}')
+        self._generate()
+
+        self.assertEqual(api_file.read_bytes(), expected)
+
+    def test_writes_leave_no_temp_files(self):
+        """Detail modules are renamed into place, leaving only the .json files."""
+        self._generate()
+        self.assertEqual(sorted(p.name for p in self.detail_dir.iterdir()), ["api.json", "core.json"])
+
+    def test_parallel_build_matches_sequential(self):
+        """Modules built in worker processes are byte-identical to in-process ones."""
+        for name in ("cli", "web"):
+            (self.root / name).mkdir()
+            (self.root / name / "main.py").write_text(f"def {name}_main():\n    return {name}_helper()\n\n"
+                                                      f"def {name}_helper():\n    pass\n")
+        self._generate()
+        sequential = {p.name: p.read_bytes() for p in self.detail_dir.glob("*.json")}
+
+        with patch('project_index.PARALLEL_PARSE_MIN_FILES', 1), \
+                patch('project_index.os.cpu_count', return_value=2), \
+                patch('project_index.ProcessPoolExecutor', wraps=ProcessPoolExecutor) as pool:
+            shutil.rmtree(self.detail_dir)
+            self._generate()
+
+        pool.assert_called()
+        self.assertEqual({p.name: p.read_bytes() for p in self.detail_dir.glob("*.json")}, sequential)
+
+
+class TestBuildIndexDenseInputs(unittest.TestCase):
+    """Test the dense-format inputs build_index returns beside the index."""
+
+    def setUp(self):
+        """Create temporary project."""
+        self.test_dir = tempfile.mkdtemp()
+        self.root = Path(self.test_dir)
+        (self.root / "a.py").write_text("def f():\n    g()\n\ndef g():\n    pass\n")
+
+    def tearDown(self):
+        """Clean up temporary directory."""
+        shutil.rmtree(self.test_dir)
+
+    def test_inputs_kept_out_of_index_and_match_rebuild(self):
+        with redirect_stdout(io.StringIO()):
+            index, _, dense_inputs = build_index(str(self.root))
+
+        self.assertEqual([key for key in index if key.startswith('_')], [])
+        self.assertEqual(
+            convert_to_enhanced_dense_format(index, **dense_inputs),
+            convert_to_enhanced_dense_format(index)
+        )
+
+
+class TestResolveRelativeImport(unittest.TestCase):
+    """Test relative import resolution for the legacy dependency graph."""
+
+    def test_matches_posix_path_joining(self):
+        """Resolution agrees with joining PurePosixPath objects."""
+        cases = [
+            ('src/app/main.js', './utils', 'src/app/utils'),
+            ('src/app/main.js', './', 'src/app'),
+            ('src/app/main.js', '../lib/db', 'src/lib/db'),
+            ('src/app/main.js', '../../../../x', 'x'),
+            ('src/app/main.js', '../', 'src'),
+            ('src/app/main.js', './a/./b', 'src/app/a/b'),
+            ('main.py', '.', '.'),
+            ('main.py', '../up', 'up'),
+            ('pkg/mod.py', '.sibling', 'pkg'),
+        ]
+        for file_path, imp, expected in cases:
+            with self.subTest(file_path=file_path, imp=imp):
+                resolved = _resolve_relative_import(_posix_parts(file_path)[:-1], imp)
+                self.assertEqual(resolved, expected)
+
+
+class TestCompressIfNeeded(unittest.TestCase):
+    """Test progressive compression of the legacy dense index."""
+
+    def make_index(self):
+        long_doc = "Handles the request and returns a response object " * 2
+        return {
+            'tree': ['.'],
+            'f': {
+                's/app.py': ['p', [
+                    f"handle:10:(req)>Response:parse,send:{long_doc}",
+                    "short:20:()::Short doc",
+                ]]
+            },
+            'd': {'README.md': ['Intro']}
+        }
+
+    def test_small_index_returned_unchanged(self):
+        """Indexes under the target size are not modified."""
+        index = self.make_index()
+        expected = json.loads(json.dumps(index))
+        self.assertEqual(compress_if_needed(index, target_size=10_000), expected)
+
+    def test_docstrings_truncated_before_removal(self):
+        """Step 2 cuts only the fifth field of each entry to 40 chars."""
+        index = self.make_index()
+        full_size = len(json.dumps(index, separators=(',', ':')))
+        result = compress_if_needed(index, target_size=full_size - 30)
+
+        funcs = result['f']['s/app.py'][1]
+        self.assertEqual(funcs[0], "handle:10:(req)>Response:parse,send:"
+                                   "Handles the request and returns a res...")
+        self.assertEqual(funcs[1], "short:20:()::Short doc")
+        self.assertIn('d', result)
+
+    def test_tracked_size_matches_serialized_size(self):
+        """The size reported after emergency truncation is the real encoded size."""
+        index = self.make_index()
+        for i in range(30):
+            index['f'][f"s/mod{i}.py"] = ['p', [f"fn{j}:{j}:(x)>int::Doc {j}" for j in range(i % 4)]]
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            result = compress_if_needed(index, target_size=200)
+
+        self.assertEqual(len(result['f']), 10)
+        actual_size = len(json.dumps(result, separators=(',', ':')))
+        self.assertIn(f"to {actual_size} bytes", output.getvalue())
+
+
 if __name__ == '__main__':
     # Run tests with verbose output
     unittest.main(verbosity=2)
@@ -113,6 +113,18 @@ class TestLoadConfiguration(unittest.TestCase):
 
         self.assertNotIn('threshold', config)
 
+    def test_load_config_threshold_boolean(self):
+        """Test loading with threshold as boolean (JSON true is not a number)."""
+        config_data = {"threshold": True, "submodule_config": {"threshold": True, "max_depth": True}}
+        config_path = self.test_path / ".project-index.json"
+        config_path.write_text(json.dumps(config_data))
+
+        config = load_configuration(config_path)
+
+        self.assertNotIn('threshold', config)
+        self.assertEqual(config['submodule_config']['threshold'], 100)
+        self.assertEqual(config['submodule_config']['max_depth'], 3)
+
     def test_load_config_mode_auto(self):
         """Test loading with mode='auto' (valid, should preserve)."""
         config_data = {"mode": "auto"}
@@ -213,7 +225,7 @@ class TestConfigurationPrecedence(unittest.TestCase):
         """Test CLI --threshold flag overrides config file threshold."""
         # Mock 1500 files (between config threshold 500 and CLI threshold 2000)
         mock_git_files.return_value = ['file' + str(i) for i in range(1500)]
-        mock_build.return_value = ({'version': '1.0'}, 0)
+        mock_build.return_value = ({'version': '1.0'}, 0, {})
         mock_convert.return_value = {'version': '1.0'}
         mock_compress.return_value = {'version': '1.0'}
 
@@ -273,7 +285,7 @@ class TestModeSelection(unittest.TestCase):
     def test_mode_single_forces_single_format(self, mock_summary, mock_compress,
                                               mock_convert, mock_build):
         """Test --mode single always generates single-file format (AC#1)."""
-        mock_build.return_value = ({'version': '1.0'}, 0)
+        mock_build.return_value = ({'version': '1.0'}, 0, {})
         mock_convert.return_value = {'version': '1.0'}
         mock_compress.return_value = {'version': '1.0'}
 
@@ -292,7 +304,7 @@ class TestModeSelection(unittest.TestCase):
         """Test --mode auto uses threshold for decision (AC#3)."""
         # Mock 999 files (below default threshold of 1000)
         mock_git_files.return_value = ['file' + str(i) for i in range(999)]
-        mock_build.return_value = ({'version': '1.0'}, 0)
+        mock_build.return_value = ({'version': '1.0'}, 0, {})
         mock_convert.return_value = {'version': '1.0'}
         mock_compress.return_value = {'version': '1.0'}
 
@@ -317,6 +329,11 @@ class TestModeSelection(unittest.TestCase):
         # Should use split mode
         mock_generate.assert_called_once()
 
+        # The file list from auto-detection is handed to the builder
+        mock_git_files.assert_called_once()
+        self.assertIs(mock_generate.call_args.kwargs['git_files'],
+                      mock_git_files.return_value)
+
 
 class TestCustomThreshold(unittest.TestCase):
     """Test custom threshold configuration (AC#3)."""
@@ -371,7 +388,7 @@ class TestCustomThreshold(unittest.TestCase):
 
         # Mock 499 files (below config threshold of 500)
         mock_git_files.return_value = ['file' + str(i) for i in range(499)]
-        mock_build.return_value = ({'version': '1.0'}, 0)
+        mock_build.return_value = ({'version': '1.0'}, 0, {})
         mock_convert.return_value = {'version': '1.0'}
         mock_compress.return_value = {'version': '1.0'}
 
@@ -23,6 +23,7 @@ from pathlib import Path
 
 from git_metadata import (
     extract_git_metadata,
+    build_git_metadata_index,
     _extract_pr_number,
     _calculate_recency_days,
     _fallback_to_mtime
@@ -176,6 +177,59 @@ class TestExtractGitMetadata(unittest.TestCase):
         self.assertEqual(metadata['pr'], '456')
         self.assertEqual(metadata['lines_changed'], 1)  # Added 1 line
 
+    def test_bulk_index_matches_per_file_extraction(self):
+        """Bulk git log pass yields the same metadata as per-file queries."""
+        other = self.repo_path / 'other.py'
+        other.write_text('x = 1\ny = 2\n')
+        subprocess.run(['git', 'add', 'other.py'], cwd=self.repo_path, capture_output=True, check=True)
+        subprocess.run(
+            ['git', 'commit', '-m', 'Add other (#7)'],
+            cwd=self.repo_path,
+            capture_output=True,
+            check=True
+        )
+
+        index = build_git_metadata_index(self.repo_path)
+
+        self.assertEqual(set(index), {'test.py', 'other.py'})
+        for name in index:
+            self.assertEqual(index[name], extract_git_metadata(self.repo_path / name, self.repo_path))
+
+    def test_bulk_index_lookup_falls_back_to_mtime(self):
+        """Files absent from the bulk index use the mtime fallback."""
+        untracked = self.repo_path / 'untracked.py'
+        untracked.write_text('pass\n')
+
+        index = build_git_metadata_index(self.repo_path, ['test.py', 'untracked.py'])
+        self.assertEqual(set(index), {'test.py'})
+
+        metadata = extract_git_metadata(untracked, self.repo_path, index=index)
+        self.assertIsNone(metadata['commit'])
+        self.assertIsNotNone(metadata['date'])
+
+    def test_bulk_index_from_repository_subdirectory(self):
+        """Paths resolve relative to a project nested inside the repository."""
+        sub = self.repo_path / 'sub'
+        sub.mkdir()
+        (sub / 'nested.py').write_text('pass\n')
+        subprocess.run(['git', 'add', 'sub/nested.py'], cwd=self.repo_path, capture_output=True, check=True)
+        subprocess.run(
+            ['git', 'commit', '-m', 'Add nested'],
+            cwd=self.repo_path,
+            capture_output=True,
+            check=True
+        )
+
+        index = build_git_metadata_index(sub, ['nested.py'])
+
+        self.assertEqual(set(index), {'nested.py'})
+        self.assertEqual(index['nested.py'], extract_git_metadata(sub / 'nested.py', sub))
+
+    def test_bulk_index_outside_git_returns_none(self):
+        """No git repository means no bulk index, so callers query per file."""
+        with tempfile.TemporaryDirectory() as plain_dir:
+            self.assertIsNone(build_git_metadata_index(Path(plain_dir)))
+
 
 class TestPRNumberExtraction(unittest.TestCase):
     """Test PR number parsing from commit messages."""
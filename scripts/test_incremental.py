@@ -98,6 +98,37 @@ class TestChangeDetection(unittest.TestCase):
         self.assertIn('tracked.py', file_names)
         self.assertNotIn('ignored.tmp', file_names)
 
+    def _head(self):
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=self.project_root,
+            check=True, capture_output=True, text=True
+        ).stdout.strip()
+
+    def test_detect_changes_since_last_commit(self):
+        """Test diffing against the recorded commit ignores older history."""
+        last_commit = self._head()
+
+        (self.project_root / 'file2.py').write_text('def bar(): return 1')
+        subprocess.run(['git', 'commit', '-am', 'Edit file2'], cwd=self.project_root, check=True, capture_output=True)
+        (self.project_root / 'new_untracked.py').write_text('def baz(): pass')
+
+        # Timestamp would include the initial commit; the commit diff must not
+        timestamp = (datetime.now() - timedelta(minutes=5)).isoformat()
+        changed_files = detect_changed_files(
+            timestamp, self.project_root, last_commit=last_commit
+        )
+
+        self.assertEqual(sorted(changed_files), ['file2.py', 'new_untracked.py'])
+
+    def test_unknown_last_commit_falls_back_to_timestamp(self):
+        """Test an unreachable recorded commit falls back to git log scan."""
+        timestamp = (datetime.now() - timedelta(minutes=5)).isoformat()
+        changed_files = detect_changed_files(
+            timestamp, self.project_root, last_commit='0' * 40
+        )
+
+        self.assertIn('file1.py', changed_files)
+
 
 class TestDependencyGraph(unittest.TestCase):
     """Test dependency graph construction from imports (AC #2)."""
@@ -218,6 +249,29 @@ class TestAutoDetection(unittest.TestCase):
         non_existent = Path('/tmp/nonexistent_index.json')
         self.assertFalse(non_existent.exists())
 
+    def test_git_dir_in_parent_skips_git_probe(self):
+        """A .git in a parent directory is found without running git."""
+        from project_index import _in_git_work_tree
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            (Path(temp_dir) / '.git').mkdir()
+            nested = Path(temp_dir) / 'src' / 'pkg'
+            nested.mkdir(parents=True)
+
+            with patch('project_index.subprocess.run') as mock_run:
+                self.assertTrue(_in_git_work_tree(nested))
+            mock_run.assert_not_called()
+
+    def test_no_git_dir_falls_back_to_git_probe(self):
+        """Without a .git entry, git itself decides."""
+        from project_index import _in_git_work_tree
+
+        with tempfile.TemporaryDirectory() as temp_dir, \
+                patch('project_index.subprocess.run',
+                      side_effect=subprocess.CalledProcessError(128, 'git')) as mock_run:
+            self.assertFalse(_in_git_work_tree(Path(temp_dir)))
+        mock_run.assert_called_once()
+
 
 class TestPerformance(unittest.TestCase):
     """Test performance requirements (AC: <10s for 100 files)."""
@@ -262,6 +262,22 @@ class TestDetectLargeModules(unittest.TestCase):
         # Should return empty list when disabled
         self.assertEqual(len(large_modules), 0)
 
+    def test_multiple_large_modules_keep_order_and_analysis(self):
+        """Modules analyzed on worker threads come back in input order."""
+        names = ['web', 'api', 'cli']
+        for name in names:
+            (self.root_path / name / 'sub').mkdir(parents=True)
+            (self.root_path / name / 'sub' / 'a.py').write_text('x = 1')
+        # Different sizes, so largest-first dispatch differs from input order
+        sizes = {'web': 100, 'api': 300, 'cli': 200}
+        modules = {name: [f'{name}/file_{i}.py' for i in range(sizes[name])] for name in names}
+
+        large_modules = detect_large_modules(modules, threshold=100, root_path=self.root_path)
+
+        self.assertEqual([m['module_id'] for m in large_modules], names)
+        for module in large_modules:
+            self.assertEqual(module['analysis']['file_distribution'], {'sub': 1})
+
 
 class TestAnalyzeDirectoryStructure(unittest.TestCase):
     """Test directory structure analysis for large modules."""
@@ -336,6 +352,58 @@ class TestAnalyzeDirectoryStructure(unittest.TestCase):
         self.assertEqual(analysis['file_distribution']['components'], 5)
         self.assertEqual(analysis['file_distribution']['utils'], 3)
 
+    def test_file_distribution_skips_ignored_dirs(self):
+        """Test files under ignored directories are not counted."""
+        module_path = self.root_path / "src"
+        components_dir = module_path / "components"
+        vendored = components_dir / "node_modules" / "pkg"
+        vendored.mkdir(parents=True)
+        (components_dir / "Button.js").write_text("// Button")
+        for i in range(4):
+            (vendored / f"dep{i}.js").write_text(f"// Dep {i}")
+
+        analysis = analyze_directory_structure(module_path, self.root_path)
+
+        self.assertEqual(analysis['file_distribution']['components'], 1)
+
+    def test_shared_counts_reuse_nested_walks(self):
+        """Nested module analyses sharing dir_counts match uncached ones."""
+        module_path = self.root_path / "src"
+        nested = module_path / "components" / "forms"
+        nested.mkdir(parents=True)
+        (module_path / "components" / "Button.js").write_text("// Button")
+        for i in range(3):
+            (nested / f"Field{i}.js").write_text(f"// Field {i}")
+
+        dir_counts = {}
+        outer = analyze_directory_structure(self.root_path, self.root_path, dir_counts)
+        self.assertIn(str(nested), dir_counts)
+
+        inner = analyze_directory_structure(module_path, self.root_path, dir_counts)
+        self.assertEqual(outer['file_distribution']['src'], 4)
+        self.assertEqual(inner, analyze_directory_structure(module_path, self.root_path))
+
+    def test_deep_tree_beyond_recursion_limit(self):
+        """Directory nesting deeper than the recursion limit is still counted."""
+        module_path = self.root_path / "src"
+        deep = module_path / "deep"
+        deep.mkdir(parents=True)
+        for _ in range(sys.getrecursionlimit() + 50):
+            deep = deep / "d"
+            deep.mkdir()
+        (deep / "leaf.js").write_text("// Leaf")
+
+        try:
+            analysis = analyze_directory_structure(module_path, self.root_path)
+        finally:
+            # shutil.rmtree recurses too, so unwind the chain before tearDown
+            (deep / "leaf.js").unlink()
+            while deep != module_path:
+                deep.rmdir()
+                deep = deep.parent
+
+        self.assertEqual(analysis['file_distribution']['deep'], 1)
+
 
 class TestIntegration(unittest.TestCase):
     """Integration tests for large module detection."""
@@ -84,6 +84,16 @@ class TestLoadDetailModule(unittest.TestCase):
 
         self.assertIn("Invalid JSON in detail module 'invalid'", str(cm.exception))
 
+    def test_load_module_with_escaped_undecodable_path(self):
+        """Paths carrying surrogate-escaped bytes load like any other module."""
+        module = dict(self.valid_module, files={"scripts/caf\udce9.py": {"language": "python"}})
+        with open(self.index_dir / "surrogate.json", 'w') as f:
+            json.dump(module, f)
+
+        result = load_detail_module("surrogate", self.index_dir)
+
+        self.assertEqual(list(result["files"]), ["scripts/caf\udce9.py"])
+
     def test_load_incomplete_module(self):
         """Test loading module missing required fields raises ValueError."""
         with self.assertRaises(ValueError) as cm:
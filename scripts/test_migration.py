@@ -72,6 +72,14 @@ class TestCreateBackup(unittest.TestCase):
         backup_stat = os.stat(backup_path)
         self.assertEqual(original_stat.st_mode, backup_stat.st_mode)
 
+    def test_backup_independent_of_in_place_writes(self):
+        """Test backup keeps the original content when the index is rewritten."""
+        backup_path = create_backup(self.index_path)
+
+        self.index_path.write_text('{"version": "2.0-split"}')
+
+        self.assertEqual(backup_path.read_text(), '{"version": "1.0", "test": "data"}')
+
     def test_backup_failure_on_nonexistent_file(self):
         """Test backup fails gracefully if source doesn't exist."""
         nonexistent = Path(self.test_dir) / 'nonexistent.json'
@@ -122,6 +130,18 @@ class TestExtractLegacyData(unittest.TestCase):
         with self.assertRaises(json.JSONDecodeError):
             extract_legacy_data(self.index_path)
 
+    def test_extract_memory_mapped_index(self):
+        """Indexes above the mmap threshold parse, and still report corruption."""
+        legacy_data = {"version": "1.0", "f": {"test.py": ["p", ["test_func:():"]]}}
+        self.index_path.write_text(json.dumps(legacy_data))
+
+        with patch('index_utils.MMAP_MIN_BYTES', 1):
+            self.assertEqual(extract_legacy_data(self.index_path), legacy_data)
+
+            self.index_path.write_text('{"invalid": json}')
+            with self.assertRaises(json.JSONDecodeError):
+                extract_legacy_data(self.index_path)
+
 
 class TestValidateMigrationIntegrity(unittest.TestCase):
     """Test migration integrity validation (AC#4)."""
@@ -393,6 +413,17 @@ class TestMigrateToSplitFormat(unittest.TestCase):
         # Should fail gracefully
         self.assertFalse(success)
 
+    def test_dry_run_writes_nothing(self):
+        """Test dry-run never creates PROJECT_INDEX.d/ or touches the legacy index."""
+        original = Path('PROJECT_INDEX.json').read_text()
+
+        success = migrate_to_split_format('.', dry_run=True)
+
+        self.assertTrue(success)
+        self.assertFalse(Path('PROJECT_INDEX.d').exists())
+        self.assertEqual(Path('PROJECT_INDEX.json').read_text(), original)
+        self.assertEqual(list(Path('.').glob('PROJECT_INDEX.json.backup-*')), [])
+
     def test_migrate_performance_under_10_seconds(self):
         """Test NFR: Migration completes in <10 seconds."""
         start_time = time.time()
@@ -15,10 +15,13 @@ from signature_cache import (
     CACHE_VERSION,
     get_cache_key,
     get_cache_path,
+    get_content_hash,
     load_cache,
     save_cache,
     get_cached_signature,
+    lookup_cached_signature,
     set_cached_signature,
+    prune_cache,
     clear_cache,
     get_cache_stats
 )
@@ -123,6 +126,20 @@ class TestCacheLoadSave:
         assert cache["version"] == CACHE_VERSION
         assert cache["signatures"] == {}
 
+    def test_load_cache_extractor_mismatch(self, tmp_path):
+        """Test that caches written by other extractors are discarded."""
+        cache = {"version": CACHE_VERSION, "signatures": {"key": "hash"}, "content": {}}
+        save_cache(tmp_path, cache)
+
+        cache_file = tmp_path / ".project-index-cache" / "signatures.json"
+        stored = json.loads(cache_file.read_text())
+        stored["extractor"] = "0" * 16
+        cache_file.write_text(json.dumps(stored))
+
+        cache = load_cache(tmp_path)
+
+        assert cache["signatures"] == {}
+
     def test_load_cache_corrupted(self, tmp_path):
         """Test loading corrupted cache file."""
         cache_dir = tmp_path / ".project-index-cache"
@@ -194,6 +211,86 @@ class TestCacheOperations:
         # Cache should miss now (key changed)
         assert get_cached_signature(test_file, cache) is None
 
+    def test_cache_hit_after_touch(self, tmp_path):
+        """Test that an mtime-only change still hits via the content hash."""
+        test_file = tmp_path / "test.py"
+        test_file.write_text("def foo(): pass")
+
+        cache = {"version": CACHE_VERSION, "signatures": {}}
+        signature = {"functions": {"foo": "()"}}
+        set_cached_signature(test_file, signature, cache)
+
+        stat = test_file.stat()
+        os.utime(test_file, (stat.st_atime, stat.st_mtime + 100))
+
+        assert get_cached_signature(test_file, cache) == signature
+        # The new (path, mtime, size) key is remembered for the next lookup
+        assert cache["signatures"][get_cache_key(test_file)] == get_content_hash(test_file)
+
+    def test_cache_hit_after_rename(self, tmp_path):
+        """Test that a renamed file with identical content hits the cache."""
+        test_file = tmp_path / "old.py"
+        test_file.write_text("def foo(): pass")
+
+        cache = {"version": CACHE_VERSION, "signatures": {}}
+        signature = {"functions": {"foo": "()"}}
+        set_cached_signature(test_file, signature, cache)
+
+        renamed = tmp_path / "new.py"
+        test_file.rename(renamed)
+
+        assert get_cached_signature(renamed, cache) == signature
+        assert len(cache["content"]) == 1
+
+    def test_miss_hash_reused_when_caching(self, tmp_path, monkeypatch):
+        """Test that a miss followed by a store hashes the file only once."""
+        import signature_cache
+
+        test_file = tmp_path / "test.py"
+        test_file.write_text("def foo(): pass")
+
+        calls = []
+        real_hash = signature_cache.get_content_hash
+        monkeypatch.setattr(signature_cache, "get_content_hash",
+                            lambda path: calls.append(path) or real_hash(path))
+
+        cache = {"version": CACHE_VERSION, "signatures": {}}
+        cached, content_hash = lookup_cached_signature(test_file, cache)
+        assert cached is None
+        assert content_hash == real_hash(test_file)
+
+        signature = {"functions": {"foo": "()"}}
+        set_cached_signature(test_file, signature, cache, content_hash)
+
+        assert calls == [test_file]
+        assert get_cached_signature(test_file, cache) == signature
+
+
+class TestPruneCache:
+    """Test dropping entries for files outside the current run."""
+
+    def test_prune_drops_removed_and_superseded_entries(self, tmp_path):
+        """Only the current key of each live file and its content survive."""
+        kept = tmp_path / "kept.py"
+        edited = tmp_path / "edited.py"
+        removed = tmp_path / "removed.py"
+        kept.write_text("def foo(): pass")
+        edited.write_text("def bar(): pass")
+        removed.write_text("def baz(): pass")
+
+        cache = {"version": CACHE_VERSION, "signatures": {}}
+        for path in (kept, edited, removed):
+            set_cached_signature(path, {"functions": {path.stem: "()"}}, cache)
+
+        edited.write_text("def bar(x): pass")
+        set_cached_signature(edited, {"functions": {"bar": "(x)"}}, cache)
+        removed.unlink()
+
+        assert prune_cache(cache, [kept, edited]) == 2
+        assert set(cache["signatures"]) == {get_cache_key(kept), get_cache_key(edited)}
+        assert set(cache["content"]) == {get_content_hash(kept), get_content_hash(edited)}
+        assert get_cached_signature(edited, cache) == {"functions": {"bar": "(x)"}}
+
 
 class TestCacheUtilities:
     """Test cache utility functions."""
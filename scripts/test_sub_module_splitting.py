@@ -204,7 +204,6 @@ class TestSplitModuleRecursive(unittest.TestCase):
         result = split_module_recursive(
             "mymodule",
             files,
-            self.root_path,
             max_depth=3,
             config=self.config
         )
@@ -227,7 +226,6 @@ class TestSplitModuleRecursive(unittest.TestCase):
         result = split_module_recursive(
             "mymodule",
             files,
-            self.root_path,
             max_depth=3,
             config=self.config
         )
@@ -250,7 +248,6 @@ class TestSplitModuleRecursive(unittest.TestCase):
         result = split_module_recursive(
             "mymodule",
             files,
-            self.root_path,
             max_depth=3,
             config=self.config
         )
@@ -272,7 +269,6 @@ class TestSplitModuleRecursive(unittest.TestCase):
         result = split_module_recursive(
             "mymodule",
             files,
-            self.root_path,
             max_depth=2,  # Limit to 2 levels
             config=self.config
         )
@@ -294,7 +290,6 @@ class TestSplitModuleRecursive(unittest.TestCase):
         result = split_module_recursive(
             "mymodule",
             files,
-            self.root_path,
             max_depth=3,
             config=self.config
         )
@@ -315,7 +310,6 @@ class TestSplitModuleRecursive(unittest.TestCase):
         result = split_module_recursive(
             "mymodule",
             files,
-            self.root_path,
             max_depth=3,
             config=self.config
         )